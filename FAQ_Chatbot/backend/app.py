@@ -1,17 +1,190 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, g, request, jsonify
 from flask_cors import CORS
-import json
+import hmac
+import ipaddress
+import multiprocessing
 import os
-import string
+import time
+
+from knowledge_base import KnowledgeBaseStore
+from metrics import Registry
+from response_cache import ResponseCache
+from semantic import make_embedder
+from tokenizer import Tokenizer
 
 app = Flask(__name__)
 CORS(app)  # Enable CORS so frontend can access backend
 
-# Load FAQs from JSON file
-FAQ_FILE = os.path.join(os.path.dirname(__file__), "faqs.json")
+# Load FAQs from JSON file (FAQ_FILE overrides, e.g. for load tests)
+FAQ_FILE = os.environ.get(
+    "FAQ_FILE", os.path.join(os.path.dirname(__file__), "faqs.json")
+)
+
+# Compiled by snapshot.py; used instead of faqs.json while it is up to date
+SNAPSHOT_FILE = os.environ.get(
+    "FAQ_SNAPSHOT", os.path.splitext(FAQ_FILE)[0] + ".snapshot"
+)
+
+# "keyword" (default), "tfidf" or "bm25"
+RANKING_MODE = os.environ.get("FAQ_RANKING_MODE", "keyword")
+
+# If set, /admin/* requires this value in the X-Admin-Token header;
+# if not, /admin/* only answers requests from this machine
+ADMIN_TOKEN = os.environ.get("FAQ_ADMIN_TOKEN")
+
+# Seconds between faqs.json change checks; 0 disables the watcher
+WATCH_INTERVAL = float(os.environ.get("FAQ_WATCH_INTERVAL", "0"))
+
+# Set by serve.py: this process is the gunicorn master, which serves no
+# traffic; the watcher is started in each worker after fork instead
+PREFORKED = os.environ.get("FAQ_PREFORKED") == "1"
+
+# Shared by the chat routes and the rankers; FAQ_STEMMING=1 turns on light stemming
+tokenizer = Tokenizer(stem=os.environ.get("FAQ_STEMMING") == "1")
+
+# Typo-tolerant keyword matching ("certficate"); off unless FAQ_FUZZY=1
+FUZZY_MATCHING = os.environ.get("FAQ_FUZZY", "0") == "1"
+
+# Embedding retrieval: "off" (default), "fallback" (only when no keyword
+# matches) or "hybrid" (keyword and cosine scores blended by FAQ_HYBRID_WEIGHT)
+SEMANTIC_MODE = os.environ.get("FAQ_SEMANTIC", "off")
+
+semantic_options = None
+if SEMANTIC_MODE != "off":
+    semantic_options = {
+        # Loaded once; reused by every reload
+        "embedder": make_embedder(os.environ.get("FAQ_EMBEDDER", "hashing")),
+        "mode": SEMANTIC_MODE,
+        "keyword_weight": float(os.environ.get("FAQ_HYBRID_WEIGHT", "0.5")),
+        "min_similarity": float(os.environ.get("FAQ_MIN_SIMILARITY", "0.2")),
+        # ANN recall@10 the index is tuned for on large FAQ sets
+        "target_recall": float(os.environ.get("FAQ_ANN_RECALL", "0.95"))
+    }
+
+# FAQs plus their precomputed ranker, rebuilt and swapped on reload
+knowledge_base = KnowledgeBaseStore(
+    FAQ_FILE, RANKING_MODE, tokenizer, FUZZY_MATCHING, SNAPSHOT_FILE, semantic_options
+)
+
+if WATCH_INTERVAL > 0 and not PREFORKED:
+    knowledge_base.watch(WATCH_INTERVAL)
+
+# Count of /admin/reload calls, in shared memory created before serve.py
+# forks its workers. A reload request reaches one worker; the others see
+# the new count on their next request and rebuild too.
+reload_generation = multiprocessing.Value("L", 0)
+seen_generation = 0
+
+# Answers keyed by normalised token set; 0 entries disables the cache
+response_cache = ResponseCache(
+    maxsize=int(os.environ.get("FAQ_CACHE_SIZE", "1024")),
+    ttl=float(os.environ.get("FAQ_CACHE_TTL", "300"))
+)
+knowledge_base.on_reload(response_cache.clear)
+
+# Served on /metrics in Prometheus text format. serve.py sets
+# FAQ_METRICS_DIR so every worker reports the numbers of all of them.
+metrics = Registry(os.environ.get("FAQ_METRICS_DIR") or None)
+REQUEST_LATENCY = metrics.histogram(
+    "faq_request_duration_seconds", "Time spent handling a request.",
+    labelnames=("endpoint",)
+)
+PHASE_LATENCY = metrics.histogram(
+    "faq_phase_duration_seconds", "Time spent per answering phase (tokenize, score, serialize).",
+    labelnames=("phase",)
+)
+MATCH_SCORE = metrics.histogram(
+    "faq_match_score", "Ranker score of the best FAQ for each scored message.",
+    buckets=(0.1, 0.25, 0.5, 0.75, 1, 2, 3, 5, 10)
+)
+FAQ_ANSWERS = metrics.counter(
+    "faq_answers_total", "Messages answered with an FAQ, by FAQ id.", labelnames=("faq_id",)
+)
+GREETINGS = metrics.counter("faq_greetings_total", "Messages answered with the greeting.")
+FALLBACKS = metrics.counter("faq_fallbacks_total", "Messages that matched no FAQ.")
+metrics.gauge("faq_cache_entries", "Answers currently cached.",
+              lambda: response_cache.stats()["size"])
+metrics.gauge("faq_cache_hit_ratio", "Response cache hits / lookups.",
+              lambda: response_cache.stats()["hit_rate"])
+metrics.gauge("faq_knowledge_base_version", "Reload count of the live FAQ index.",
+              lambda: knowledge_base.current.version)
+
+
+GREETING_RESPONSE = "Hello! I’m the Internship Assistant FAQ Bot. How can I help you?"
 
-with open(FAQ_FILE, "r", encoding="utf-8") as file:
-    faqs = json.load(file)
+FALLBACK_RESPONSE = (
+    "I’m designed to answer internship-related questions. "
+    "Please ask about tasks, submission, certificates, or duration."
+)
+
+# Upper bound on messages accepted by /chat/batch
+MAX_BATCH_SIZE = 1000
+
+
+def record_answer(faq_id):
+    """Counts an answer; faq_id is None for fallbacks, -1 for greetings."""
+    if faq_id is None:
+        FALLBACKS.inc()
+    elif faq_id < 0:
+        GREETINGS.inc()
+    else:
+        FAQ_ANSWERS.inc(faq_id=faq_id)
+
+
+def find_best_answers(user_messages):
+    """
+    Answers a list of messages, in order.
+    Cached and greeting messages are answered directly; everything
+    else is scored against the FAQs in one ranker.rank_batch pass.
+    """
+    # One snapshot for the whole call, even if a reload swaps mid-way
+    kb = knowledge_base.current
+
+    answers = [None] * len(user_messages)
+    pending_ids = []
+    pending_words = []
+    pending_keys = []
+
+    with PHASE_LATENCY.time(phase="tokenize"):
+        for i, user_message in enumerate(user_messages):
+            words = tokenizer.tokenize(user_message)
+            # Greetings are matched on what the user typed, not on corrections
+            greeting = tokenizer.is_greeting(words)
+            if kb.fuzzy is not None:
+                words = kb.fuzzy.correct_words(words)
+
+            # Word order and repeats never change the answer.
+            # The version keeps a request that straddles a reload from
+            # caching an answer from the old FAQs.
+            cache_key = (kb.version, frozenset(words))
+            cached = response_cache.get(cache_key)
+
+            if cached is not None:
+                faq_id, answers[i] = cached
+                record_answer(faq_id)
+            elif greeting:
+                answers[i] = GREETING_RESPONSE
+                response_cache.put(cache_key, (-1, GREETING_RESPONSE))
+                record_answer(-1)
+            else:
+                pending_ids.append(i)
+                pending_words.append(words)
+                pending_keys.append(cache_key)
+
+    with PHASE_LATENCY.time(phase="score"):
+        ranked = kb.ranker.rank_batch(pending_words, k=1)
+        for i, cache_key, matches in zip(pending_ids, pending_keys, ranked):
+            if matches:
+                best_id, score = matches[0]
+                answers[i] = kb.faqs[best_id]["answer"]
+                MATCH_SCORE.observe(score)
+            else:
+                best_id = None
+                answers[i] = FALLBACK_RESPONSE
+            response_cache.put(cache_key, (best_id, answers[i]))
+            record_answer(best_id)
+
+    return answers
 
 
 def find_best_answer(user_message):
@@ -19,39 +192,7 @@ def find_best_answer(user_message):
     Matches user message with FAQ keywords
     and returns the best matching answer.
     """
-    import string
-
-    user_message = user_message.lower()
-    words = user_message.translate(
-        str.maketrans("", "", string.punctuation)
-    ).split()
-
-    # Greeting handling
-    greetings = ["hi", "hello", "hey", "morning", "evening"]
-    for greet in greetings:
-        if greet in words:
-            return "Hello! I’m the Internship Assistant FAQ Bot. How can I help you?"
-
-    best_match_score = 0
-    best_answer = None
-
-    for faq in faqs:
-        score = 0
-        for keyword in faq["keywords"]:
-            if keyword in words:
-                score += 1
-
-        if score > best_match_score:
-            best_match_score = score
-            best_answer = faq["answer"]
-
-    if best_match_score == 0:
-        return (
-            "I’m designed to answer internship-related questions. "
-            "Please ask about tasks, submission, certificates, or duration."
-        )
-
-    return best_answer
+    return find_best_answers([user_message])[0]
 
 
 @app.route("/chat", methods=["POST"])
@@ -66,9 +207,112 @@ def chat():
     user_message = data["message"]
     bot_response = find_best_answer(user_message)
 
+    with PHASE_LATENCY.time(phase="serialize"):
+        return jsonify({
+            "response": bot_response
+        })
+
+
+@app.route("/chat/batch", methods=["POST"])
+def chat_batch():
+    """
+    Answers many messages in one round trip.
+    Expects {"messages": [...]} and returns {"responses": [...]} in the same order.
+    """
+    data = request.get_json(silent=True)
+    messages = data.get("messages") if isinstance(data, dict) else None
+
+    if not isinstance(messages, list) or not all(isinstance(m, str) for m in messages):
+        return jsonify({
+            "response": "Invalid request. Please send a list of messages."
+        }), 400
+
+    if len(messages) > MAX_BATCH_SIZE:
+        return jsonify({
+            "response": f"Too many messages. The limit is {MAX_BATCH_SIZE} per batch."
+        }), 413
+
+    bot_responses = find_best_answers(messages)
+
+    with PHASE_LATENCY.time(phase="serialize"):
+        return jsonify({
+            "responses": bot_responses
+        })
+
+
+@app.before_request
+def start_timer():
+    g.request_start = time.perf_counter()
+
+
+@app.before_request
+def follow_reloads():
+    """Starts a rebuild if another worker was asked to reload."""
+    global seen_generation
+    generation = reload_generation.value
+    if generation != seen_generation and knowledge_base.reload_in_background():
+        seen_generation = generation
+
+
+@app.after_request
+def record_latency(response):
+    if "request_start" in g:
+        REQUEST_LATENCY.observe(
+            time.perf_counter() - g.request_start,
+            endpoint=request.endpoint or "unknown"
+        )
+    return response
+
+
+@app.route("/metrics", methods=["GET"])
+def metrics_endpoint():
+    """Latency histograms and answer counters in Prometheus text format."""
+    return Response(metrics.render(), mimetype="text/plain; version=0.0.4")
+
+
+def is_admin(req):
+    if ADMIN_TOKEN:
+        return hmac.compare_digest(
+            req.headers.get("X-Admin-Token", "").encode("utf-8"), ADMIN_TOKEN.encode("utf-8")
+        )
+    try:
+        return ipaddress.ip_address(req.remote_addr or "").is_loopback
+    except ValueError:
+        return False
+
+
+@app.route("/admin/reload", methods=["POST"])
+def admin_reload():
+    """
+    Rebuilds the FAQ index from faqs.json in the background, in this
+    worker now and in every other worker on its next request.
+    Requests keep using the old index until the new one is swapped in.
+    """
+    global seen_generation
+    if not is_admin(request):
+        return jsonify({"response": "Unauthorized."}), 403
+
+    with reload_generation.get_lock():
+        reload_generation.value += 1
+        generation = reload_generation.value
+    started = knowledge_base.reload_in_background()
+    if started:
+        seen_generation = generation
+
     return jsonify({
-        "response": bot_response
-    })
+        "status": "reloading" if started else "already reloading",
+        "version": knowledge_base.current.version,
+        "last_error": knowledge_base.last_error
+    }), 202
+
+
+@app.route("/admin/cache", methods=["GET"])
+def admin_cache():
+    """Response cache size and hit/miss counters."""
+    if not is_admin(request):
+        return jsonify({"response": "Unauthorized."}), 403
+
+    return jsonify(response_cache.stats())
 
 
 if __name__ == "__main__":
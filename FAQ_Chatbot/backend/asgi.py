@@ -0,0 +1,14 @@
+"""
+asgi.py
+ASGI entry point for the FAQ backend.
+Flask is a WSGI app, so it is wrapped for ASGI servers like uvicorn.
+
+Single process:  uvicorn asgi:application --port 5000
+Multi-worker:    python serve.py  (shares the FAQ index between workers)
+"""
+
+from a2wsgi import WSGIMiddleware
+
+from app import app
+
+application = WSGIMiddleware(app)
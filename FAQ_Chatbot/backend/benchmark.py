@@ -0,0 +1,338 @@
+"""
+benchmark.py
+Compares the old linear keyword scan with the inverted index
+on synthetic FAQ sets of increasing size, then times each
+ranking mode one message at a time and as a batch,
+measures tokenizer throughput, times typo correction
+against a brute-force edit-distance scan and compares cold
+start from faqs.json with cold start from a compiled snapshot.
+The last table compares latency and top-1 accuracy of the keyword
+matcher with the semantic modes on keyword and paraphrased queries,
+and checks that the ANN index reaches its target recall.
+
+Run: python benchmark.py
+"""
+
+import json
+import os
+import random
+import string
+import tempfile
+import time
+
+from faq_index import FAQIndex
+from fuzzy import MIN_WORD_LENGTH, FuzzyMatcher, bounded_edit_distance, max_edits
+from knowledge_base import load_knowledge_base
+from ranking import RANKING_MODES, make_ranker
+from semantic import ANN_TARGET_RECALL, HashingEmbedder, SemanticRanker
+from snapshot import write_snapshot
+from tokenizer import Tokenizer
+
+SIZES = [10, 1_000, 100_000]
+KEYWORDS_PER_FAQ = 7
+VOCAB_SIZE = 5_000
+QUERIES = 200
+
+# Measured recall may fall this far below the target the ANN index was
+# calibrated for on its own sample queries
+RECALL_TOLERANCE = 0.03
+
+
+def make_vocab(size, seed=0):
+    """Random lowercase words used as FAQ keywords."""
+    rng = random.Random(seed)
+    vocab = set()
+    while len(vocab) < size:
+        vocab.add("".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 10))))
+    return sorted(vocab)
+
+
+def make_faqs(n, vocab, seed=0):
+    """Synthetic FAQ list with the same shape as faqs.json."""
+    rng = random.Random(seed)
+    return [
+        {
+            "keywords": rng.sample(vocab, KEYWORDS_PER_FAQ),
+            "answer": f"Answer {i}",
+        }
+        for i in range(n)
+    ]
+
+
+def make_queries(n, vocab, seed=1):
+    """Short user messages mixing known keywords and filler words."""
+    rng = random.Random(seed)
+    filler = ["how", "do", "i", "the", "my", "for", "is", "what", "when"]
+    return [rng.sample(vocab, 3) + rng.sample(filler, 4) for _ in range(n)]
+
+
+def linear_best_match(faqs, words):
+    """The original find_best_answer scoring loop, kept as the baseline."""
+    best_match_score = 0
+    best_id = None
+    for faq_id, faq in enumerate(faqs):
+        score = 0
+        for keyword in faq["keywords"]:
+            if keyword in words:
+                score += 1
+        if score > best_match_score:
+            best_match_score = score
+            best_id = faq_id
+    return best_id, best_match_score
+
+
+def inline_tokenize(user_message):
+    """The original per-call tokenizing and greeting code, kept as the baseline."""
+    import string
+
+    user_message = user_message.lower()
+    words = user_message.translate(
+        str.maketrans("", "", string.punctuation)
+    ).split()
+
+    greetings = ["hi", "hello", "hey", "morning", "evening"]
+    for greet in greetings:
+        if greet in words:
+            break
+    return words
+
+
+def tokens_per_second(fn, messages, total_tokens):
+    start = time.perf_counter()
+    for message in messages:
+        fn(message)
+    return total_tokens / (time.perf_counter() - start)
+
+
+def make_typo(word, rng):
+    """Deletes, replaces or inserts one character."""
+    i = rng.randrange(len(word))
+    edit = rng.choice(("delete", "replace", "insert"))
+    if edit == "delete":
+        return word[:i] + word[i + 1:]
+    char = rng.choice(string.ascii_lowercase)
+    if edit == "replace":
+        return word[:i] + char + word[i + 1:]
+    return word[:i] + char + word[i:]
+
+
+def brute_force_correct(vocabulary, word):
+    """Edit distance against every vocabulary word, the naive baseline."""
+    limit = max_edits(word)
+    best = None
+    for candidate in vocabulary:
+        distance = bounded_edit_distance(word, candidate, limit)
+        if distance <= limit and (best is None or distance < best[0]):
+            best = (distance, candidate)
+    return best[1] if best else word
+
+
+def make_semantic_corpus(n, vocab, seed=4, topics=0):
+    """
+    FAQs with answers of random words, plus queries with a known target:
+    "keyword" queries reuse two of its keywords, "paraphrase" queries
+    only use words from its answer (no keyword overlap by design).
+    With topics, most answer words come from the FAQ's topic, so the
+    FAQs cluster the way real ones do.
+    """
+    rng = random.Random(seed)
+    keyword_vocab, answer_vocab = vocab[:len(vocab) // 2], vocab[len(vocab) // 2:]
+
+    def answer():
+        if not topics:
+            return rng.sample(answer_vocab, 20)
+        size = len(answer_vocab) // topics
+        topic = rng.randrange(topics)
+        return rng.sample(answer_vocab[topic * size:(topic + 1) * size], 15) + rng.sample(answer_vocab, 5)
+
+    faqs = [
+        {
+            "keywords": rng.sample(keyword_vocab, KEYWORDS_PER_FAQ),
+            "answer": " ".join(answer()),
+        }
+        for _ in range(n)
+    ]
+    keyword_queries, paraphrase_queries = [], []
+    for _ in range(QUERIES):
+        target = rng.randrange(n)
+        keyword_queries.append((rng.sample(faqs[target]["keywords"], 2), target))
+        paraphrase_queries.append((rng.sample(faqs[target]["answer"].split(), 4), target))
+    return faqs, keyword_queries, paraphrase_queries
+
+
+def accuracy_and_latency(ranker, labelled_queries):
+    """Top-1 accuracy and ms per query over (words, target) pairs."""
+    start = time.perf_counter()
+    hits = 0
+    for words, target in labelled_queries:
+        matches = ranker.rank(words)
+        hits += bool(matches) and matches[0][0] == target
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    return hits / len(labelled_queries), elapsed_ms / len(labelled_queries)
+
+
+def ann_recall(index, queries_matrix):
+    """
+    Share of the exact 10 nearest neighbours the index returns,
+    with ms per query for the index and for an exact scan.
+    """
+    start = time.perf_counter()
+    exact = [index.vectors @ query for query in queries_matrix]
+    exact_ms = (time.perf_counter() - start) * 1000 / len(queries_matrix)
+
+    start = time.perf_counter()
+    approximate = index.search(queries_matrix, 10)
+    ann_ms = (time.perf_counter() - start) * 1000 / len(queries_matrix)
+
+    found = 0
+    for scores, (ids, _) in zip(exact, approximate):
+        found += len(set(ids.tolist()) & set(scores.argsort()[-10:].tolist()))
+    return found / (10 * len(exact)), ann_ms, exact_ms
+
+
+def time_per_query(fn, queries):
+    """Average milliseconds per call of fn over the query list."""
+    start = time.perf_counter()
+    for words in queries:
+        fn(words)
+    return (time.perf_counter() - start) * 1000 / len(queries)
+
+
+def main():
+    vocab = make_vocab(VOCAB_SIZE)
+    queries = make_queries(QUERIES, vocab)
+
+    print(f"{'FAQs':>8} | {'linear ms/req':>14} | {'index ms/req':>13} | {'speedup':>8}")
+    print("-" * 53)
+
+    for size in SIZES:
+        faqs = make_faqs(size, vocab)
+        index = FAQIndex(faqs)
+
+        # Sanity check: both matchers agree
+        for words in queries[:20]:
+            assert linear_best_match(faqs, words) == index.best_match(words)
+
+        # The linear scan gets very slow on big corpora, so sample fewer queries
+        linear_queries = queries if size <= 1_000 else queries[:10]
+        linear_ms = time_per_query(lambda w: linear_best_match(faqs, w), linear_queries)
+        index_ms = time_per_query(index.best_match, queries)
+
+        print(f"{size:>8} | {linear_ms:>14.4f} | {index_ms:>13.4f} | {linear_ms / index_ms:>7.1f}x")
+
+    print()
+    print(f"{'FAQs':>8} | {'mode':>8} | {'single ms/req':>14} | {'batch ms/req':>13}")
+    print("-" * 53)
+
+    for size in SIZES:
+        faqs = make_faqs(size, vocab)
+        for mode in RANKING_MODES:
+            ranker = make_ranker(faqs, mode)
+            single_ms = time_per_query(ranker.rank, queries)
+
+            start = time.perf_counter()
+            ranker.rank_batch(queries)
+            batch_ms = (time.perf_counter() - start) * 1000 / len(queries)
+
+            print(f"{size:>8} | {mode:>8} | {single_ms:>14.4f} | {batch_ms:>13.4f}")
+
+    messages = [" ".join(words).capitalize() + "?" for words in queries] * 50
+    total_tokens = sum(len(m.split()) for m in messages)
+    tokenizer = Tokenizer()
+    stemming_tokenizer = Tokenizer(stem=True)
+
+    def shared(message):
+        tokenizer.is_greeting(tokenizer.tokenize(message))
+
+    def stemming(message):
+        stemming_tokenizer.is_greeting(stemming_tokenizer.tokenize(message))
+
+    print()
+    print(f"{'tokenizer':>20} | {'tokens/sec':>12}")
+    print("-" * 35)
+    for name, fn in (("inline (old)", inline_tokenize), ("shared", shared), ("shared + stemming", stemming)):
+        print(f"{name:>20} | {tokens_per_second(fn, messages, total_tokens):>12,.0f}")
+
+    rng = random.Random(2)
+    print()
+    print(f"{'vocab':>8} | {'brute ms/word':>14} | {'trigram ms/word':>16}")
+    print("-" * 45)
+    for size in (1_000, 10_000, 100_000):
+        fuzzy_vocab = make_vocab(size, seed=3)
+        matcher = FuzzyMatcher(fuzzy_vocab)
+        typos = [make_typo(w, rng) for w in rng.sample(fuzzy_vocab, 50) if len(w) > MIN_WORD_LENGTH]
+
+        # _correct skips the lookup cache, so every call does the real work
+        brute_ms = time_per_query(lambda w: brute_force_correct(fuzzy_vocab, w), typos[:5])
+        trigram_ms = time_per_query(matcher._correct, typos)
+        print(f"{size:>8} | {brute_ms:>14.4f} | {trigram_ms:>16.4f}")
+
+    print()
+    print(f"{'FAQs':>8} | {'json start ms':>14} | {'snapshot start ms':>18}")
+    print("-" * 47)
+    with tempfile.TemporaryDirectory() as tmp:
+        faq_file = os.path.join(tmp, "faqs.json")
+        snapshot_file = os.path.join(tmp, "faqs.snapshot")
+        for size in SIZES:
+            faqs = make_faqs(size, vocab)
+            with open(faq_file, "w", encoding="utf-8") as file:
+                json.dump(faqs, file)
+            write_snapshot(faq_file, snapshot_file)
+
+            start = time.perf_counter()
+            from_json = load_knowledge_base(faq_file, "keyword")
+            json_ms = (time.perf_counter() - start) * 1000
+
+            start = time.perf_counter()
+            from_snapshot = load_knowledge_base(faq_file, "keyword", snapshot_file=snapshot_file)
+            snapshot_ms = (time.perf_counter() - start) * 1000
+
+            for words in queries[:20]:
+                assert from_json.ranker.rank(words) == from_snapshot.ranker.rank(words)
+
+            print(f"{size:>8} | {json_ms:>14.2f} | {snapshot_ms:>18.2f}")
+
+    print()
+    print(f"{'FAQs':>8} | {'matcher':>9} | {'queries':>10} | {'top-1':>6} | {'ms/req':>8}")
+    print("-" * 53)
+    embedder = HashingEmbedder()
+    for size in (1_000, 10_000, 50_000):
+        faqs, keyword_queries, paraphrase_queries = make_semantic_corpus(size, vocab)
+        keyword = make_ranker(faqs, "keyword")
+        matchers = {
+            "keyword": keyword,
+            "fallback": SemanticRanker(keyword, faqs, embedder, mode="fallback"),
+            "hybrid": SemanticRanker(keyword, faqs, embedder, mode="hybrid"),
+        }
+        for name, ranker in matchers.items():
+            for label, labelled in (("keyword", keyword_queries), ("paraphrase", paraphrase_queries)):
+                accuracy, ms = accuracy_and_latency(ranker, labelled)
+                print(f"{size:>8} | {name:>9} | {label:>10} | {accuracy:>6.1%} | {ms:>8.4f}")
+
+    # Recall of the ANN index against exact search. Random-word FAQs have
+    # no cluster structure, so the index falls back to an exact scan;
+    # topical FAQs cluster like real ones and are searched with IVF.
+    print()
+    print(f"{'FAQs':>8} | {'corpus':>8} | {'search':>6} | {'probes':>10} | "
+          f"{'recall@10':>9} | {'ms/req':>7} | {'exact ms/req':>12}")
+    print("-" * 80)
+    for size in (20_000, 50_000):
+        for corpus, topics in (("random", 0), ("topical", 100)):
+            faqs, _, paraphrase_queries = make_semantic_corpus(size, vocab, seed=5, topics=topics)
+            index = SemanticRanker(make_ranker(faqs, "keyword"), faqs, embedder).index
+            queries_matrix = embedder.embed([" ".join(words) for words, _ in paraphrase_queries])
+            recall, ann_ms, exact_ms = ann_recall(index, queries_matrix)
+
+            if index.centroids is None:
+                search, probes = "exact", "-"
+            else:
+                search, probes = "IVF", f"{index.n_probe}/{len(index.centroids)}"
+            print(f"{size:>8} | {corpus:>8} | {search:>6} | {probes:>10} | "
+                  f"{recall:>9.1%} | {ann_ms:>7.4f} | {exact_ms:>12.4f}")
+            assert recall >= ANN_TARGET_RECALL - RECALL_TOLERANCE, (
+                f"ANN recall@10 {recall:.1%} is below the {ANN_TARGET_RECALL:.0%} target"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+faq_index.py
+Inverted keyword index over the FAQ knowledge base.
+Each keyword maps to the ids of the FAQs that list it, so a lookup
+only touches the postings for the words in the user's message.
+"""
+
+
+class FAQIndex:
+    """
+    Keyword -> FAQ id postings, built once when faqs.json is loaded.
+    """
+
+    def __init__(self, faqs, normalize=None):
+        self.faqs = faqs
+        self.postings = {}
+
+        for faq_id, faq in enumerate(faqs):
+            keywords = faq["keywords"]
+            if normalize is not None:
+                keywords = map(normalize, keywords)
+            # A keyword and its variant (task / tasks) count once after stemming
+            for keyword in dict.fromkeys(keywords):
+                self.postings.setdefault(keyword, []).append(faq_id)
+
+    def postings_for(self, word):
+        """FAQ ids listing this keyword (once per FAQ)."""
+        return self.postings.get(word, ())
+
+    def vocabulary(self):
+        """Every (normalised) keyword in the index."""
+        return self.postings.keys()
+
+    def scores(self, words):
+        """
+        Accumulates the postings of each distinct word.
+        Returns {faq_id: number of matching keywords}.
+        """
+        scores = {}
+        for word in set(words):
+            for faq_id in self.postings_for(word):
+                scores[faq_id] = scores.get(faq_id, 0) + 1
+        return scores
+
+    def best_match(self, words):
+        """
+        Returns (faq_id, score) of the best FAQ, or (None, 0) when nothing matches.
+        Ties go to the FAQ listed first, like the old linear scan.
+        """
+        scores = self.scores(words)
+
+        if not scores:
+            return None, 0
+
+        best_id = min(scores, key=lambda faq_id: (-scores[faq_id], faq_id))
+        return best_id, scores[best_id]
@@ -0,0 +1,146 @@
+"""
+fuzzy.py
+Typo-tolerant lookup of words in the FAQ keyword vocabulary.
+
+A character-trigram index narrows the vocabulary down to the few
+words that share enough trigrams with the typo, and only those get
+an edit-distance check. "certficate" -> "certificate" therefore costs
+a handful of comparisons, not one per keyword.
+"""
+
+from functools import lru_cache
+
+# Words shorter than this are never corrected: one edit turns most short
+# words into another real word ("most" -> "post", "quite" -> "quit")
+MIN_WORD_LENGTH = 6
+
+# Frequent English words that are one or two edits from typical FAQ
+# keywords; they are real words, never typos, so they are left alone
+COMMON_WORDS = frozenset("""
+    across action actually address advice afraid agreed allowed almost
+    already always amount answer answers anyone anything anyway appear
+    around arrive article asking attend attention available before behind
+    believe belong better between beyond bought branch bridge bright broken
+    budget business button called cannot career carried center chance
+    change changed changes charge choice choose closed coming common company
+    compare complete computer concern consider contain continue control
+    correct country couple course create credit current damage decide degree
+    depend design detail details device different direct during effect
+    effort either enough entire events everyone everything exactly example
+    expect explain family figure finally finish finished follow following
+    forget forgot former forward friend friends further general getting
+    ground groups growth happen happened having health helped helpful higher
+    himself history holiday however important include including income
+    indeed inside instead interest invite itself joined kindly latest leader
+    length lesson letter likely listen little living looked looking mainly
+    making manage manager market matter meeting member memory method middle
+    minute minutes mobile moment months mostly moving myself nearly needed
+    neither normal nothing notice number office option others output parent
+    partner people period person picked please policy possible prefer
+    present pretty preview price prices private probably process produce
+    product protect public purpose rather really reason recent record reduce
+    regular remain remember remove repeat replied reply request require
+    return right school screen search second select seller sender series
+    service session settle should simple simply single sister social someone
+    something sometimes source speaker special spend spring started status
+    steady strong subject submitted success suggest summer summit supply
+    surely system taking talking teacher tissue thanks things thinking
+    though thought through throughout ticket today together tomorrow toward
+    travel trying turned twenty understand update usually various version
+    viewed waiting wanted wants watched website weekend weekly whether
+    whole within without wonder worked working worried writing written
+    yesterday yourself
+""".split())
+
+
+def trigrams(word):
+    """Trigrams of the word padded with ^ and $, so the ends count too."""
+    padded = f"^{word}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def max_edits(word):
+    """Edits allowed for a word of this length."""
+    return 1 if len(word) <= 8 else 2
+
+
+def bounded_edit_distance(a, b, limit):
+    """
+    Levenshtein distance between a and b,
+    or limit + 1 as soon as it is known to exceed limit.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (char_a != char_b)
+            ))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+class FuzzyMatcher:
+    """
+    Trigram index over a fixed vocabulary.
+    Built together with the ranker, so it is rebuilt on every reload.
+    """
+
+    def __init__(self, vocabulary, ignore=frozenset(), cache_size=10_000):
+        self.vocabulary = frozenset(vocabulary)
+        # Real words (stopwords, common English, answer text) that must
+        # never be "corrected" into keywords
+        self.ignore = frozenset(ignore) | COMMON_WORDS
+        self.postings = {}
+        self.gram_counts = {}
+        for word in self.vocabulary:
+            grams = trigrams(word)
+            self.gram_counts[word] = len(grams)
+            for gram in grams:
+                self.postings.setdefault(gram, []).append(word)
+
+        # Users repeat the same typos, so remember the answers
+        self.correct = lru_cache(maxsize=cache_size)(self._correct)
+
+    def _correct(self, word):
+        """Closest vocabulary word within max_edits(word), else word itself."""
+        if word in self.vocabulary or word in self.ignore or len(word) < MIN_WORD_LENGTH:
+            return word
+
+        grams = trigrams(word)
+
+        shared = {}
+        for gram in grams:
+            for candidate in self.postings.get(gram, ()):
+                shared[candidate] = shared.get(candidate, 0) + 1
+
+        # Try one edit first: most typos are single edits and the
+        # tighter trigram bound leaves far fewer candidates to check
+        for limit in range(1, max_edits(word) + 1):
+            best = None
+            for candidate, count in shared.items():
+                # Each edit destroys at most 3 trigrams
+                if count < max(len(grams), self.gram_counts[candidate]) - 3 * limit:
+                    continue
+                if abs(len(candidate) - len(word)) > limit:
+                    continue
+                distance = bounded_edit_distance(word, candidate, limit)
+                if distance > limit:
+                    continue
+                rank = (distance, -count, candidate)
+                if best is None or rank < best:
+                    best = rank
+            if best:
+                return best[2]
+
+        return word
+
+    def correct_words(self, words):
+        return [self.correct(w) for w in words]
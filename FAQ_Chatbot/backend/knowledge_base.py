@@ -0,0 +1,163 @@
+"""
+knowledge_base.py
+Loads faqs.json together with its matching structures and
+lets the backend swap in a rebuilt copy without restarting.
+
+A KnowledgeBase is never modified after it is built. Readers grab
+store.current once per request and keep using that snapshot, so
+they never see a half-built index and never wait on a rebuild.
+"""
+
+import json
+import os
+import threading
+import time
+
+from fuzzy import FuzzyMatcher
+from ranking import KeywordRanker, make_ranker
+from semantic import SemanticRanker
+from snapshot import load_snapshot
+from tokenizer import DEFAULT_TOKENIZER
+
+
+class KnowledgeBase:
+    """
+    One immutable snapshot: the FAQ list, the ranker built from it
+    and, if enabled, the typo matcher over its keyword vocabulary.
+    """
+
+    def __init__(self, faqs, ranker, version, mtime, fuzzy=None):
+        self.faqs = faqs
+        self.ranker = ranker
+        self.version = version
+        self.mtime = mtime
+        self.fuzzy = fuzzy
+
+
+def build_fuzzy_matcher(faqs, tokenizer=DEFAULT_TOKENIZER, vocabulary=None):
+    """
+    Typo matcher over every FAQ keyword. Words that appear in the answers,
+    greetings and stopwords are real words, so they are never corrected.
+    """
+    if vocabulary is None:
+        vocabulary = {
+            tokenizer.normalize_keyword(keyword)
+            for faq in faqs
+            for keyword in faq["keywords"]
+        }
+    known_words = set(tokenizer.stopwords) | tokenizer.greetings
+    for faq in faqs:
+        known_words.update(tokenizer.tokenize(faq["answer"]))
+    return FuzzyMatcher(set(vocabulary) - tokenizer.greetings, ignore=known_words)
+
+
+def load_knowledge_base(faq_file, ranking_mode, version=1,
+                        tokenizer=DEFAULT_TOKENIZER, fuzzy=False, snapshot_file=None,
+                        semantic=None):
+    """
+    Builds a KnowledgeBase from a fresh compiled snapshot if there is one,
+    otherwise from faqs.json.
+    semantic, if given, holds SemanticRanker options (embedder, mode, ...)
+    and wraps the ranker with embedding retrieval.
+    """
+    mtime = os.path.getmtime(faq_file)
+    snapshot = load_snapshot(snapshot_file, faq_file, tokenizer)
+
+    if snapshot is not None:
+        faqs = snapshot.faqs
+        vocabulary = snapshot.index.vocabulary()
+        if ranking_mode == "keyword":
+            ranker = KeywordRanker(faqs, tokenizer, index=snapshot.index)
+        else:
+            ranker = make_ranker(faqs, ranking_mode, tokenizer)
+    else:
+        with open(faq_file, "r", encoding="utf-8") as file:
+            faqs = json.load(file)
+        vocabulary = None
+        ranker = make_ranker(faqs, ranking_mode, tokenizer)
+
+    if semantic is not None:
+        ranker = SemanticRanker(ranker, faqs, tokenizer=tokenizer, **semantic)
+
+    matcher = build_fuzzy_matcher(faqs, tokenizer, vocabulary) if fuzzy else None
+    return KnowledgeBase(faqs, ranker, version, mtime, matcher)
+
+
+class KnowledgeBaseStore:
+    """
+    Holds the live KnowledgeBase and rebuilds it in the background.
+    Swapping is a single reference assignment, which is atomic in Python.
+    """
+
+    def __init__(self, faq_file, ranking_mode, tokenizer=DEFAULT_TOKENIZER,
+                 fuzzy=False, snapshot_file=None, semantic=None):
+        self.faq_file = faq_file
+        self.ranking_mode = ranking_mode
+        self.tokenizer = tokenizer
+        self.fuzzy = fuzzy
+        self.snapshot_file = snapshot_file
+        self.semantic = semantic
+        self.current = load_knowledge_base(
+            faq_file, ranking_mode, tokenizer=tokenizer,
+            fuzzy=fuzzy, snapshot_file=snapshot_file, semantic=semantic
+        )
+        self.last_error = None
+        self._reload_lock = threading.Lock()
+        self._listeners = []
+
+    def on_reload(self, callback):
+        """Registers callback(new_kb), called right after each swap."""
+        self._listeners.append(callback)
+
+    def reload(self):
+        """
+        Rebuilds from disk and swaps the result in.
+        A broken faqs.json keeps the previous snapshot live.
+        Returns True if a new snapshot was installed.
+        """
+        with self._reload_lock:
+            try:
+                new_kb = load_knowledge_base(
+                    self.faq_file, self.ranking_mode,
+                    self.current.version + 1, self.tokenizer,
+                    self.fuzzy, self.snapshot_file, self.semantic
+                )
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                self.last_error = f"{type(e).__name__}: {e}"
+                print(f"FAQ reload failed, keeping version {self.current.version}: {self.last_error}")
+                return False
+
+            self.current = new_kb
+            self.last_error = None
+
+        for callback in self._listeners:
+            callback(new_kb)
+        print(f"FAQ knowledge base reloaded (version {new_kb.version}, {len(new_kb.faqs)} FAQs)")
+        return True
+
+    def reload_in_background(self):
+        """
+        Starts a rebuild on a daemon thread.
+        Returns False if a rebuild is already running.
+        """
+        if self._reload_lock.locked():
+            return False
+        threading.Thread(target=self.reload, daemon=True).start()
+        return True
+
+    def watch(self, interval=2.0):
+        """Polls the FAQ file's mtime and reloads when it changes."""
+        def poll():
+            seen_mtime = self.current.mtime
+            while True:
+                time.sleep(interval)
+                try:
+                    mtime = os.path.getmtime(self.faq_file)
+                except OSError:
+                    continue
+                # Only retry a broken file once it changes again
+                if mtime != seen_mtime:
+                    seen_mtime = mtime
+                    self.reload()
+
+        threading.Thread(target=poll, daemon=True).start()
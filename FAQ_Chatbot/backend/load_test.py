@@ -0,0 +1,265 @@
+"""
+load_test.py
+Reproducible HTTP load test for the /chat endpoint.
+
+For every combination of serving mode, matcher and corpus size it:
+1. writes a synthetic faqs.json of that size (seeded, same every run)
+2. starts the backend on it in a subprocess
+3. replays a fixed query mix from concurrent keep-alive clients
+4. reports p50/p99 latency and throughput
+
+Results can be saved as a baseline and later runs compared against it:
+
+    python load_test.py --output baseline.json
+    python load_test.py --baseline baseline.json
+
+Serving modes: "flask" (threaded Flask server) and "asgi" (serve.py,
+gunicorn + uvicorn workers). Matchers are the FAQ_RANKING_MODE values
+plus "semantic" (keyword ranking with FAQ_SEMANTIC=hybrid).
+The response cache is off unless --cache is given, so every request
+exercises the matcher.
+"""
+
+import argparse
+import http.client
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from benchmark import make_faqs, make_typo, make_vocab
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+SERVING_MODES = ("flask", "asgi")
+MATCHERS = ("keyword", "tfidf", "bm25", "semantic")
+DEFAULT_SIZES = (10, 1_000, 100_000)
+
+# Fraction of a throughput drop / p99 increase reported as a regression
+DEFAULT_TOLERANCE = 0.10
+
+
+def make_query_mix(faqs, n=1_000, seed=7):
+    """
+    Replayable message mix: mostly keyword questions, plus typos,
+    greetings and off-topic messages that fall through to the fallback.
+    """
+    rng = random.Random(seed)
+    filler = ["how", "do", "i", "the", "my", "for", "is", "what", "when", "can"]
+    messages = []
+    for _ in range(n):
+        roll = rng.random()
+        keywords = rng.choice(faqs)["keywords"]
+        if roll < 0.70:
+            words = rng.sample(keywords, 2) + rng.sample(filler, 3)
+        elif roll < 0.85:
+            words = [make_typo(rng.choice(keywords), rng)] + rng.sample(filler, 3)
+        elif roll < 0.90:
+            words = [rng.choice(["hi", "hello", "hey"]), "there"]
+        else:
+            words = rng.sample(filler, 4)
+        rng.shuffle(words)
+        messages.append(" ".join(words).capitalize() + "?")
+    return messages
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_server(port, timeout):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=1):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"Backend did not start on port {port} within {timeout}s")
+
+
+def start_server(serving_mode, matcher, faq_file, port, workers, cache):
+    env = dict(
+        os.environ,
+        FAQ_FILE=faq_file,
+        FAQ_RANKING_MODE="keyword" if matcher == "semantic" else matcher,
+        FAQ_SEMANTIC="hybrid" if matcher == "semantic" else "off",
+        FAQ_CACHE_SIZE=os.environ.get("FAQ_CACHE_SIZE", "1024") if cache else "0",
+        FAQ_PORT=str(port),
+        FAQ_HOST="127.0.0.1",
+        FAQ_WORKERS=str(workers),
+    )
+    if serving_mode == "flask":
+        command = [sys.executable, "-m", "flask", "--app", "app", "run",
+                   "--port", str(port), "--with-threads"]
+    else:
+        command = [sys.executable, "serve.py"]
+    return subprocess.Popen(
+        command, cwd=BACKEND_DIR, env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+
+
+def run_load(port, messages, concurrency, duration, warmup):
+    """
+    Replays messages round-robin from concurrency keep-alive clients.
+    Returns per-request latencies (seconds) measured after warmup.
+    """
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    start_at = time.monotonic() + warmup
+    stop_at = start_at + duration
+
+    def client(offset):
+        connection = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+        local = []
+        local_errors = 0
+        i = offset
+        while True:
+            now = time.monotonic()
+            if now >= stop_at:
+                break
+            body = json.dumps({"message": messages[i % len(messages)]})
+            i += concurrency
+            sent = time.perf_counter()
+            try:
+                connection.request("POST", "/chat", body, {"Content-Type": "application/json"})
+                response = connection.getresponse()
+                response.read()
+                ok = response.status == 200
+            except (OSError, http.client.HTTPException):
+                connection.close()
+                connection = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+                ok = False
+            elapsed = time.perf_counter() - sent
+            if now >= start_at:
+                if ok:
+                    local.append(elapsed)
+                else:
+                    local_errors += 1
+        connection.close()
+        with lock:
+            latencies.extend(local)
+            errors[0] += local_errors
+
+    threads = [threading.Thread(target=client, args=(n,)) for n in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, errors[0]
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return float("nan")
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def summarize(latencies, errors, duration):
+    latencies = sorted(latencies)
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / duration, 1),
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+    }
+
+
+def compare(result, baseline, tolerance):
+    """Short change note versus the baseline entry, flagging regressions."""
+    rps_change = result["throughput_rps"] / baseline["throughput_rps"] - 1
+    p99_change = result["p99_ms"] / baseline["p99_ms"] - 1
+    note = f"rps {rps_change:+.1%}, p99 {p99_change:+.1%}"
+    if rps_change < -tolerance or p99_change > tolerance:
+        note += "  REGRESSION"
+    return note
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--modes", nargs="+", choices=SERVING_MODES, default=list(SERVING_MODES))
+    parser.add_argument("--matchers", nargs="+", choices=MATCHERS, default=["keyword", "bm25"])
+    parser.add_argument("--sizes", nargs="+", type=int, default=list(DEFAULT_SIZES))
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds measured per run")
+    parser.add_argument("--warmup", type=float, default=2.0, help="seconds discarded per run")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="asgi workers")
+    parser.add_argument("--cache", action="store_true", help="keep the response cache on")
+    parser.add_argument("--startup-timeout", type=float, default=120.0)
+    parser.add_argument("--output", help="write results as JSON (e.g. a new baseline)")
+    parser.add_argument("--baseline", help="JSON results of an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as file:
+            baseline = json.load(file)["results"]
+
+    vocab = make_vocab(5_000)
+    results = {}
+
+    print(f"{'mode':>6} | {'matcher':>8} | {'FAQs':>7} | {'rps':>8} | {'p50 ms':>8} | {'p99 ms':>8} | {'errors':>6}")
+    print("-" * 67)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            faqs = make_faqs(size, vocab)
+            faq_file = os.path.join(tmp, f"faqs_{size}.json")
+            with open(faq_file, "w", encoding="utf-8") as file:
+                json.dump(faqs, file)
+            messages = make_query_mix(faqs)
+
+            for mode in args.modes:
+                for matcher in args.matchers:
+                    port = free_port()
+                    server = start_server(mode, matcher, faq_file, port, args.workers, args.cache)
+                    try:
+                        wait_for_server(port, args.startup_timeout)
+                        latencies, errors = run_load(
+                            port, messages, args.concurrency, args.duration, args.warmup
+                        )
+                    finally:
+                        server.terminate()
+                        server.wait()
+
+                    key = f"{mode}/{matcher}/{size}"
+                    result = results[key] = summarize(latencies, errors, args.duration)
+                    line = (
+                        f"{mode:>6} | {matcher:>8} | {size:>7} | {result['throughput_rps']:>8.1f} | "
+                        f"{result['p50_ms']:>8.3f} | {result['p99_ms']:>8.3f} | {errors:>6}"
+                    )
+                    if key in baseline:
+                        line += "  " + compare(result, baseline[key], args.tolerance)
+                    print(line, flush=True)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump({
+                "settings": {
+                    "concurrency": args.concurrency,
+                    "duration": args.duration,
+                    "workers": args.workers,
+                    "cache": args.cache,
+                },
+                "results": results,
+            }, file, indent=2)
+        print(f"\nSaved results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+"""
+metrics.py
+Minimal in-process counters and histograms for the FAQ backend,
+rendered in the Prometheus text exposition format on /metrics.
+
+With several worker processes, give the Registry a directory shared by
+all of them and call sync() in each worker after the fork. Every worker
+then writes a snapshot of its numbers there (every SYNC_INTERVAL seconds,
+and right before it renders), and /metrics on any worker reports:
+
+- counters and histograms summed over all workers, including ones that
+  have exited, so they never go backwards
+- gauges once per live worker, with a worker="<pid>" label, since they
+  describe that worker's own state (e.g. its cache)
+
+A scrape sees other workers' numbers up to SYNC_INTERVAL late.
+"""
+
+import bisect
+import glob
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# Request and phase latencies, in seconds
+LATENCY_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+    0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5,
+)
+
+SYNC_INTERVAL = 1.0  # seconds between snapshots of a worker's metrics
+
+
+def _format_labels(labelnames, values, extra=()):
+    pairs = list(zip(labelnames, values)) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (
+        (name, str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for name, value in pairs
+    )
+    return "{" + ",".join(f'{name}="{value}"' for name, value in escaped) + "}"
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonic counter, optionally split by labels."""
+
+    kind = "counter"
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(labels[name] for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def state(self):
+        """JSON-serialisable copy of the values."""
+        with self._lock:
+            return [[list(key), value] for key, value in self._values.items()]
+
+    @staticmethod
+    def merge(states):
+        """Sums the states of several workers, given as {worker: state}."""
+        total = {}
+        for state in states.values():
+            for key, value in state:
+                total[tuple(key)] = total.get(tuple(key), 0) + value
+        return [[list(key), value] for key, value in total.items()]
+
+    def samples(self, state=None):
+        if state is None:
+            state = self.state()
+        for key, value in sorted((tuple(key), value) for key, value in state):
+            yield self.name + _format_labels(self.labelnames, key), value
+
+
+class Histogram:
+    """Cumulative-bucket histogram, optionally split by labels."""
+
+    kind = "histogram"
+
+    def __init__(self, name, documentation, buckets=LATENCY_BUCKETS, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(sorted(buckets))
+        self.labelnames = tuple(labelnames)
+        # key -> [per-bucket counts (+Inf last), sum]
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(labels[name] for name in self.labelnames)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            state[0][index] += 1
+            state[1] += value
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def state(self):
+        """JSON-serialisable copy of the values."""
+        with self._lock:
+            return [[list(key), list(counts), total] for key, (counts, total) in self._values.items()]
+
+    @staticmethod
+    def merge(states):
+        """Adds up bucket counts and sums of several workers, given as {worker: state}."""
+        merged = {}
+        for state in states.values():
+            for key, counts, total in state:
+                current = merged.get(tuple(key))
+                if current is None:
+                    merged[tuple(key)] = [list(counts), total]
+                else:
+                    current[0] = [a + b for a, b in zip(current[0], counts)]
+                    current[1] += total
+        return [[list(key), counts, total] for key, (counts, total) in merged.items()]
+
+    def samples(self, state=None):
+        if state is None:
+            state = self.state()
+        for key, counts, total in sorted((tuple(key), counts, total) for key, counts, total in state):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = (("le", _format_value(bound)),)
+                yield self.name + "_bucket" + _format_labels(self.labelnames, key, le), cumulative
+            labels = _format_labels(self.labelnames, key)
+            yield self.name + "_sum" + labels, total
+            yield self.name + "_count" + labels, cumulative
+
+
+class Gauge:
+    """Value read from a callback at scrape time."""
+
+    kind = "gauge"
+
+    def __init__(self, name, documentation, callback):
+        self.name = name
+        self.documentation = documentation
+        self.callback = callback
+
+    def state(self):
+        return self.callback()
+
+    @staticmethod
+    def merge(states):
+        """One value per live worker, from {worker: state}."""
+        return [[worker, value] for worker, value in states.items() if _alive(worker)]
+
+    def samples(self, state=None):
+        if state is None:
+            yield self.name, self.callback()
+            return
+        for worker, value in sorted(state, key=lambda item: int(item[0])):
+            yield self.name + _format_labels(("worker",), (worker,)), value
+
+
+def _alive(worker):
+    # Signal 0 only checks that the pid exists (Unix, like serve.py)
+    try:
+        os.kill(int(worker), 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass  # exists, owned by someone else
+    return True
+
+
+class Registry:
+    def __init__(self, directory=None):
+        # Shared by all worker processes; None keeps metrics to this process
+        self.directory = directory
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self.register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, buckets=LATENCY_BUCKETS, labelnames=()):
+        return self.register(Histogram(name, documentation, buckets, labelnames))
+
+    def gauge(self, name, documentation, callback):
+        return self.register(Gauge(name, documentation, callback))
+
+    def write_snapshot(self):
+        """Saves this worker's numbers as <directory>/<pid>.json."""
+        snapshot = {metric.name: metric.state() for metric in self._metrics}
+        path = os.path.join(self.directory, f"{os.getpid()}.json")
+        with open(path + ".tmp", "w", encoding="utf-8") as file:
+            json.dump(snapshot, file)
+        os.replace(path + ".tmp", path)
+
+    def sync(self, interval=SYNC_INTERVAL):
+        """Writes a snapshot every interval seconds, from a daemon thread."""
+        def run():
+            while True:
+                try:
+                    self.write_snapshot()
+                except OSError:
+                    pass  # e.g. disk full; retried on the next round
+                time.sleep(interval)
+
+        threading.Thread(target=run, name="metrics-sync", daemon=True).start()
+
+    def _merged_states(self):
+        """{metric name: state} over every worker's latest snapshot."""
+        self.write_snapshot()
+        snapshots = {}
+        for path in glob.glob(os.path.join(self.directory, "*.json")):
+            try:
+                with open(path, "r", encoding="utf-8") as file:
+                    snapshots[os.path.basename(path)[:-len(".json")]] = json.load(file)
+            except (OSError, ValueError):
+                continue  # removed or replaced while listing
+        return {
+            metric.name: metric.merge({
+                worker: snapshot[metric.name]
+                for worker, snapshot in snapshots.items() if metric.name in snapshot
+            })
+            for metric in self._metrics
+        }
+
+    def render(self):
+        """All metrics in Prometheus text format (version 0.0.4)."""
+        states = self._merged_states() if self.directory else {}
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for sample, value in metric.samples(states.get(metric.name)):
+                lines.append(f"{sample} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,168 @@
+"""
+ranking.py
+Pluggable ranking engines for the FAQ backend.
+
+- "keyword": the original raw keyword-hit count (via FAQIndex)
+- "tfidf" / "bm25": a precomputed sparse term-weight matrix over FAQ
+  keywords and answers; a query is one sparse dot product plus a top-k.
+
+Every ranker exposes rank(words, k) and rank_batch(list_of_words, k),
+both returning [(faq_id, score), ...] sorted best first.
+"""
+
+import heapq
+import math
+
+import numpy as np
+from scipy import sparse
+
+from faq_index import FAQIndex
+from tokenizer import DEFAULT_TOKENIZER
+
+# Keywords are curated, answers are free text, so keywords count more
+KEYWORD_WEIGHT = 3.0
+
+# Standard BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+def _top_k(doc_ids, values, k):
+    """Best k (faq_id, score) pairs; ties go to the FAQ listed first."""
+    keep = values > 0
+    doc_ids, values = doc_ids[keep], values[keep]
+    order = np.lexsort((doc_ids, -values))[:k]
+    return [(int(doc_ids[i]), float(values[i])) for i in order]
+
+
+class KeywordRanker:
+    """The original scorer: one point per FAQ keyword found in the message."""
+
+    mode = "keyword"
+
+    def __init__(self, faqs, tokenizer=DEFAULT_TOKENIZER, index=None):
+        self.faqs = faqs
+        # A prebuilt index (e.g. from a snapshot) skips the build
+        if index is None:
+            index = FAQIndex(faqs, normalize=tokenizer.normalize_keyword)
+        self.index = index
+
+    def rank(self, words, k=1):
+        scores = self.index.scores(words)
+        return heapq.nsmallest(
+            k, scores.items(), key=lambda item: (-item[1], item[0])
+        )
+
+    def rank_batch(self, batch, k=1):
+        return [self.rank(words, k) for words in batch]
+
+
+class VectorRanker:
+    """
+    TF-IDF or BM25 weights stored as a sparse term x FAQ matrix.
+    Built once at load; queries never touch FAQs that share no terms.
+    """
+
+    def __init__(self, faqs, mode="tfidf", tokenizer=DEFAULT_TOKENIZER):
+        if mode not in ("tfidf", "bm25"):
+            raise ValueError(f"Unknown vector ranking mode: {mode}")
+
+        self.faqs = faqs
+        self.mode = mode
+        self.vocab = {}
+
+        # Weighted term frequencies per FAQ
+        doc_tfs = []
+        for faq in faqs:
+            tf = {}
+            # Deduplicated after normalising, so task / tasks weigh once
+            for keyword in dict.fromkeys(map(tokenizer.normalize_keyword, faq["keywords"])):
+                tf[keyword] = tf.get(keyword, 0.0) + KEYWORD_WEIGHT
+            for token in tokenizer.tokenize(faq["answer"], drop_stopwords=True):
+                tf[token] = tf.get(token, 0.0) + 1.0
+            for term in tf:
+                self.vocab.setdefault(term, len(self.vocab))
+            doc_tfs.append(tf)
+
+        n_docs = len(faqs)
+        n_terms = len(self.vocab)
+
+        df = np.zeros(n_terms)
+        for tf in doc_tfs:
+            for term in tf:
+                df[self.vocab[term]] += 1
+
+        if mode == "tfidf":
+            idf = np.log((1 + n_docs) / (1 + df)) + 1
+        else:
+            idf = np.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+
+        doc_lengths = np.array([sum(tf.values()) for tf in doc_tfs])
+        avg_length = doc_lengths.mean() if n_docs else 1.0
+
+        rows, cols, data = [], [], []
+        for doc_id, tf in enumerate(doc_tfs):
+            weights = []
+            for term, freq in tf.items():
+                term_id = self.vocab[term]
+                if mode == "tfidf":
+                    weight = (1 + math.log(freq)) * idf[term_id]
+                else:
+                    norm = BM25_K1 * (1 - BM25_B + BM25_B * doc_lengths[doc_id] / avg_length)
+                    weight = idf[term_id] * freq * (BM25_K1 + 1) / (freq + norm)
+                rows.append(term_id)
+                cols.append(doc_id)
+                weights.append(weight)
+
+            # TF-IDF rows are L2-normalised so long answers don't dominate
+            if mode == "tfidf" and weights:
+                length = math.sqrt(sum(w * w for w in weights))
+                weights = [w / length for w in weights]
+            data.extend(weights)
+
+        self.matrix = sparse.csr_matrix(
+            (data, (rows, cols)), shape=(n_terms, n_docs), dtype=np.float32
+        )
+
+    def _query_matrix(self, batch):
+        """One binary row per message over the FAQ vocabulary."""
+        indptr, indices = [0], []
+        for words in batch:
+            term_ids = {self.vocab[w] for w in words if w in self.vocab}
+            indices.extend(sorted(term_ids))
+            indptr.append(len(indices))
+        data = np.ones(len(indices), dtype=np.float32)
+        return sparse.csr_matrix(
+            (data, indices, indptr), shape=(len(batch), len(self.vocab))
+        )
+
+    def rank(self, words, k=1):
+        return self.rank_batch([words], k)[0]
+
+    def rank_batch(self, batch, k=1):
+        """Scores every message with a single sparse matrix product."""
+        scores = self._query_matrix(batch) @ self.matrix
+        results = []
+        for row in range(scores.shape[0]):
+            start, end = scores.indptr[row], scores.indptr[row + 1]
+            results.append(
+                _top_k(scores.indices[start:end], scores.data[start:end], k)
+            )
+        return results
+
+
+RANKING_MODES = ("keyword", "tfidf", "bm25")
+
+
+def make_ranker(faqs, mode="keyword", tokenizer=DEFAULT_TOKENIZER):
+    """
+    Builds the ranker for the given mode.
+    Pass the same tokenizer used on incoming messages.
+    """
+    if mode == "keyword":
+        return KeywordRanker(faqs, tokenizer)
+    if mode in ("tfidf", "bm25"):
+        return VectorRanker(faqs, mode, tokenizer)
+    raise ValueError(
+        f"Unknown ranking mode: {mode}. Choose from {', '.join(RANKING_MODES)}"
+    )
@@ -0,0 +1,293 @@
+"""
+semantic.py
+Optional embedding-based retrieval, so paraphrases that share no
+keywords with an FAQ can still find it.
+
+FAQ texts (keywords + answer) are tokenized like incoming messages,
+embedded once when the knowledge base is built and stored in an
+approximate nearest-neighbour index. A query then costs one embedding
+plus an ANN lookup.
+
+Embedders:
+- "hashing" (default): hashed word and character-trigram features,
+  no model download, deterministic across processes
+- "sentence-transformers:<model>": a local CPU sentence-transformers
+  model, if that package is installed
+
+SemanticRanker wraps the keyword/vector ranker:
+- "fallback": keyword scoring stays the fast path; embeddings are
+  only consulted for messages that match no keyword
+- "hybrid": every message is scored as
+  weight * keyword score + (1 - weight) * cosine similarity
+"""
+
+import random
+import zlib
+
+import numpy as np
+
+from tokenizer import DEFAULT_TOKENIZER
+
+SEMANTIC_MODES = ("off", "fallback", "hybrid")
+
+# Below this many FAQs one matrix-vector product beats the ANN index
+ANN_MIN_SIZE = 20_000
+
+# Share of the exact 10 nearest neighbours the ANN index must return
+# (measured on sample queries when it is built)
+ANN_TARGET_RECALL = 0.95
+
+# Sample queries used to pick n_probe, and their length in words
+CALIBRATION_QUERIES = 200
+CALIBRATION_WORDS = 4
+
+
+class HashingEmbedder:
+    """Feature hashing of words and character trigrams into dim buckets."""
+
+    name = "hashing"
+
+    def __init__(self, dim=512):
+        self.dim = dim
+
+    def _features(self, text):
+        for word in text.lower().split():
+            yield word, 1.0
+            padded = f"<{word}>"
+            for i in range(len(padded) - 2):
+                yield padded[i:i + 3], 0.5
+
+    def embed(self, texts):
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature, weight in self._features(text):
+                # crc32 rather than hash(): stable between processes and runs
+                h = zlib.crc32(feature.encode("utf-8"))
+                sign = 1.0 if h & 0x80000000 else -1.0
+                vectors[row, h % self.dim] += sign * weight
+        return _normalize(vectors)
+
+
+class SentenceTransformerEmbedder:
+    """A local sentence-transformers model, run on CPU."""
+
+    def __init__(self, model_name):
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError as e:
+            raise ImportError(
+                "sentence-transformers is not installed; "
+                "pip install sentence-transformers or use the hashing embedder"
+            ) from e
+        self.name = f"sentence-transformers:{model_name}"
+        self.model = SentenceTransformer(model_name, device="cpu")
+
+    def embed(self, texts):
+        vectors = self.model.encode(list(texts), convert_to_numpy=True)
+        return _normalize(vectors.astype(np.float32))
+
+
+def make_embedder(name="hashing"):
+    if name == "hashing":
+        return HashingEmbedder()
+    if name.startswith("sentence-transformers:"):
+        return SentenceTransformerEmbedder(name.split(":", 1)[1])
+    raise ValueError(f"Unknown embedder: {name}")
+
+
+def _normalize(vectors):
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def _assign(vectors, centroids, chunk_size=10_000):
+    """Nearest centroid per vector, in chunks to bound the score matrix."""
+    return np.concatenate([
+        np.argmax(vectors[start:start + chunk_size] @ centroids.T, axis=1)
+        for start in range(0, len(vectors), chunk_size)
+    ])
+
+
+def _top_k_rows(scores, k):
+    """Column ids of the k best scores in each row, best first."""
+    k = min(k, scores.shape[1])
+    if k == 0:
+        return np.zeros((scores.shape[0], 0), dtype=np.int64)
+    top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    order = np.argsort(-np.take_along_axis(scores, top, axis=1), axis=1, kind="stable")
+    return np.take_along_axis(top, order, axis=1)
+
+
+def _probes_for_recall(vectors, centroids, assignment, queries, target_recall, k=10):
+    """
+    Fewest lists to probe so that target_recall of each query's exact
+    k nearest neighbours sit in one of its probed lists.
+    """
+    # A few queries at a time, to bound the queries x FAQs score matrix
+    neighbours = np.concatenate([
+        _top_k_rows(queries[start:start + 25] @ vectors.T, k)
+        for start in range(0, len(queries), 25)
+    ])
+    probe_order = np.argsort(-(queries @ centroids.T), axis=1)
+    # list_rank[q, l]: position of list l in query q's probe order
+    list_rank = np.argsort(probe_order, axis=1)
+    needed = np.take_along_axis(list_rank, assignment[neighbours], axis=1)
+    return int(np.quantile(needed, target_recall, method="higher")) + 1
+
+
+class ANNIndex:
+    """
+    Inverted-file (IVF) index over unit vectors: k-means splits the FAQs
+    into ~sqrt(N) lists and a query only scans the n_probe closest lists.
+
+    n_probe is the fewest lists that return target_recall of the exact
+    10 nearest neighbours for the calibration queries (a sample of the
+    vectors themselves if none are given). Small corpora, and corpora
+    that need more than half the lists probed, are scanned exactly.
+    """
+
+    def __init__(self, vectors, n_probe=None, target_recall=ANN_TARGET_RECALL,
+                 calibration_queries=None, iterations=10, seed=0, min_size=ANN_MIN_SIZE):
+        self.vectors = vectors
+        self.centroids = None
+        n = len(vectors)
+
+        if n < min_size:
+            return
+
+        rng = np.random.default_rng(seed)
+        n_lists = int(np.sqrt(n))
+        centroids = vectors[rng.choice(n, n_lists, replace=False)]
+        for _ in range(iterations):
+            assignment = _assign(vectors, centroids)
+            for list_id in range(n_lists):
+                members = vectors[assignment == list_id]
+                if len(members):
+                    centroids[list_id] = members.mean(axis=0)
+            centroids = _normalize(centroids)
+
+        assignment = _assign(vectors, centroids)
+        if n_probe is None:
+            if calibration_queries is None:
+                sample = rng.choice(n, min(n, CALIBRATION_QUERIES), replace=False)
+                calibration_queries = vectors[sample]
+            n_probe = _probes_for_recall(
+                vectors, centroids, assignment, calibration_queries, target_recall
+            )
+            if n_probe > n_lists // 2:
+                # No useful cluster structure: the exact scan is about as fast
+                return
+        self.n_probe = n_probe
+
+        # Store each list contiguously so a probe is a slice, not a gather
+        order = np.argsort(assignment, kind="stable")
+        self.centroids = centroids
+        self.list_ids = order
+        self.list_vectors = vectors[order]
+        self.list_bounds = np.searchsorted(assignment[order], np.arange(n_lists + 1))
+
+    def search(self, queries, k=10):
+        """[(faq_ids, similarities), ...] per query row, best first."""
+        if self.centroids is None:
+            scores = queries @ self.vectors.T
+            top = _top_k_rows(scores, k)
+            return [(ids, scores[row, ids]) for row, ids in enumerate(top)]
+
+        results = []
+        probes = _top_k_rows(queries @ self.centroids.T, self.n_probe)
+        bounds = self.list_bounds
+        for query, lists in zip(queries, probes):
+            spans = [(bounds[i], bounds[i + 1]) for i in lists]
+            scores = np.concatenate([self.list_vectors[a:b] @ query for a, b in spans])
+            candidates = np.concatenate([self.list_ids[a:b] for a, b in spans])
+            top = _top_k_rows(scores[np.newaxis, :], k)[0]
+            results.append((candidates[top], scores[top]))
+        return results
+
+
+def faq_text(faq, tokenizer=DEFAULT_TOKENIZER):
+    """Keywords and answer, normalized the same way as incoming messages."""
+    return " ".join(tokenizer.tokenize(" ".join(faq["keywords"]) + " " + faq["answer"]))
+
+
+def sample_queries(texts, embedder, seed=0):
+    """Short random word samples of the FAQ texts, embedded like queries."""
+    rng = random.Random(seed)
+    texts = rng.sample(texts, min(len(texts), CALIBRATION_QUERIES))
+    return embedder.embed([
+        " ".join(rng.sample(words, min(len(words), CALIBRATION_WORDS)))
+        for words in (text.split() for text in texts)
+    ])
+
+
+class SemanticRanker:
+    """
+    Adds embedding retrieval on top of another ranker, with the same
+    rank / rank_batch interface. Scores in "hybrid" mode are in [0, 1].
+    """
+
+    def __init__(self, base, faqs, embedder, mode="fallback", keyword_weight=0.5,
+                 min_similarity=0.2, candidates=10, target_recall=ANN_TARGET_RECALL,
+                 tokenizer=DEFAULT_TOKENIZER):
+        if mode not in ("fallback", "hybrid"):
+            raise ValueError(f"Unknown semantic mode: {mode}")
+
+        self.base = base
+        self.faqs = faqs
+        self.embedder = embedder
+        self.mode = mode
+        self.keyword_weight = keyword_weight
+        self.min_similarity = min_similarity
+        self.candidates = candidates
+        texts = [faq_text(faq, tokenizer) for faq in faqs]
+        vectors = embedder.embed(texts)
+        queries = sample_queries(texts, embedder) if len(texts) >= ANN_MIN_SIZE else None
+        self.index = ANNIndex(vectors, target_recall=target_recall, calibration_queries=queries)
+
+    def rank(self, words, k=1):
+        return self.rank_batch([words], k)[0]
+
+    def _semantic(self, batch):
+        """ANN results for a batch of tokenized messages."""
+        if not batch:
+            return []
+        queries = self.embedder.embed([" ".join(words) for words in batch])
+        return self.index.search(queries, self.candidates)
+
+    def rank_batch(self, batch, k=1):
+        if self.mode == "fallback":
+            return self._rank_fallback(batch, k)
+        return self._rank_hybrid(batch, k)
+
+    def _rank_fallback(self, batch, k):
+        results = self.base.rank_batch(batch, k)
+        missed = [i for i, matches in enumerate(results) if not matches]
+
+        for i, (ids, sims) in zip(missed, self._semantic([batch[i] for i in missed])):
+            results[i] = [
+                (int(faq_id), float(sim))
+                for faq_id, sim in zip(ids, sims)
+                if sim >= self.min_similarity
+            ][:k]
+        return results
+
+    def _rank_hybrid(self, batch, k):
+        keyword_results = self.base.rank_batch(batch, self.candidates)
+        semantic_results = self._semantic(batch)
+        weight = self.keyword_weight
+
+        results = []
+        for keyword_matches, (ids, sims) in zip(keyword_results, semantic_results):
+            best_keyword = keyword_matches[0][1] if keyword_matches else 0
+            combined = {}
+            for faq_id, score in keyword_matches:
+                combined[faq_id] = weight * score / best_keyword
+            for faq_id, sim in zip(ids, sims):
+                if sim >= self.min_similarity:
+                    faq_id = int(faq_id)
+                    combined[faq_id] = combined.get(faq_id, 0.0) + (1 - weight) * float(sim)
+
+            ranked = sorted(combined.items(), key=lambda item: (-item[1], item[0]))
+            results.append(ranked[:k])
+        return results
@@ -0,0 +1,92 @@
+"""
+serve.py
+Production server for the FAQ backend: gunicorn managing uvicorn workers.
+
+The app (and with it faqs.json and the ranker) is imported once in the
+master process before the workers are forked, so every worker shares
+the read-only FAQ structures copy-on-write instead of parsing and
+indexing faqs.json on its own.
+
+POST /admin/reload reaches one worker; it bumps a reload counter shared
+by all workers, and each of them rebuilds on its next request.
+
+Each worker also saves its metrics to FAQ_METRICS_DIR (a fresh temporary
+directory unless set), so /metrics on any worker reports all of them.
+
+Run: python serve.py
+Env: FAQ_HOST (0.0.0.0), FAQ_PORT (5000), FAQ_WORKERS (CPU count)
+
+gunicorn needs a Unix-like OS. On Windows use
+    uvicorn asgi:application --port 5000 --workers 4
+which works but builds the index once per worker.
+"""
+
+import gc
+import glob
+import multiprocessing
+import os
+import shutil
+import tempfile
+
+from gunicorn.app.base import BaseApplication
+
+# Keeps app.py from starting the faqs.json watcher in the master
+os.environ["FAQ_PREFORKED"] = "1"
+
+# Where the workers save their metrics; created before app.py reads it
+OWN_METRICS_DIR = "FAQ_METRICS_DIR" not in os.environ
+if OWN_METRICS_DIR:
+    os.environ["FAQ_METRICS_DIR"] = tempfile.mkdtemp(prefix="faq-metrics-")
+os.makedirs(os.environ["FAQ_METRICS_DIR"], exist_ok=True)
+for stale in glob.glob(os.path.join(os.environ["FAQ_METRICS_DIR"], "*.json")):
+    os.remove(stale)  # left by an earlier run
+
+import app as faq_app  # noqa: E402
+from asgi import application  # noqa: E402
+
+
+class FAQServer(BaseApplication):
+    """Runs an already-imported application instead of loading one by path."""
+
+    def __init__(self, application, options):
+        self.application = application
+        self.options = options
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self):
+        return self.application
+
+
+def post_fork(server, worker):
+    # Threads don't survive fork, so the watcher runs in each worker only
+    if faq_app.WATCH_INTERVAL > 0:
+        faq_app.knowledge_base.watch(faq_app.WATCH_INTERVAL)
+    faq_app.metrics.sync()
+
+
+def on_exit(server):
+    if OWN_METRICS_DIR:
+        shutil.rmtree(os.environ["FAQ_METRICS_DIR"], ignore_errors=True)
+
+
+if __name__ == "__main__":
+    host = os.environ.get("FAQ_HOST", "0.0.0.0")
+    port = os.environ.get("FAQ_PORT", "5000")
+    workers = int(os.environ.get("FAQ_WORKERS", multiprocessing.cpu_count()))
+
+    # Move everything loaded so far out of the GC's reach, so collections
+    # in the workers don't touch (and copy) the shared FAQ pages
+    gc.freeze()
+
+    FAQServer(application, {
+        "bind": f"{host}:{port}",
+        "workers": workers,
+        "worker_class": "uvicorn_worker.UvicornWorker",
+        "preload_app": True,
+        "post_fork": post_fork,
+        "on_exit": on_exit,
+    }).run()
@@ -0,0 +1,262 @@
+"""
+snapshot.py
+Compiled binary snapshot of faqs.json for fast backend startup.
+
+The snapshot holds the interned keyword vocabulary, the keyword -> FAQ
+postings and the answers, each as a flat array or UTF-8 blob. Workers
+memory-map it instead of running json.load and rebuilding the index,
+and only decode the answers they actually send back.
+
+A snapshot records the size and mtime of the faqs.json it was built
+from; if either differs (or the tokenizer settings changed) it is
+treated as stale and the backend falls back to faqs.json.
+
+Compile: python snapshot.py   (honours FAQ_FILE and FAQ_STEMMING like app.py)
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections.abc import Sequence
+
+from faq_index import FAQIndex
+from tokenizer import DEFAULT_TOKENIZER, Tokenizer
+
+MAGIC = b"FAQSNAP\0"
+FORMAT_VERSION = 2  # 2: postings deduplicated per FAQ after normalising
+
+FLAG_STEMMED = 1
+FLAG_BIG_ENDIAN = 2
+
+# magic, format version, flags, source mtime_ns, source size, FAQ count,
+# term count, then (offset, length) in bytes of each section
+SECTIONS = (
+    "vocab_offsets", "vocab_blob",
+    "postings_offsets", "postings",
+    "answer_offsets", "answer_blob",
+    "keyword_offsets", "keyword_blob",
+)
+HEADER = struct.Struct("<8sIIqqII" + "QQ" * len(SECTIONS))
+
+# Separates the raw keywords of one FAQ inside keyword_blob
+KEYWORD_SEPARATOR = "\0"
+
+
+def _uint32_array(values):
+    return array("I", values)
+
+
+def _blob(strings):
+    """Concatenated UTF-8 strings and their byte offsets."""
+    offsets = [0]
+    chunks = []
+    for text in strings:
+        encoded = text.encode("utf-8")
+        chunks.append(encoded)
+        offsets.append(offsets[-1] + len(encoded))
+    return _uint32_array(offsets), b"".join(chunks)
+
+
+def _flags(tokenizer):
+    flags = FLAG_STEMMED if tokenizer.stem else 0
+    if sys.byteorder == "big":
+        flags |= FLAG_BIG_ENDIAN
+    return flags
+
+
+def write_snapshot(faq_file, snapshot_file, tokenizer=DEFAULT_TOKENIZER, faqs=None):
+    """
+    Compiles faq_file into snapshot_file.
+    Written to a temp file and renamed, so readers never see a partial file.
+    """
+    stat = os.stat(faq_file)
+    if faqs is None:
+        with open(faq_file, "r", encoding="utf-8") as file:
+            faqs = json.load(file)
+
+    index = FAQIndex(faqs, normalize=tokenizer.normalize_keyword)
+    terms = sorted(index.vocabulary())
+
+    vocab_offsets, vocab_blob = _blob(terms)
+    postings_offsets = [0]
+    postings = []
+    for term in terms:
+        postings.extend(index.postings_for(term))
+        postings_offsets.append(len(postings))
+
+    answer_offsets, answer_blob = _blob(faq["answer"] for faq in faqs)
+    keyword_offsets, keyword_blob = _blob(
+        KEYWORD_SEPARATOR.join(faq["keywords"]) for faq in faqs
+    )
+
+    sections = [
+        vocab_offsets.tobytes(), vocab_blob,
+        _uint32_array(postings_offsets).tobytes(), _uint32_array(postings).tobytes(),
+        answer_offsets.tobytes(), answer_blob,
+        keyword_offsets.tobytes(), keyword_blob,
+    ]
+
+    positions = []
+    offset = HEADER.size
+    for data in sections:
+        positions.extend((offset, len(data)))
+        offset += len(data)
+
+    header = HEADER.pack(
+        MAGIC, FORMAT_VERSION, _flags(tokenizer),
+        stat.st_mtime_ns, stat.st_size, len(faqs), len(terms), *positions
+    )
+
+    temp_file = f"{snapshot_file}.tmp"
+    with open(temp_file, "wb") as file:
+        file.write(header)
+        for data in sections:
+            file.write(data)
+    os.replace(temp_file, snapshot_file)
+
+    return len(faqs), len(terms)
+
+
+class SnapshotFAQs(Sequence):
+    """
+    Read-only FAQ list backed by the snapshot.
+    Items look like faqs.json entries but are decoded on access.
+    """
+
+    def __init__(self, snapshot):
+        self._snapshot = snapshot
+
+    def __len__(self):
+        return self._snapshot.n_faqs
+
+    def __getitem__(self, faq_id):
+        if isinstance(faq_id, slice):
+            return [self[i] for i in range(*faq_id.indices(len(self)))]
+        if faq_id < 0:
+            faq_id += len(self)
+        if not 0 <= faq_id < len(self):
+            raise IndexError("FAQ id out of range")
+
+        keywords = self._snapshot.keywords(faq_id)
+        return {
+            "keywords": keywords.split(KEYWORD_SEPARATOR) if keywords else [],
+            "answer": self._snapshot.answer(faq_id),
+        }
+
+
+class SnapshotIndex(FAQIndex):
+    """FAQIndex whose postings live in the memory-mapped snapshot."""
+
+    def __init__(self, snapshot):
+        self.faqs = snapshot.faqs
+        self._snapshot = snapshot
+
+    def postings_for(self, word):
+        term_id = self._snapshot.term_ids.get(word)
+        if term_id is None:
+            return ()
+        offsets = self._snapshot.postings_offsets
+        return self._snapshot.postings[offsets[term_id]:offsets[term_id + 1]]
+
+    def vocabulary(self):
+        return self._snapshot.term_ids.keys()
+
+
+class Snapshot:
+    """An opened, memory-mapped snapshot file."""
+
+    def __init__(self, snapshot_file):
+        with open(snapshot_file, "rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        view = memoryview(self._mmap)
+        if len(view) < HEADER.size:
+            raise ValueError("Snapshot file is truncated")
+
+        fields = HEADER.unpack_from(view)
+        (magic, self.format_version, self.flags,
+         self.source_mtime_ns, self.source_size,
+         self.n_faqs, n_terms) = fields[:7]
+        positions = fields[7:]
+
+        if magic != MAGIC:
+            raise ValueError("Not an FAQ snapshot")
+        if self.format_version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported snapshot version {self.format_version}")
+
+        sections = {}
+        for i, name in enumerate(SECTIONS):
+            offset, length = positions[2 * i], positions[2 * i + 1]
+            if offset + length > len(view):
+                raise ValueError("Snapshot file is truncated")
+            sections[name] = view[offset:offset + length]
+
+        self.postings_offsets = sections["postings_offsets"].cast("I")
+        self.postings = sections["postings"].cast("I")
+        self._answer_offsets = sections["answer_offsets"].cast("I")
+        self._answer_blob = sections["answer_blob"]
+        self._keyword_offsets = sections["keyword_offsets"].cast("I")
+        self._keyword_blob = sections["keyword_blob"]
+
+        # The vocabulary is small next to the answers; intern it into a
+        # dict once so a lookup is a hash probe, not a binary search
+        vocab_offsets = sections["vocab_offsets"].cast("I")
+        vocab_blob = sections["vocab_blob"]
+        self.term_ids = {
+            sys.intern(str(vocab_blob[vocab_offsets[i]:vocab_offsets[i + 1]], "utf-8")): i
+            for i in range(n_terms)
+        }
+
+        self.faqs = SnapshotFAQs(self)
+        self.index = SnapshotIndex(self)
+
+    def is_fresh(self, faq_file, tokenizer):
+        """True if built from the current faq_file with the same tokenizer settings."""
+        try:
+            stat = os.stat(faq_file)
+        except OSError:
+            return False
+        return (
+            stat.st_mtime_ns == self.source_mtime_ns
+            and stat.st_size == self.source_size
+            and self.flags == _flags(tokenizer)
+        )
+
+    def answer(self, faq_id):
+        start, end = self._answer_offsets[faq_id], self._answer_offsets[faq_id + 1]
+        return str(self._answer_blob[start:end], "utf-8")
+
+    def keywords(self, faq_id):
+        start, end = self._keyword_offsets[faq_id], self._keyword_offsets[faq_id + 1]
+        return str(self._keyword_blob[start:end], "utf-8")
+
+
+def load_snapshot(snapshot_file, faq_file, tokenizer=DEFAULT_TOKENIZER):
+    """
+    Opens snapshot_file if it exists and matches faq_file.
+    Returns None when it is missing, stale or unreadable.
+    """
+    if not snapshot_file or not os.path.exists(snapshot_file):
+        return None
+    try:
+        snapshot = Snapshot(snapshot_file)
+    except (OSError, ValueError, struct.error) as e:
+        print(f"Ignoring FAQ snapshot {snapshot_file}: {e}")
+        return None
+    if not snapshot.is_fresh(faq_file, tokenizer):
+        print(f"FAQ snapshot {snapshot_file} is stale, loading {faq_file} instead")
+        return None
+    return snapshot
+
+
+if __name__ == "__main__":
+    backend_dir = os.path.dirname(os.path.abspath(__file__))
+    faq_file = os.environ.get("FAQ_FILE", os.path.join(backend_dir, "faqs.json"))
+    snapshot_file = os.environ.get("FAQ_SNAPSHOT", os.path.splitext(faq_file)[0] + ".snapshot")
+    tokenizer = Tokenizer(stem=os.environ.get("FAQ_STEMMING") == "1")
+
+    n_faqs, n_terms = write_snapshot(faq_file, snapshot_file, tokenizer)
+    print(f"Wrote {snapshot_file}: {n_faqs} FAQs, {n_terms} keywords")
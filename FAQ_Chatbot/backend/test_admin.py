@@ -0,0 +1,35 @@
+"""
+Tests for access to the /admin routes.
+Run from this directory: python -m pytest
+"""
+
+import pytest
+
+import app as faq_app
+
+
+def get_cache_stats(remote_addr, headers=None):
+    client = faq_app.app.test_client()
+    return client.get("/admin/cache", headers=headers or {},
+                      environ_base={"REMOTE_ADDR": remote_addr}).status_code
+
+
+@pytest.mark.parametrize("remote_addr, status", [
+    ("127.0.0.1", 200),
+    ("::1", 200),
+    ("203.0.113.7", 403),
+    ("10.0.0.2", 403),
+])
+def test_without_token_only_localhost_is_admin(monkeypatch, remote_addr, status):
+    monkeypatch.setattr(faq_app, "ADMIN_TOKEN", None)
+    assert get_cache_stats(remote_addr) == status
+
+
+@pytest.mark.parametrize("headers, status", [
+    ({"X-Admin-Token": "secret"}, 200),
+    ({"X-Admin-Token": "wrong"}, 403),
+    ({}, 403),
+])
+def test_with_token_the_header_decides(monkeypatch, headers, status):
+    monkeypatch.setattr(faq_app, "ADMIN_TOKEN", "secret")
+    assert get_cache_stats("127.0.0.1", headers) == status
@@ -0,0 +1,71 @@
+"""
+Tests for the typo matcher and how the chat route uses it.
+Run from this directory: python -m pytest
+"""
+
+import json
+import os
+
+import pytest
+
+import app as faq_app
+from knowledge_base import KnowledgeBaseStore, build_fuzzy_matcher
+from tokenizer import DEFAULT_TOKENIZER
+
+FAQ_FILE = os.path.join(os.path.dirname(__file__), "faqs.json")
+
+
+@pytest.fixture(scope="module")
+def matcher():
+    with open(FAQ_FILE, "r", encoding="utf-8") as file:
+        return build_fuzzy_matcher(json.load(file))
+
+
+@pytest.mark.parametrize("typo, keyword", [
+    ("certficate", "certificate"),
+    ("submision", "submission"),
+    ("internshp", "internship"),
+    ("deadine", "deadline"),
+])
+def test_typos_are_corrected(matcher, typo, keyword):
+    assert matcher.correct(typo) == keyword
+
+
+@pytest.mark.parametrize("word", [
+    # short words one edit from a keyword (post, quit, mode, long)
+    "most", "cost", "lost", "quite", "more", "along",
+    # common words one edit from a keyword (remote, project, submit, review)
+    "remove", "protect", "summit", "preview", "tissue",
+])
+def test_common_words_are_left_alone(matcher, word):
+    assert matcher.correct(word) == word
+
+
+def test_answer_words_are_left_alone(matcher):
+    with open(FAQ_FILE, "r", encoding="utf-8") as file:
+        faqs = json.load(file)
+    words = {w for faq in faqs for w in DEFAULT_TOKENIZER.tokenize(faq["answer"])}
+    assert all(matcher.correct(w) == w for w in words)
+
+
+def test_greetings_are_not_correction_targets(matcher):
+    assert "hello" not in matcher.vocabulary
+    assert matcher.correct("helloo") == "helloo"
+
+
+def test_fuzzy_matching_is_off_by_default():
+    if "FAQ_FUZZY" in os.environ:
+        pytest.skip("FAQ_FUZZY is set in the environment")
+    assert faq_app.FUZZY_MATCHING is False
+    assert faq_app.knowledge_base.current.fuzzy is None
+
+
+def test_greeting_checked_on_uncorrected_words(monkeypatch):
+    store = KnowledgeBaseStore(FAQ_FILE, "keyword", faq_app.tokenizer, fuzzy=True)
+    monkeypatch.setattr(faq_app, "knowledge_base", store)
+    faq_app.response_cache.clear()
+
+    assert faq_app.find_best_answer("hello there") == faq_app.GREETING_RESPONSE
+    # "opening" is two edits from the greeting (and keyword) "evening"
+    assert faq_app.find_best_answer("is there an opening") != faq_app.GREETING_RESPONSE
+    assert faq_app.find_best_answer("what is the deadine") != faq_app.FALLBACK_RESPONSE
@@ -0,0 +1,65 @@
+"""
+Tests for metrics shared by several worker processes.
+Run from this directory: python -m pytest
+"""
+
+import multiprocessing
+import os
+
+import pytest
+
+from metrics import Registry
+
+fork = pytest.mark.skipif(
+    "fork" not in multiprocessing.get_all_start_methods(), reason="needs fork, like serve.py"
+)
+
+
+def make_registry(directory):
+    registry = Registry(directory)
+    answers = registry.counter("answers_total", "Answers.", labelnames=("faq_id",))
+    latency = registry.histogram("latency_seconds", "Latency.", buckets=(0.1, 1))
+    registry.gauge("version", "Version.", lambda: 7)
+    return registry, answers, latency
+
+
+def run_worker(directory):
+    registry, answers, latency = make_registry(directory)
+    answers.inc(faq_id=1)
+    answers.inc(faq_id=2)
+    latency.observe(0.5)
+    registry.write_snapshot()
+
+
+@fork
+def test_workers_are_summed(tmp_path):
+    directory = str(tmp_path)
+    worker = multiprocessing.get_context("fork").Process(target=run_worker, args=(directory,))
+    worker.start()
+    worker.join()
+    registry, answers, latency = make_registry(directory)
+    answers.inc(faq_id=1)
+    latency.observe(0.05)
+
+    lines = registry.render().splitlines()
+
+    assert 'answers_total{faq_id="1"} 2' in lines
+    assert 'answers_total{faq_id="2"} 1' in lines
+    assert 'latency_seconds_bucket{le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{le="1"} 2' in lines
+    assert "latency_seconds_count 2" in lines
+    assert "latency_seconds_sum 0.55" in lines
+    # The exited worker's counts stay, but its gauges are gone
+    assert [line for line in lines if line.startswith("version")] == [
+        f'version{{worker="{os.getpid()}"}} 7'
+    ]
+
+
+def test_without_directory_only_this_process_is_reported():
+    registry, answers, _ = make_registry(None)
+    answers.inc(faq_id=1)
+
+    lines = registry.render().splitlines()
+
+    assert 'answers_total{faq_id="1"} 1' in lines
+    assert "version 7" in lines
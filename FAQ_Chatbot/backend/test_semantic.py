@@ -0,0 +1,65 @@
+"""
+Tests for embedding retrieval: ANN recall and FAQ text normalization.
+Run from this directory: python -m pytest
+"""
+
+import numpy as np
+
+from ranking import make_ranker
+from semantic import ANN_TARGET_RECALL, ANNIndex, HashingEmbedder, SemanticRanker, _normalize, faq_text
+from tokenizer import Tokenizer
+
+
+def clustered_vectors(n, clusters=50, dim=32, spread=0.3, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dim))
+    points = centers[rng.integers(clusters, size=n)] + spread * rng.normal(size=(n, dim))
+    return _normalize(points.astype(np.float32))
+
+
+def recall_at_10(index, queries):
+    exact = [set(np.argsort(index.vectors @ query)[-10:].tolist()) for query in queries]
+    found = sum(
+        len(set(ids.tolist()) & neighbours)
+        for (ids, _), neighbours in zip(index.search(queries, 10), exact)
+    )
+    return found / (10 * len(queries))
+
+
+def test_ann_reaches_target_recall():
+    points = clustered_vectors(6200)
+    vectors, queries = points[:6000], points[6000:]
+    index = ANNIndex(vectors, min_size=1000)
+
+    assert index.centroids is not None
+    assert index.n_probe < len(index.centroids) // 2
+    assert recall_at_10(index, queries) >= ANN_TARGET_RECALL - 0.03
+
+
+def test_unclustered_vectors_use_exact_search():
+    rng = np.random.default_rng(0)
+    vectors = _normalize(rng.normal(size=(6000, 256)).astype(np.float32))
+    index = ANNIndex(vectors, min_size=1000)
+
+    assert index.centroids is None
+    assert recall_at_10(index, vectors[:20]) == 1.0
+
+
+def test_faq_text_is_normalized_like_messages():
+    faq = {"keywords": ["Certificate"], "answer": "Yes, you'll get a certificate!"}
+    assert faq_text(faq) == "certificate yes youll get a certificate"
+    assert faq_text(faq, Tokenizer(stem=True)).split()[0] == "certificate"
+
+
+def test_punctuated_faq_matches_plain_query():
+    faqs = [
+        {"keywords": ["fee"], "answer": "Payment? No, the program is completely free."},
+        {"keywords": ["duration"], "answer": "It lasts four weeks, from start to finish."},
+    ]
+    tokenizer = Tokenizer()
+    ranker = SemanticRanker(
+        make_ranker(faqs, "keyword", tokenizer), faqs, HashingEmbedder(), tokenizer=tokenizer
+    )
+    query = tokenizer.tokenize("Is there any payment?")
+    sims = ranker.index.search(HashingEmbedder().embed([" ".join(query)]), 2)[0]
+    assert ranker.rank(query) == [(0, float(sims[1][0]))]
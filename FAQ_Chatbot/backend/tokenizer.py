@@ -0,0 +1,77 @@
+"""
+tokenizer.py
+Message normalisation shared by the chat route, the batch scorer
+and the rankers. Everything that used to be rebuilt per call (the
+punctuation table, the greeting list) is built once here.
+"""
+
+import string
+
+GREETINGS = ("hi", "hello", "hey", "morning", "evening")
+
+# Filler words that would otherwise match every FAQ answer
+STOPWORDS = frozenset({
+    "a", "an", "and", "are", "as", "at", "be", "by", "can", "do", "for",
+    "from", "how", "i", "in", "is", "it", "its", "may", "my", "of", "on",
+    "or", "the", "their", "this", "to", "what", "when", "with", "you", "your",
+})
+
+# Shortest stem the suffix stripper is allowed to leave behind
+MIN_STEM_LENGTH = 4
+
+
+def light_stem(word):
+    """
+    Very small suffix stripper: tasks -> task, submitted -> submit,
+    certificates -> certificate. Cheap and predictable, not Porter.
+    """
+    if word.endswith("ies") and len(word) - 2 >= MIN_STEM_LENGTH:
+        return word[:-3] + "y"
+
+    for suffix in ("ing", "ed", "s"):
+        if not word.endswith(suffix) or len(word) - len(suffix) < MIN_STEM_LENGTH:
+            continue
+        if suffix == "s" and word.endswith(("ss", "us", "is")):
+            return word
+        stem = word[:-len(suffix)]
+        # submitt -> submit, but keep "fill", "pass", "buzz"
+        if suffix != "s" and stem[-1] == stem[-2] and stem[-1] not in "lsz":
+            stem = stem[:-1]
+        return stem
+
+    return word
+
+
+class Tokenizer:
+    """
+    Lowercases, strips ASCII punctuation and splits on whitespace.
+    Built once at startup and shared; it holds no per-call state.
+    """
+
+    def __init__(self, greetings=GREETINGS, stopwords=STOPWORDS, stem=False):
+        self.stem = stem
+        self._table = str.maketrans("", "", string.punctuation)
+        self.stopwords = frozenset(self._normalize(w) for w in stopwords)
+        self.greetings = frozenset(self._normalize(w) for w in greetings)
+
+    def _normalize(self, word):
+        return light_stem(word) if self.stem else word
+
+    def tokenize(self, text, drop_stopwords=False):
+        """Returns the list of normalised words in text."""
+        words = text.lower().translate(self._table).split()
+        if self.stem:
+            words = [light_stem(w) for w in words]
+        if drop_stopwords:
+            words = [w for w in words if w not in self.stopwords]
+        return words
+
+    def normalize_keyword(self, keyword):
+        """Puts an FAQ keyword into the same form as tokenized words."""
+        return self._normalize(keyword.lower())
+
+    def is_greeting(self, words):
+        return not self.greetings.isdisjoint(words)
+
+
+DEFAULT_TOKENIZER = Tokenizer()
@@ -0,0 +1,177 @@
+"""
+Translation HTTP API
+Serves the TranslationService over HTTP so other services (and the
+Streamlit app, see api_client.py) can translate without running the UI:
+
+    uvicorn api:app --host 0.0.0.0 --port 8600
+
+    POST /translate   {"text", "source", "target", "provider"} -> {"translation"}
+    POST /detect      {"text"} -> {"language", "name"}
+    POST /tts         {"text", "lang"} -> audio/mpeg, streamed per sentence group
+    POST /memory/search  {"text", "source", "target", "provider"} -> {"suggestions"}
+    GET  /providers   installed translation engines
+    GET  /stats       cache and provider statistics
+
+Blocking provider calls run on a bounded thread pool. Identical
+requests that arrive while one is still running are coalesced: they
+wait for the same call instead of starting their own.
+
+The TranslationService (and with it the SQLite files and audio cache)
+is created when the app starts, not on import; set api.service before
+startup to use another one.
+"""
+
+import asyncio
+import contextlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from starlette.applications import Starlette
+from starlette.responses import FileResponse, JSONResponse, StreamingResponse
+from starlette.routing import Route
+
+from languages import AUTO, LANGUAGES
+from providers import DEFAULT_PROVIDER, available_providers
+from speech import supports
+from translation_service import TranslationService
+
+MAX_TEXT_CHARS = 5000
+MAX_WORKERS = int(os.environ.get("TRANSLATOR_API_WORKERS", "16"))
+
+
+class Coalescer:
+    """Runs one blocking call per key at a time; concurrent callers share its result"""
+
+    def __init__(self, executor):
+        self.executor = executor
+        self._in_flight = {}
+
+    async def run(self, key, func, *args):
+        future = self._in_flight.get(key)
+        if future is None:
+            future = asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+            self._in_flight[key] = future
+            future.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        # shield: one caller disconnecting must not cancel the shared call
+        return await asyncio.shield(future)
+
+
+service = None  # created on startup unless set before, e.g. by tests
+executor = ThreadPoolExecutor(max_workers=MAX_WORKERS)
+coalescer = Coalescer(executor)
+
+
+def error(message, status_code=400):
+    return JSONResponse({"error": message}, status_code=status_code)
+
+
+async def read_text(request):
+    """(body, None) or (None, error response) for a JSON body with a 'text' field"""
+    try:
+        body = await request.json()
+    except ValueError:
+        return None, error("Request body must be JSON")
+    text = body.get("text") if isinstance(body, dict) else None
+    if not isinstance(text, str) or not text.strip():
+        return None, error("'text' must be a non-empty string")
+    if len(text) > MAX_TEXT_CHARS:
+        return None, error(f"'text' is longer than {MAX_TEXT_CHARS} characters", 413)
+    return body, None
+
+
+def read_options(body):
+    """((source, target, provider), None) or (None, error response)"""
+    options = (
+        body.get("source", AUTO), body.get("target", "en"), body.get("provider", DEFAULT_PROVIDER)
+    )
+    if not all(isinstance(option, str) for option in options):
+        return None, error("'source', 'target' and 'provider' must be strings")
+    source, target, provider = options
+    if source not in LANGUAGES or target not in LANGUAGES or target == AUTO:
+        return None, error("Unknown source or target language")
+    if provider not in available_providers():
+        return None, error(f"Unknown or unavailable provider: {provider}")
+    return options, None
+
+
+async def translate(request):
+    body, failure = await read_text(request)
+    if failure:
+        return failure
+    options, failure = read_options(body)
+    if failure:
+        return failure
+    source, target, provider = options
+
+    translation, message = await coalescer.run(
+        ("translate", body["text"], source, target, provider),
+        service.translate, body["text"], source, target, provider
+    )
+    if message:
+        return error(message, 502)
+    return JSONResponse({"translation": translation})
+
+
+async def detect(request):
+    body, failure = await read_text(request)
+    if failure:
+        return failure
+    language = service.detect(body["text"])
+    return JSONResponse({"language": language, "name": LANGUAGES.get(language)})
+
+
+async def tts(request):
+    body, failure = await read_text(request)
+    if failure:
+        return failure
+    text, lang = body["text"], body.get("lang", "en")
+    # Checked before the stream starts: errors after the 200 cannot be reported
+    if not isinstance(lang, str) or not supports(lang):
+        return error("Unsupported speech language")
+
+    # Cached clips are sent as files; new ones stream while being synthesized
+    path = service.synthesizer.cached_path(text, lang)
+    if path is not None:
+        return FileResponse(path, media_type="audio/mpeg")
+    return StreamingResponse(service.speech_stream(text, lang), media_type="audio/mpeg")
+
+
+async def memory_search(request):
+    body, failure = await read_text(request)
+    if failure:
+        return failure
+    options, failure = read_options(body)
+    if failure:
+        return failure
+    source, target, provider = options
+
+    suggestions = await asyncio.get_running_loop().run_in_executor(
+        executor, service.suggestions, body["text"], source, target, provider
+    )
+    return JSONResponse({"suggestions": suggestions})
+
+
+async def providers(request):
+    return JSONResponse([{"name": name, "label": label} for name, label in service.providers()])
+
+
+async def stats(request):
+    return JSONResponse(service.stats())
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app):
+    global service
+    if service is None:
+        service = TranslationService()
+    yield
+
+
+app = Starlette(lifespan=lifespan, routes=[
+    Route("/translate", translate, methods=["POST"]),
+    Route("/detect", detect, methods=["POST"]),
+    Route("/tts", tts, methods=["POST"]),
+    Route("/memory/search", memory_search, methods=["POST"]),
+    Route("/providers", providers),
+    Route("/stats", stats),
+])
@@ -0,0 +1,72 @@
+"""
+Client for the translation HTTP API
+Same interface as TranslationService, so the Streamlit app can use
+either one. Requests go through one pooled keep-alive session.
+"""
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from providers import DEFAULT_PROVIDER
+
+
+class TranslationClient:
+    def __init__(self, base_url, timeout=60, pool_size=10):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def _post(self, path, payload):
+        return self.session.post(self.base_url + path, json=payload, timeout=self.timeout)
+
+    def _get(self, path):
+        response = self.session.get(self.base_url + path, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def providers(self):
+        return [(item["name"], item["label"]) for item in self._get("/providers")]
+
+    def detect(self, text):
+        response = self._post("/detect", {"text": text})
+        response.raise_for_status()
+        return response.json()["language"]
+
+    def translate(self, text, src_lang, dest_lang, provider_name=DEFAULT_PROVIDER):
+        """(translation, None) or (None, error message)"""
+        try:
+            response = self._post("/translate", {
+                "text": text, "source": src_lang, "target": dest_lang, "provider": provider_name
+            })
+            if response.status_code != 200:
+                return None, response.json().get("error", f"HTTP {response.status_code}")
+            return response.json()["translation"], None
+        except (requests.RequestException, ValueError) as e:
+            return None, f"Translation service unavailable: {str(e)}"
+
+    def suggestions(self, text, src_lang, dest_lang, provider_name=DEFAULT_PROVIDER):
+        """Earlier translations of similar segments; [] if the service is unavailable"""
+        try:
+            response = self._post("/memory/search", {
+                "text": text, "source": src_lang, "target": dest_lang, "provider": provider_name
+            })
+            response.raise_for_status()
+            return response.json()["suggestions"]
+        except (requests.RequestException, ValueError):
+            return []
+
+    def speech(self, text, lang_code):
+        """(MP3 bytes, None) or (None, error message)"""
+        try:
+            response = self._post("/tts", {"text": text, "lang": lang_code})
+            if response.status_code != 200:
+                return None, response.json().get("error", f"HTTP {response.status_code}")
+            return response.content, None
+        except (requests.RequestException, ValueError) as e:
+            return None, f"Translation service unavailable: {str(e)}"
+
+    def stats(self):
+        return self._get("/stats")
@@ -5,14 +5,22 @@ Author: Pranali Pawar
 """
 
 import streamlit as st
-from translatepy import Translator
-from translatepy.exceptions import TranslatepyException, UnknownLanguage
-from gtts import gTTS
 import os
-import io
-import base64
-from datetime import datetime
-import time
+import re
+import uuid
+
+import requests
+
+from api_client import TranslationClient
+from history_store import HistoryStore
+from languages import (
+    LANGUAGES, SOURCE_INDEX, SOURCE_NAMES, TARGET_INDEX, TARGET_NAMES, language_code
+)
+from providers import DEFAULT_PROVIDER
+from translation_service import TranslationService
+
+HISTORY_PAGE_SIZE = 5
+HISTORY_PARAM = "history"  # URL query parameter holding the history id
 
 st.set_page_config(
     page_title="AI Language Translation Tool",
@@ -98,106 +106,42 @@ st.markdown("""
     </style>
 """, unsafe_allow_html=True)
 
-# Initialize Translator
+# Translation backend: the HTTP API when TRANSLATOR_API_URL is set, else in-process
 @st.cache_resource
-def get_translator():
-    """Initialize and cache the translator object"""
-    try:
-        return Translator()
-    except Exception as e:
-        st.error(f"Failed to initialize translator: {str(e)}")
-        return None
+def get_service():
+    """TranslationService (or a client of its HTTP API) shared by every session"""
+    api_url = os.environ.get("TRANSLATOR_API_URL")
+    if api_url:
+        return TranslationClient(api_url)
+    return TranslationService()
 
-def get_languages():
-    """Get all supported languages"""
-    languages = {
-        'auto': 'Auto Detect',
-        'af': 'Afrikaans', 'sq': 'Albanian', 'am': 'Amharic', 'ar': 'Arabic',
-        'hy': 'Armenian', 'az': 'Azerbaijani', 'eu': 'Basque', 'be': 'Belarusian',
-        'bn': 'Bengali', 'bs': 'Bosnian', 'bg': 'Bulgarian', 'ca': 'Catalan',
-        'ceb': 'Cebuano', 'ny': 'Chichewa', 'zh': 'Chinese',
-        'zh-CN': 'Chinese (Simplified)', 'zh-TW': 'Chinese (Traditional)',
-        'co': 'Corsican', 'hr': 'Croatian', 'cs': 'Czech', 'da': 'Danish',
-        'nl': 'Dutch', 'en': 'English', 'eo': 'Esperanto', 'et': 'Estonian',
-        'tl': 'Filipino', 'fi': 'Finnish', 'fr': 'French', 'fy': 'Frisian',
-        'gl': 'Galician', 'ka': 'Georgian', 'de': 'German', 'el': 'Greek',
-        'gu': 'Gujarati', 'ht': 'Haitian Creole', 'ha': 'Hausa', 'haw': 'Hawaiian',
-        'he': 'Hebrew', 'hi': 'Hindi', 'hmn': 'Hmong', 'hu': 'Hungarian',
-        'is': 'Icelandic', 'ig': 'Igbo', 'id': 'Indonesian', 'ga': 'Irish',
-        'it': 'Italian', 'ja': 'Japanese', 'jw': 'Javanese', 'kn': 'Kannada',
-        'kk': 'Kazakh', 'km': 'Khmer', 'ko': 'Korean', 'ku': 'Kurdish',
-        'ky': 'Kyrgyz', 'lo': 'Lao', 'la': 'Latin', 'lv': 'Latvian',
-        'lt': 'Lithuanian', 'lb': 'Luxembourgish', 'mk': 'Macedonian',
-        'mg': 'Malagasy', 'ms': 'Malay', 'ml': 'Malayalam', 'mt': 'Maltese',
-        'mi': 'Maori', 'mr': 'Marathi', 'mn': 'Mongolian', 'my': 'Myanmar',
-        'ne': 'Nepali', 'no': 'Norwegian', 'ps': 'Pashto', 'fa': 'Persian',
-        'pl': 'Polish', 'pt': 'Portuguese', 'pa': 'Punjabi', 'ro': 'Romanian',
-        'ru': 'Russian', 'sm': 'Samoan', 'gd': 'Scots Gaelic', 'sr': 'Serbian',
-        'st': 'Sesotho', 'sn': 'Shona', 'sd': 'Sindhi', 'si': 'Sinhala',
-        'sk': 'Slovak', 'sl': 'Slovenian', 'so': 'Somali', 'es': 'Spanish',
-        'su': 'Sundanese', 'sw': 'Swahili', 'sv': 'Swedish', 'tg': 'Tajik',
-        'ta': 'Tamil', 'te': 'Telugu', 'th': 'Thai', 'tr': 'Turkish',
-        'uk': 'Ukrainian', 'ur': 'Urdu', 'uz': 'Uzbek', 'vi': 'Vietnamese',
-        'cy': 'Welsh', 'xh': 'Xhosa', 'yi': 'Yiddish', 'yo': 'Yoruba',
-        'zu': 'Zulu'
-    }
-    return languages
+@st.cache_resource
+def get_history_store():
+    """Bounded translation history shared by every session of this app"""
+    return HistoryStore()
 
-def get_language_code(lang_name):
-    """Get language code from language name"""
-    languages = get_languages()
-    for code, name in languages.items():
-        if name == lang_name:
-            return code
-    return 'en'  # Default to English
-
-def translate_text(text, src_lang, dest_lang):
-    """Translate text using translatepy"""
-    try:
-        translator = get_translator()
-        if translator is None:
-            return None, "Translator initialization failed"
-        
-        # Handle auto detection
-        if src_lang == 'auto':
-            # translatepy can auto-detect
-            result = translator.translate(text, destination_language=dest_lang)
-        else:
-            result = translator.translate(text, source_language=src_lang, destination_language=dest_lang)
-        
-        return result.result, None
-    except UnknownLanguage as e:
-        return None, f"Unknown language: {str(e)}"
-    except TranslatepyException as e:
-        return None, f"Translation error: {str(e)}"
-    except Exception as e:
-        return None, f"Unexpected error: {str(e)}"
+def translate_text(text, src_lang, dest_lang, provider_name=DEFAULT_PROVIDER):
+    """Translate text with the chosen provider, in cached chunks translated in parallel"""
+    return get_service().translate(text, src_lang, dest_lang, provider_name)
 
 def text_to_speech(text, lang_code):
-    """Convert text to speech using gTTS"""
-    try:
-        # Handle Chinese language codes for gTTS
-        if lang_code == 'zh-CN':
-            lang_code = 'zh'
-        elif lang_code == 'zh-TW':
-            lang_code = 'zh-tw'
-        
-        tts = gTTS(text=text, lang=lang_code, slow=False)
-        audio_bytes = io.BytesIO()
-        tts.write_to_fp(audio_bytes)
-        audio_bytes.seek(0)
-        
-        # Create audio player with base64 encoding
-        audio_base64 = base64.b64encode(audio_bytes.read()).decode()
-        audio_html = f"""
-            <audio controls autoplay style="width: 100%;">
-                <source src="data:audio/mp3;base64,{audio_base64}" type="audio/mp3">
-                Your browser does not support the audio element.
-            </audio>
-        """
-        return audio_html, None
-    except Exception as e:
-        return None, str(e)
+    """MP3 clip of the text (cached file path or bytes), synthesized with gTTS if needed"""
+    return get_service().speech(text, lang_code)
+
+def history_id():
+    """
+    Id of this browser's translation history. It lives in the page URL
+    (?history=...), so reloading or bookmarking the page keeps the history
+    """
+    value = st.query_params.get(HISTORY_PARAM, "")
+    if not re.fullmatch(r"[0-9a-f]{32}", value):
+        value = uuid.uuid4().hex
+        st.query_params[HISTORY_PARAM] = value
+    return value
+
+def shorten(text, limit=100):
+    """First limit characters of text, for history listings"""
+    return text[:limit] + "..." if len(text) > limit else text
 
 def copy_to_clipboard(text):
     """Copy text to clipboard using JavaScript"""
@@ -231,8 +175,9 @@ def main():
     # Initialize session state
     if 'translated_text' not in st.session_state:
         st.session_state.translated_text = ""
-    if 'translation_history' not in st.session_state:
-        st.session_state.translation_history = []
+    if 'history_id' not in st.session_state:
+        # History lives in the shared store; the session only keeps its id
+        st.session_state.history_id = history_id()
     if 'source_lang' not in st.session_state:
         st.session_state.source_lang = 'auto'
     if 'target_lang' not in st.session_state:
@@ -240,9 +185,27 @@ def main():
     if 'source_text' not in st.session_state:
         st.session_state.source_text = ""
     
-    # Get supported languages
-    languages = get_languages()
-    language_names = list(languages.values())
+    # Translation engine selection
+    service = get_service()
+    try:
+        providers = dict(service.providers())
+    except requests.RequestException as e:
+        # Only when TRANSLATOR_API_URL points at an API that is down
+        st.error(f"Translation service unavailable: {str(e)}")
+        return
+    names = list(providers)
+    default_provider = os.environ.get("TRANSLATION_PROVIDER", DEFAULT_PROVIDER)
+    with st.sidebar:
+        st.markdown("### 🧠 Translation Engine")
+        provider_name = st.selectbox(
+            "Engine:",
+            options=names,
+            index=names.index(default_provider) if default_provider in names else 0,
+            format_func=providers.get,
+            key="provider_select",
+            label_visibility="collapsed"
+        )
+        st.markdown("---")
     
     # Main translation container
     with st.container():
@@ -270,11 +233,11 @@ def main():
             st.markdown("<div class='language-selector'>", unsafe_allow_html=True)
             source_lang_name = st.selectbox(
                 "Source Language:",
-                options=language_names,
-                index=language_names.index(languages[st.session_state.source_lang]),
+                options=SOURCE_NAMES,
+                index=SOURCE_INDEX[st.session_state.source_lang],
                 key="source_lang_select"
             )
-            st.session_state.source_lang = get_language_code(source_lang_name)
+            st.session_state.source_lang = language_code(source_lang_name)
             st.markdown("</div>", unsafe_allow_html=True)
         
         with col2:
@@ -328,13 +291,11 @@ def main():
             st.markdown("<div class='language-selector'>", unsafe_allow_html=True)
             target_lang_name = st.selectbox(
                 "Target Language:",
-                options=[name for name in language_names if name != 'Auto Detect'],
-                index=[name for name in language_names if name != 'Auto Detect'].index(
-                    languages[st.session_state.target_lang]
-                ),
+                options=TARGET_NAMES,
+                index=TARGET_INDEX.get(st.session_state.target_lang, TARGET_INDEX['en']),
                 key="target_lang_select"
             )
-            st.session_state.target_lang = get_language_code(target_lang_name)
+            st.session_state.target_lang = language_code(target_lang_name)
             st.markdown("</div>", unsafe_allow_html=True)
     
     # Handle translation
@@ -350,11 +311,11 @@ def main():
         
         # Show progress
         with st.spinner('Translating...'):
-            time.sleep(0.3)  # Simulate processing time
             translated_text, error = translate_text(
                 source_text, 
                 st.session_state.source_lang, 
-                st.session_state.target_lang
+                st.session_state.target_lang,
+                provider_name
             )
             
             if error:
@@ -363,14 +324,27 @@ def main():
                 st.session_state.translated_text = translated_text
                 st.markdown("<div class='success-message'>✅ Translation successful!</div>", unsafe_allow_html=True)
                 
+                # Near matches from the translation memory, for consistent wording
+                suggestions = service.suggestions(
+                    source_text, st.session_state.source_lang, st.session_state.target_lang,
+                    provider_name
+                )
+                if suggestions:
+                    with st.expander(f"♻️ Similar earlier translations ({len(suggestions)})"):
+                        for match in suggestions:
+                            st.markdown(
+                                f"**{match['similarity']:.0%}** · {shorten(match['source'])}  \n"
+                                f"→ {shorten(match['translation'])}"
+                            )
+                
                 # Add to history
-                st.session_state.translation_history.append({
-                    'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                    'source': source_text[:100] + "..." if len(source_text) > 100 else source_text,
-                    'translation': translated_text[:100] + "..." if len(translated_text) > 100 else translated_text,
-                    'source_lang': languages[st.session_state.source_lang],
-                    'target_lang': languages[st.session_state.target_lang]
-                })
+                get_history_store().add(
+                    st.session_state.history_id,
+                    source_text,
+                    translated_text,
+                    LANGUAGES[st.session_state.source_lang],
+                    LANGUAGES[st.session_state.target_lang]
+                )
     
     # Additional features (only show if translation exists)
     if st.session_state.translated_text:
@@ -397,7 +371,7 @@ def main():
                         use_container_width=True,
                         help="Listen to the translated text"):
                 with st.spinner('Generating audio...'):
-                    audio_html, error = text_to_speech(
+                    audio, error = text_to_speech(
                         st.session_state.translated_text, 
                         st.session_state.target_lang
                     )
@@ -406,7 +380,11 @@ def main():
                         st.error(f"Audio generation failed: {error}")
                     else:
                         st.markdown("### 🔊 Audio Player")
-                        st.components.v1.html(audio_html, height=80)
+                        # Served by URL from Streamlit's media endpoint, not inlined.
+                        # st.audio only plays complete clips, so unlike /tts in api.py
+                        # this waits for every segment (synthesized in parallel; a
+                        # cached single-segment clip is played from its file at once)
+                        st.audio(audio, format="audio/mp3", autoplay=True)
         
         with col3:
             # Clear button
@@ -419,19 +397,27 @@ def main():
                 st.rerun()
         
         # Translation history (collapsible)
-        if st.session_state.translation_history:
-            with st.expander("📜 Translation History (Last 5)"):
-                for i, item in enumerate(reversed(st.session_state.translation_history[-5:]), 1):
-                    st.markdown(f"""
-                    **Entry #{len(st.session_state.translation_history) - i + 1}** ({item['timestamp']})
-                    - **From ({item['source_lang']}):** {item['source']}
-                    - **To ({item['target_lang']}):** {item['translation']}
-                    ---
-                    """)
-                
-                if st.button("Clear History", key="clear_history"):
-                    st.session_state.translation_history = []
-                    st.rerun()
+        history = get_history_store()
+        with st.expander("📜 Translation History"):
+            query = st.text_input("Search history:", key="history_query")
+            session_id = st.session_state.history_id
+            
+            total = history.count(session_id, query)
+            pages = max(1, -(-total // HISTORY_PAGE_SIZE))
+            page = st.number_input("Page", min_value=1, max_value=pages, value=1, key="history_page")
+            
+            for item in history.page(page - 1, HISTORY_PAGE_SIZE, session_id, query):
+                st.markdown(f"""
+                **Entry #{item['id']}** ({item['timestamp']})
+                - **From ({item['source_lang']}):** {shorten(item['source'])}
+                - **To ({item['target_lang']}):** {shorten(item['translation'])}
+                ---
+                """)
+            st.caption(f"{total} entries, page {page} of {pages}")
+            
+            if st.button("Clear History", key="clear_history"):
+                history.clear(session_id)
+                st.rerun()
     
     # Footer
     st.markdown("---")
@@ -439,7 +425,7 @@ def main():
         "<div style='text-align: center; color: #7f8c8d; font-size: 0.9rem;'>"
         "Built with ❤️ for Internship Task 1 | "
         "Used Translatepy API & Streamlit | "
-        f"Supported Languages: {len(languages)}"
+        f"Supported Languages: {len(LANGUAGES)}"
         "</div>",
         unsafe_allow_html=True
     )
@@ -461,14 +447,37 @@ def main():
         **Tips:**
         - Use Auto Detect for unknown languages
         - Click ⇄ to quickly swap languages
-        - History saves your last 5 translations
+        - History is kept across restarts and can be searched
         """)
         
+        st.markdown("---")
+        st.markdown("### 💾 Translation Cache")
+        try:
+            service_stats = service.stats()
+        except requests.RequestException as e:
+            service_stats = None
+            st.error(f"Statistics unavailable: {str(e)}")
+        if service_stats:
+            cache_stats = service_stats['cache']
+            st.markdown(f"""
+            - **Cached translations**: {cache_stats['entries']}
+            - **Hit rate**: {cache_stats['hit_rate']:.0%} ({cache_stats['hits']} hits / {cache_stats['misses']} misses)
+            - **Translation memory**: {service_stats['memory']['segments']} segments
+            """)
+            
+            st.markdown("---")
+            st.markdown("### ⏱️ Engine Latency")
+            for stats in service_stats['providers'].values():
+                st.markdown(
+                    f"- **{stats['label']}**: {stats['avg_call_ms']:.0f} ms per call "
+                    f"({stats['texts']} texts in {stats['calls']} calls)"
+                )
+        
         st.markdown("---")
         st.markdown("### ⚙️ Tech Stack")
         st.markdown("""
         - **Frontend**: Streamlit
-        - **Translation**: Translatepy API
+        - **Translation**: Translatepy API or local MarianMT models
         - **Text-to-Speech**: Google TTS (gTTS)
         - **Styling**: Custom CSS
         """)
@@ -0,0 +1,310 @@
+"""
+Batch file translation
+Translates a whole .txt, .csv or .jsonl file without the Streamlit UI,
+using the same chunked, cached translation path as the app:
+
+    python batch_translate.py input.txt output.txt --dest hi
+    python batch_translate.py reviews.csv reviews_fr.csv --dest fr --fields title body
+    python batch_translate.py docs.jsonl docs_de.jsonl --src en --dest de --fields text --suffix _de
+
+- records are streamed from disk in blocks; only one block is in memory
+- identical strings are translated once (per block, and across blocks
+  and runs through the SQLite translation cache)
+- unique strings go through a worker pool behind a shared rate limit,
+  in batches for providers with batched inference (--provider marian)
+- output is written block by block, and a checkpoint file next to the
+  output records how far the job got, so rerunning the same command
+  after a crash resumes instead of starting over
+- strings that fail are written untranslated, the checkpoint stays before
+  the first block with a failure and the exit code is 1; rerunning the
+  same command retries from there (finished strings come from the cache)
+"""
+
+import argparse
+import csv
+import itertools
+import json
+import os
+import sys
+import threading
+import time
+
+from providers import DEFAULT_PROVIDER, PROVIDERS, make_provider
+from translation import translate_many
+from translation_cache import TranslationCache
+
+DEFAULT_WORKERS = 8
+DEFAULT_RATE = 5.0  # texts per second sent to the remote service
+DEFAULT_BLOCK_SIZE = 500
+
+
+class RateLimiter:
+    """Token bucket shared by all worker threads"""
+
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.capacity = burst or max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class RateLimitedProvider:
+    """Provider wrapper that takes a rate-limit token per translated text"""
+
+    def __init__(self, provider, limiter):
+        self.provider = provider
+        self.limiter = limiter
+        self.max_batch = provider.max_batch
+
+    def translate_batch(self, texts, src_lang, dest_lang):
+        for _ in texts:
+            self.limiter.acquire()
+        return self.provider.translate_batch(texts, src_lang, dest_lang)
+
+
+class TxtFormat:
+    """One record per line; blank lines are copied as they are"""
+
+    def __init__(self, fields, suffix):
+        pass
+
+    def reader(self, file):
+        return (line.rstrip('\r\n') for line in file)
+
+    def texts(self, record):
+        return [record]
+
+    def start(self, out, resumed):
+        pass
+
+    def write(self, out, record, translations):
+        out.write(translations.get(record, record) + '\n')
+
+
+class JsonlFormat:
+    """One JSON object per line; the given string fields are translated"""
+
+    def __init__(self, fields, suffix):
+        self.fields = fields
+        self.suffix = suffix
+
+    def reader(self, file):
+        return (json.loads(line) for line in file if line.strip())
+
+    def texts(self, record):
+        return [record[field] for field in self.fields if isinstance(record.get(field), str)]
+
+    def start(self, out, resumed):
+        pass
+
+    def write(self, out, record, translations):
+        for field in self.fields:
+            value = record.get(field)
+            if isinstance(value, str):
+                record[field + self.suffix] = translations.get(value, value)
+        out.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+
+class CsvFormat:
+    """CSV with a header row; the given columns are translated"""
+
+    def __init__(self, fields, suffix):
+        self.fields = fields
+        self.suffix = suffix
+        self.writer = None
+
+    def reader(self, file):
+        reader = csv.DictReader(file)
+        missing = [field for field in self.fields if field not in (reader.fieldnames or [])]
+        if missing:
+            raise ValueError(f"Columns not found in CSV header: {', '.join(missing)}")
+        self.fieldnames = list(reader.fieldnames)
+        if self.suffix:
+            self.fieldnames += [field + self.suffix for field in self.fields]
+        return reader
+
+    def texts(self, record):
+        return [record[field] for field in self.fields]
+
+    def start(self, out, resumed):
+        self.writer = csv.DictWriter(out, fieldnames=self.fieldnames)
+        if not resumed:
+            self.writer.writeheader()
+
+    def write(self, out, record, translations):
+        for field in self.fields:
+            record[field + self.suffix] = translations.get(record[field], record[field])
+        self.writer.writerow(record)
+
+
+FORMATS = {'.txt': TxtFormat, '.jsonl': JsonlFormat, '.csv': CsvFormat}
+
+
+def checkpoint_path(output_path):
+    return output_path + '.checkpoint'
+
+
+def load_checkpoint(path, job):
+    """Saved progress for this exact job, or None to start from scratch"""
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as file:
+        checkpoint = json.load(file)
+    if checkpoint['job'] != job:
+        raise ValueError(f"{path} belongs to a different job; delete it or pass --restart")
+    return checkpoint
+
+
+def save_checkpoint(path, job, records_done, output_bytes):
+    tmp = path + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as file:
+        json.dump({'job': job, 'records_done': records_done, 'output_bytes': output_bytes}, file)
+    os.replace(tmp, path)
+
+
+def translate_block(provider, cache, texts, src_lang, dest_lang, workers, skip=()):
+    """Translate each unique non-blank string once; returns ({text: translation}, failures)"""
+    unique = list(dict.fromkeys(text for text in texts if text.strip() and text not in skip))
+    results = translate_many(provider, cache, unique, src_lang, dest_lang, max_workers=workers)
+
+    translations = {}
+    failures = []
+    for text, (translation, error) in zip(unique, results):
+        if error:
+            failures.append((text, error))
+        else:
+            translations[text] = translation
+    return translations, failures
+
+
+def translate_file(input_path, output_path, src_lang, dest_lang, fields=(), suffix='',
+                   workers=DEFAULT_WORKERS, rate=None, block_size=DEFAULT_BLOCK_SIZE,
+                   restart=False, provider=DEFAULT_PROVIDER, cache=None, log=sys.stderr):
+    """Translate input_path into output_path; returns (records, failed strings)"""
+    extension = os.path.splitext(input_path)[1].lower()
+    if extension not in FORMATS:
+        raise ValueError(f"Unsupported file type: {extension} (use .txt, .csv or .jsonl)")
+    if extension != '.txt' and not fields:
+        raise ValueError("--fields is required for .csv and .jsonl files")
+    fmt = FORMATS[extension](list(fields), suffix)
+
+    job = {
+        'input': os.path.abspath(input_path), 'src': src_lang, 'dest': dest_lang,
+        'fields': list(fields), 'suffix': suffix,
+        'provider': provider if isinstance(provider, str) else provider.name,
+    }
+    checkpoint_file = checkpoint_path(output_path)
+    if restart and os.path.exists(checkpoint_file):
+        os.remove(checkpoint_file)
+    checkpoint = load_checkpoint(checkpoint_file, job)
+    if checkpoint and not os.path.exists(output_path):
+        checkpoint = None
+
+    cache = cache or TranslationCache()
+    if isinstance(provider, str):
+        provider = make_provider(provider)
+    if rate is None:
+        # Local models are not rate limited
+        rate = DEFAULT_RATE if provider.name == 'translatepy' else 0
+    if rate > 0:
+        provider = RateLimitedProvider(provider, RateLimiter(rate))
+
+    records_done = 0
+    if checkpoint:
+        # Drop whatever was written after the last checkpoint
+        records_done = checkpoint['records_done']
+        with open(output_path, 'r+b') as out:
+            out.truncate(checkpoint['output_bytes'])
+        print(f"Resuming after {records_done} records", file=log)
+
+    failed = set()  # strings that already failed this run are not retried
+    started = time.monotonic()
+    with open(input_path, 'r', encoding='utf-8', newline='') as source, \
+         open(output_path, 'a' if checkpoint else 'w', encoding='utf-8', newline='') as out:
+        records = fmt.reader(source)
+        fmt.start(out, resumed=checkpoint is not None)
+        if not checkpoint:
+            # Recorded up front, so even a failed first block can be resumed
+            out.flush()
+            save_checkpoint(checkpoint_file, job, 0, out.buffer.tell())
+        for _ in itertools.islice(records, records_done):
+            pass
+
+        while True:
+            block = list(itertools.islice(records, block_size))
+            if not block:
+                break
+            texts = [text for record in block for text in fmt.texts(record)]
+            translations, failures = translate_block(
+                provider, cache, texts, src_lang, dest_lang, workers, skip=failed
+            )
+            for text, error in failures:
+                failed.add(text)
+                print(f"Failed, kept untranslated: {text[:60]!r}: {error}", file=log)
+
+            for record in block:
+                fmt.write(out, record, translations)
+            out.flush()
+            records_done += len(block)
+            # Blocks after a failure are written but not checkpointed, so a
+            # rerun starts again at the first failed block
+            if not failed:
+                save_checkpoint(checkpoint_file, job, records_done, out.buffer.tell())
+
+            elapsed = time.monotonic() - started
+            print(f"{records_done} records done, {len(failed)} strings failed, {elapsed:.1f}s", file=log)
+
+    if not failed:
+        os.remove(checkpoint_file)
+    return records_done, len(failed)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("input", help=".txt, .csv or .jsonl file")
+    parser.add_argument("output")
+    parser.add_argument("--src", default="auto", help="source language code (default: auto)")
+    parser.add_argument("--dest", required=True, help="target language code")
+    parser.add_argument("--fields", nargs="+", default=[], help="CSV columns / JSON keys to translate")
+    parser.add_argument("--suffix", default="",
+                        help="write translations to <field><suffix> instead of replacing the field")
+    parser.add_argument("--provider", choices=list(PROVIDERS), default=DEFAULT_PROVIDER)
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument("--rate", type=float,
+                        help=f"max texts per second, 0 for no limit (default: {DEFAULT_RATE:g} for translatepy)")
+    parser.add_argument("--block-size", type=int, default=DEFAULT_BLOCK_SIZE,
+                        help="records translated and written per checkpoint")
+    parser.add_argument("--restart", action="store_true", help="ignore an existing checkpoint")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    try:
+        records, failed = translate_file(
+            args.input, args.output, args.src, args.dest, args.fields, args.suffix,
+            workers=args.workers, rate=args.rate, block_size=args.block_size,
+            restart=args.restart, provider=args.provider
+        )
+    except ValueError as e:
+        sys.exit(f"Error: {e}")
+    print(f"Translated {records} records into {args.output} ({failed} strings failed)")
+    if failed:
+        sys.exit("Rerun the same command to retry the failed strings")
+
+
+if __name__ == "__main__":
+    main()
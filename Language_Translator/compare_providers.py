@@ -0,0 +1,112 @@
+"""
+Provider latency comparison
+Times every installed translation provider on the same sample sentences,
+bypassing the translation cache:
+
+    python compare_providers.py
+    python compare_providers.py --providers marian --pairs en-fr en-de --rounds 5
+
+For each provider and language pair it reports:
+- cold: the first call, including model loading / connection setup
+- single p50 / p95: one sentence per call
+- batch: sentences per second when the whole sample goes through
+  translate_many (threads for the remote service, batches for local models)
+"""
+
+import argparse
+import time
+
+from providers import available_providers, make_provider
+from translation import translate_many
+
+SAMPLE_SENTENCES = [
+    "Hello, how are you?",
+    "Good morning, I hope you slept well.",
+    "Where is the nearest train station?",
+    "The meeting has been moved to Thursday afternoon.",
+    "Please send me the report before the end of the week.",
+    "This restaurant serves the best pasta in town.",
+    "Could you speak a little more slowly, please?",
+    "The weather forecast says it will rain tomorrow.",
+    "I would like to book a table for two people.",
+    "Our new product will be available in stores next month.",
+    "Thank you very much for your help yesterday.",
+    "How much does a ticket to the museum cost?",
+    "The children are playing in the garden.",
+    "We need to update the software on all computers.",
+    "She has been learning to play the piano for three years.",
+    "Can you recommend a good book to read on holiday?",
+]
+
+
+class NoCache:
+    """Stand-in for TranslationCache so every call reaches the provider"""
+
+    def get(self, text, src_lang, dest_lang, provider):
+        return None
+
+    def put(self, text, src_lang, dest_lang, provider, translation):
+        pass
+
+
+def percentile(sorted_values, fraction):
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def time_provider(provider, src_lang, dest_lang, rounds):
+    start = time.perf_counter()
+    provider.translate(SAMPLE_SENTENCES[0], src_lang, dest_lang)
+    cold = time.perf_counter() - start
+
+    singles = []
+    for _ in range(rounds):
+        for sentence in SAMPLE_SENTENCES:
+            start = time.perf_counter()
+            provider.translate(sentence, src_lang, dest_lang)
+            singles.append(time.perf_counter() - start)
+    singles.sort()
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        results = translate_many(provider, NoCache(), SAMPLE_SENTENCES, src_lang, dest_lang)
+    batch_seconds = time.perf_counter() - start
+    errors = [error for _, error in results if error]
+    if errors:
+        raise RuntimeError(errors[0])
+
+    return {
+        'cold_ms': cold * 1000,
+        'p50_ms': percentile(singles, 0.50) * 1000,
+        'p95_ms': percentile(singles, 0.95) * 1000,
+        'batch_per_s': rounds * len(SAMPLE_SENTENCES) / batch_seconds,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--providers", nargs="+", default=available_providers())
+    parser.add_argument("--pairs", nargs="+", default=["en-fr"], help="src-dest language pairs")
+    parser.add_argument("--rounds", type=int, default=3, help="passes over the sample sentences")
+    args = parser.parse_args()
+
+    print(f"{'provider':>12} | {'pair':>6} | {'cold ms':>9} | {'p50 ms':>8} | {'p95 ms':>8} | {'batch/s':>8}")
+    print("-" * 66)
+    for name in args.providers:
+        provider = make_provider(name)
+        for pair in args.pairs:
+            src_lang, dest_lang = pair.split("-", 1)
+            try:
+                result = time_provider(provider, src_lang, dest_lang, args.rounds)
+            except Exception as e:
+                print(f"{name:>12} | {pair:>6} | failed: {e}")
+                continue
+            print(
+                f"{name:>12} | {pair:>6} | {result['cold_ms']:>9.1f} | {result['p50_ms']:>8.1f} | "
+                f"{result['p95_ms']:>8.1f} | {result['batch_per_s']:>8.1f}",
+                flush=True
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Translation history store
+Keeps finished translations in a local SQLite file instead of an
+ever-growing list in each Streamlit session. The table is a ring buffer:
+once it holds max_entries rows, every insert drops the oldest one. A
+session only keeps its id in memory and reads one page at a time, so
+history costs constant memory, survives restarts and can be searched.
+"""
+
+import os
+from datetime import datetime
+
+from sqlite_store import open_shared
+
+DEFAULT_HISTORY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "translation_history.db")
+
+COLUMNS = ('id', 'session_id', 'timestamp', 'source', 'translation', 'source_lang', 'target_lang')
+
+
+def _like_pattern(query):
+    escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+class HistoryStore:
+    """SQLite-backed, bounded translation history shared by all sessions"""
+
+    def __init__(self, path=DEFAULT_HISTORY_PATH, max_entries=5000):
+        self.path = path
+        self.max_entries = max_entries
+        self._conn, self._lock = open_shared(
+            path,
+            """
+                CREATE TABLE IF NOT EXISTS history (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    session_id TEXT NOT NULL,
+                    timestamp TEXT NOT NULL,
+                    source TEXT NOT NULL,
+                    translation TEXT NOT NULL,
+                    source_lang TEXT NOT NULL,
+                    target_lang TEXT NOT NULL
+                )
+            """,
+            "CREATE INDEX IF NOT EXISTS idx_history_session ON history (session_id, id)"
+        )
+
+    def add(self, session_id, source, translation, source_lang, target_lang):
+        """Append an entry, dropping the oldest beyond max_entries; returns its id"""
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO history (session_id, timestamp, source, translation, source_lang, target_lang) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (session_id, timestamp, source, translation, source_lang, target_lang)
+            )
+            entry_id = cursor.lastrowid
+            # Ids only grow, so the ring buffer is everything newer than id - max_entries
+            self._conn.execute("DELETE FROM history WHERE id <= ?", (entry_id - self.max_entries,))
+            self._conn.commit()
+        return entry_id
+
+    def _where(self, session_id, query):
+        clauses, params = [], []
+        if session_id is not None:
+            clauses.append("session_id = ?")
+            params.append(session_id)
+        if query:
+            clauses.append("(source LIKE ? ESCAPE '\\' OR translation LIKE ? ESCAPE '\\')")
+            params += [_like_pattern(query)] * 2
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def page(self, page=0, page_size=5, session_id=None, query=""):
+        """Entries newest first, as dicts; session_id=None means every session"""
+        where, params = self._where(session_id, query)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(COLUMNS)} FROM history{where} ORDER BY id DESC LIMIT ? OFFSET ?",
+                params + [page_size, page * page_size]
+            ).fetchall()
+        return [dict(zip(COLUMNS, row)) for row in rows]
+
+    def count(self, session_id=None, query=""):
+        where, params = self._where(session_id, query)
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM history{where}", params).fetchone()[0]
+
+    def clear(self, session_id=None):
+        """Delete one session's entries, or everything"""
+        where, params = self._where(session_id, "")
+        with self._lock:
+            self._conn.execute(f"DELETE FROM history{where}", params)
+            self._conn.commit()
@@ -0,0 +1,477 @@
+"""
+Local language detection
+Identifies the source language of a text without a network call, so
+'auto' translations can skip the remote service's detection round trip.
+
+1. The dominant Unicode script decides outright when only one supported
+   language uses it (Hangul -> Korean, Thai, Greek, ...).
+2. Otherwise a naive Bayes model over character 1-3-grams, trained on
+   small built-in samples of every supported language sharing that
+   script, scores each candidate by the average log-probability of the
+   text's n-grams.
+
+The profiles are tiny, so the detector is deliberately conservative:
+it only names the languages in SAMPLES, and when the best language does
+not clearly beat the runner-up, or is one of the out-of-model languages,
+detect() returns None and the caller falls back to the remote
+auto-detection. Results are cached per text.
+"""
+
+import math
+import re
+import unicodedata
+from collections import Counter
+from functools import lru_cache
+
+MIN_LETTERS = 8
+MIN_MARGIN = 0.1  # best minus second-best average log-probability per n-gram
+SMOOTHING = 0.5
+MAX_SAMPLE_CHARS = 1000  # longer texts are detected from their start
+
+# Scripts used by a single supported language. Hebrew (also Yiddish) and
+# CJK ideographs (Simplified or Traditional Chinese, or Japanese kanji)
+# are shared, so text in them is left to the remote detection.
+SCRIPT_LANGUAGES = {
+    'HANGUL': 'ko', 'HIRAGANA': 'ja', 'KATAKANA': 'ja', 'THAI': 'th',
+    'GREEK': 'el', 'GEORGIAN': 'ka', 'ARMENIAN': 'hy',
+    'BENGALI': 'bn', 'GUJARATI': 'gu', 'GURMUKHI': 'pa', 'TAMIL': 'ta',
+    'TELUGU': 'te', 'KANNADA': 'kn', 'MALAYALAM': 'ml', 'KHMER': 'km',
+    'LAO': 'lo', 'MYANMAR': 'my', 'SINHALA': 'si', 'ETHIOPIC': 'am',
+}
+
+# Small samples of everyday text per language, grouped by script
+SAMPLES = {
+    'LATIN': {
+        'en': "The weather is very nice today and we want to go for a walk in the park. "
+              "I think that this is the best time of the year, because the days are long "
+              "and warm. Where is the station? Thank you for your help, have a good day. "
+              "What would you like to eat tonight? We should have been there with them.",
+        'fr': "Le temps est très beau aujourd'hui et nous voulons faire une promenade dans "
+              "le parc. Je pense que c'est le meilleur moment de l'année, parce que les "
+              "jours sont longs et chauds. Où est la gare ? Merci pour votre aide, bonne "
+              "journée. Qu'est-ce que vous voulez manger ce soir avec eux ?",
+        'de': "Das Wetter ist heute sehr schön und wir wollen im Park spazieren gehen. Ich "
+              "glaube, dass dies die beste Zeit des Jahres ist, weil die Tage lang und warm "
+              "sind. Wo ist der Bahnhof? Vielen Dank für Ihre Hilfe, einen schönen Tag noch. "
+              "Was möchtest du heute Abend essen? Wir sollten nicht mit ihnen gehen.",
+        'es': "El tiempo es muy bueno hoy y queremos dar un paseo por el parque. Creo que "
+              "esta es la mejor época del año, porque los días son largos y cálidos. ¿Dónde "
+              "está la estación? Gracias por su ayuda, que tenga un buen día. ¿Qué quieres "
+              "comer esta noche? Nosotros estamos con ellos en la casa.",
+        'it': "Il tempo è molto bello oggi e vogliamo fare una passeggiata nel parco. Penso "
+              "che questo sia il periodo migliore dell'anno, perché le giornate sono lunghe "
+              "e calde. Dov'è la stazione? Grazie per il vostro aiuto, buona giornata. Che "
+              "cosa vuoi mangiare stasera? Noi siamo con loro nella casa.",
+        'pt': "O tempo está muito bom hoje e queremos dar um passeio no parque. Eu acho que "
+              "esta é a melhor época do ano, porque os dias são longos e quentes. Onde fica "
+              "a estação? Obrigado pela sua ajuda, tenha um bom dia. O que você quer comer "
+              "hoje à noite? Nós não estamos com eles em casa.",
+        'nl': "Het weer is vandaag heel mooi en we willen een wandeling maken in het park. "
+              "Ik denk dat dit de beste tijd van het jaar is, omdat de dagen lang en warm "
+              "zijn. Waar is het station? Bedankt voor uw hulp, nog een fijne dag. Wat wil "
+              "je vanavond eten? Wij zijn niet met hen naar huis gegaan.",
+        'sv': "Vädret är mycket fint i dag och vi vill gå en promenad i parken. Jag tror att "
+              "det här är den bästa tiden på året, eftersom dagarna är långa och varma. Var "
+              "ligger stationen? Tack för din hjälp, ha en bra dag. Vad vill du äta i kväll? "
+              "Vi har inte varit hemma med dem och barnen.",
+        'da': "Vejret er meget flot i dag, og vi vil gerne gå en tur i parken. Jeg tror, at "
+              "det er den bedste tid på året, fordi dagene er lange og varme. Hvor ligger "
+              "stationen? Tak for din hjælp, hav en god dag. Hvad vil du spise i aften? Vi "
+              "har ikke været hjemme hos dem og børnene.",
+        'no': "Været er veldig fint i dag, og vi vil gå en tur i parken. Jeg tror at dette "
+              "er den beste tiden på året, fordi dagene er lange og varme. Hvor ligger "
+              "stasjonen? Takk for hjelpen, ha en fin dag. Hva vil du spise i kveld? Vi "
+              "har ikke vært hjemme hos dem og barna.",
+        'fi': "Sää on tänään todella kaunis ja haluamme mennä kävelylle puistoon. Luulen, "
+              "että tämä on vuoden paras aika, koska päivät ovat pitkiä ja lämpimiä. Missä "
+              "on rautatieasema? Kiitos avustanne, hyvää päivänjatkoa. Mitä haluaisit syödä "
+              "tänä iltana? Emme ole olleet kotona heidän kanssaan.",
+        'pl': "Pogoda jest dzisiaj bardzo ładna i chcemy iść na spacer do parku. Myślę, że "
+              "to jest najlepsza pora roku, ponieważ dni są długie i ciepłe. Gdzie jest "
+              "dworzec? Dziękuję za pomoc, miłego dnia. Co chcesz zjeść dzisiaj wieczorem? "
+              "Nie byliśmy w domu z nimi i z dziećmi.",
+        'cs': "Počasí je dnes velmi pěkné a chceme jít na procházku do parku. Myslím, že "
+              "tohle je nejlepší roční období, protože dny jsou dlouhé a teplé. Kde je "
+              "nádraží? Děkuji za vaši pomoc, hezký den. Co chceš dnes večer jíst? Nebyli "
+              "jsme s nimi doma a s dětmi.",
+        'sk': "Počasie je dnes veľmi pekné a chceme ísť na prechádzku do parku. Myslím, že "
+              "toto je najlepšie ročné obdobie, pretože dni sú dlhé a teplé. Kde je "
+              "stanica? Ďakujem za vašu pomoc, pekný deň. Čo chceš dnes večer jesť? Neboli "
+              "sme s nimi doma a s deťmi.",
+        'hr': "Vrijeme je danas vrlo lijepo i želimo otići u šetnju u park. Mislim da je "
+              "ovo najbolje doba godine, jer su dani dugi i topli. Gdje je kolodvor? Hvala "
+              "vam na pomoći, ugodan dan. Što želiš jesti večeras? Nismo bili kod kuće s "
+              "njima i s djecom.",
+        'ro': "Vremea este foarte frumoasă astăzi și vrem să facem o plimbare în parc. Cred "
+              "că aceasta este cea mai bună perioadă a anului, pentru că zilele sunt lungi "
+              "și calde. Unde este gara? Vă mulțumesc pentru ajutor, o zi bună. Ce vrei să "
+              "mănânci în seara asta? Noi nu am fost acasă cu ei.",
+        'hu': "Az idő ma nagyon szép, és sétálni szeretnénk a parkban. Azt hiszem, ez az év "
+              "legjobb időszaka, mert a napok hosszúak és melegek. Hol van a pályaudvar? "
+              "Köszönöm a segítségét, további szép napot. Mit szeretnél enni ma este? Nem "
+              "voltunk otthon velük és a gyerekekkel.",
+        'tr': "Bugün hava çok güzel ve parkta yürüyüşe çıkmak istiyoruz. Bence bu yılın en "
+              "güzel zamanı, çünkü günler uzun ve sıcak. İstasyon nerede? Yardımınız için "
+              "teşekkür ederim, iyi günler. Bu akşam ne yemek istersin? Onlarla birlikte "
+              "evde değildik ve çocuklar da yoktu.",
+        'id': "Cuaca hari ini sangat bagus dan kami ingin berjalan-jalan di taman. Saya "
+              "pikir ini adalah waktu terbaik dalam setahun, karena harinya panjang dan "
+              "hangat. Di mana stasiunnya? Terima kasih atas bantuan Anda, semoga hari Anda "
+              "menyenangkan. Apa yang ingin kamu makan malam ini? Kami tidak bersama mereka.",
+        'vi': "Hôm nay thời tiết rất đẹp và chúng tôi muốn đi dạo trong công viên. Tôi nghĩ "
+              "đây là thời gian tốt nhất trong năm, vì ngày dài và ấm áp. Nhà ga ở đâu? Cảm "
+              "ơn bạn đã giúp đỡ, chúc một ngày tốt lành. Tối nay bạn muốn ăn gì? Chúng tôi "
+              "không ở nhà với họ.",
+        'ca': "El temps és molt bo avui i volem fer una passejada pel parc. Crec que aquesta "
+              "és la millor època de l'any, perquè els dies són llargs i càlids. On és "
+              "l'estació? Gràcies per la vostra ajuda, bon dia. Què vols menjar aquesta nit? "
+              "Nosaltres no som a casa amb ells.",
+    },
+    'CYRILLIC': {
+        'ru': "Сегодня очень хорошая погода, и мы хотим погулять в парке. Я думаю, что это "
+              "лучшее время года, потому что дни длинные и тёплые. Где находится вокзал? "
+              "Спасибо за вашу помощь, хорошего дня. Что ты хочешь съесть сегодня вечером? "
+              "Мы не были дома с ними и с детьми.",
+        'uk': "Сьогодні дуже гарна погода, і ми хочемо погуляти в парку. Я думаю, що це "
+              "найкраща пора року, тому що дні довгі й теплі. Де знаходиться вокзал? Дякую "
+              "за вашу допомогу, гарного дня. Що ти хочеш з'їсти сьогодні ввечері? Ми не "
+              "були вдома з ними і з дітьми.",
+        'bg': "Времето днес е много хубаво и искаме да се разходим в парка. Мисля, че това "
+              "е най-хубавото време от годината, защото дните са дълги и топли. Къде е "
+              "гарата? Благодаря за помощта, приятен ден. Какво искаш да ядеш довечера? Не "
+              "бяхме вкъщи с тях и с децата.",
+        'sr': "Време је данас веома лепо и желимо да прошетамо у парку. Мислим да је ово "
+              "најбоље доба године, јер су дани дуги и топли. Где је железничка станица? "
+              "Хвала вам на помоћи, пријатан дан. Шта желиш да једеш вечерас? Нисмо били "
+              "код куће са њима и са децом.",
+    },
+    'ARABIC': {
+        'ar': "الطقس جميل جدا اليوم ونريد أن نتمشى في الحديقة. أعتقد أن هذا هو أفضل وقت في "
+              "السنة، لأن الأيام طويلة ودافئة. أين محطة القطار؟ شكرا لك على مساعدتك، أتمنى "
+              "لك يوما سعيدا. ماذا تريد أن تأكل هذا المساء؟ لم نكن في البيت معهم.",
+        'fa': "امروز هوا خیلی خوب است و می‌خواهیم در پارک قدم بزنیم. فکر می‌کنم این بهترین "
+              "زمان سال است، چون روزها بلند و گرم هستند. ایستگاه قطار کجاست؟ از کمک شما "
+              "متشکرم، روز خوبی داشته باشید. امشب چه می‌خواهی بخوری؟ ما با آن‌ها در خانه نبودیم.",
+        'ur': "آج موسم بہت اچھا ہے اور ہم پارک میں سیر کرنا چاہتے ہیں۔ میرا خیال ہے کہ یہ "
+              "سال کا بہترین وقت ہے، کیونکہ دن لمبے اور گرم ہیں۔ ریلوے اسٹیشن کہاں ہے؟ آپ "
+              "کی مدد کا شکریہ، آپ کا دن اچھا گزرے۔ آج رات تم کیا کھانا چاہتے ہو؟ ہم ان کے ساتھ گھر پر نہیں تھے۔",
+    },
+    'DEVANAGARI': {
+        'hi': "आज मौसम बहुत अच्छा है और हम पार्क में टहलना चाहते हैं। मुझे लगता है कि यह साल "
+              "का सबसे अच्छा समय है, क्योंकि दिन लंबे और गर्म होते हैं। रेलवे स्टेशन कहाँ है? "
+              "आपकी मदद के लिए धन्यवाद, आपका दिन शुभ हो। आज रात तुम क्या खाना चाहते हो? हम "
+              "उनके साथ घर पर नहीं थे।",
+        'mr': "आज हवामान खूप छान आहे आणि आम्हाला बागेत फिरायला जायचे आहे. मला वाटते की हा "
+              "वर्षातील सर्वात चांगला काळ आहे, कारण दिवस मोठे आणि उबदार असतात. रेल्वे स्टेशन "
+              "कुठे आहे? तुमच्या मदतीबद्दल धन्यवाद, तुमचा दिवस चांगला जावो. आज रात्री तुला "
+              "काय खायचे आहे? आम्ही त्यांच्याबरोबर घरी नव्हतो.",
+        'ne': "आज मौसम धेरै राम्रो छ र हामी पार्कमा घुम्न चाहन्छौं। मलाई लाग्छ कि यो वर्षको "
+              "सबैभन्दा राम्रो समय हो, किनभने दिनहरू लामो र न्यानो हुन्छन्। रेलवे स्टेशन कहाँ "
+              "छ? तपाईंको सहयोगको लागि धन्यवाद, तपाईंको दिन शुभ रहोस्। आज राति तिमी के खान "
+              "चाहन्छौ? हामी उनीहरूसँग घरमा थिएनौं।",
+    },
+}
+
+# Other supported languages written in the same scripts. They are scored
+# alongside SAMPLES so that their text is not pinned on the closest
+# modeled language, but detect() never returns them: the profiles only
+# exist to recognise text the model cannot name reliably.
+OUT_OF_MODEL_SAMPLES = {
+    'LATIN': {
+        'af': "Die weer is vandag baie mooi en ons wil in die park gaan stap. Ek dink dit is "
+              "die beste tyd van die jaar, want die dae is lank en warm. Waar is die stasie? "
+              "Dankie vir jou hulp, lekker dag. Wat wil jy vanaand eet? Ons was nie by die "
+              "huis saam met hulle en die kinders nie.",
+        'sq': "Moti është shumë i bukur sot dhe duam të shëtisim në park. Mendoj se kjo është "
+              "koha më e mirë e vitit, sepse ditët janë të gjata dhe të ngrohta. Ku është "
+              "stacioni? Faleminderit për ndihmën, ditë të mbarë. Çfarë do të hash sonte? Nuk "
+              "ishim në shtëpi me ta dhe me fëmijët.",
+        'az': "Bu gün hava çox gözəldir və parkda gəzmək istəyirik. Məncə, bu ilin ən yaxşı "
+              "vaxtıdır, çünki günlər uzun və istidir. Stansiya haradadır? Köməyiniz üçün "
+              "təşəkkür edirəm, gününüz xeyir. Bu axşam nə yemək istəyirsən? Biz onlarla və "
+              "uşaqlarla evdə deyildik.",
+        'et': "Ilm on täna väga ilus ja me tahame pargis jalutama minna. Ma arvan, et see on "
+              "aasta parim aeg, sest päevad on pikad ja soojad. Kus on jaam? Aitäh abi eest, "
+              "head päeva. Mida sa täna õhtul süüa tahad? Me ei olnud nendega ja lastega kodus.",
+        'lt': "Šiandien oras labai gražus ir norime pasivaikščioti parke. Manau, kad tai "
+              "geriausias metų laikas, nes dienos ilgos ir šiltos. Kur yra stotis? Ačiū už "
+              "pagalbą, geros dienos. Ką norėtum valgyti šį vakarą? Mes nebuvome namie su "
+              "jais ir su vaikais.",
+        'lv': "Laiks šodien ir ļoti jauks, un mēs gribam pastaigāties parkā. Es domāju, ka "
+              "šis ir labākais gada laiks, jo dienas ir garas un siltas. Kur ir stacija? "
+              "Paldies par palīdzību, jauku dienu. Ko tu gribētu ēst šovakar? Mēs nebijām "
+              "mājās ar viņiem un ar bērniem.",
+        'sl': "Vreme je danes zelo lepo in želimo se sprehoditi po parku. Mislim, da je to "
+              "najboljši čas v letu, ker so dnevi dolgi in topli. Kje je železniška postaja? "
+              "Hvala za pomoč, lep dan. Kaj bi rad jedel nocoj? Nismo bili doma z njimi in z "
+              "otroki.",
+        'gl': "O tempo está moi bo hoxe e queremos dar un paseo polo parque. Coido que esta "
+              "é a mellor época do ano, porque os días son longos e quentes. Onde está a "
+              "estación? Grazas pola túa axuda, bo día. Que queres comer esta noite? Non "
+              "estabamos na casa con eles e cos nenos.",
+        'eu': "Eguraldia oso ona da gaur eta parkean paseatu nahi dugu. Uste dut urteko "
+              "garairik onena dela, egunak luzeak eta beroak direlako. Non dago geltokia? "
+              "Eskerrik asko zure laguntzagatik, egun ona izan. Zer jan nahi duzu gaur "
+              "gauean? Ez ginen etxean egon haiekin eta haurrekin.",
+        'is': "Veðrið er mjög gott í dag og við viljum fara í göngutúr í garðinum. Ég held "
+              "að þetta sé besti tími ársins, því dagarnir eru langir og hlýir. Hvar er "
+              "lestarstöðin? Takk fyrir hjálpina, eigðu góðan dag. Hvað viltu borða í kvöld? "
+              "Við vorum ekki heima með þeim og börnunum.",
+        'cy': "Mae'r tywydd yn braf iawn heddiw ac rydyn ni eisiau mynd am dro yn y parc. "
+              "Rydw i'n meddwl mai dyma amser gorau'r flwyddyn, oherwydd mae'r dyddiau'n hir "
+              "ac yn gynnes. Ble mae'r orsaf? Diolch am eich help, diwrnod da. Beth hoffech "
+              "chi ei fwyta heno? Doedden ni ddim gartref gyda nhw a'r plant.",
+        'ga': "Tá an aimsir go hálainn inniu agus ba mhaith linn siúlóid a dhéanamh sa "
+              "pháirc. Sílim gurb é seo an t-am is fearr den bhliain, mar go bhfuil na "
+              "laethanta fada agus te. Cá bhfuil an stáisiún? Go raibh maith agat as do "
+              "chabhair. Cad ba mhaith leat a ithe anocht? Ní raibh muid sa bhaile leo.",
+        'sw': "Hali ya hewa ni nzuri sana leo na tunataka kutembea katika bustani. Nadhani "
+              "huu ndio wakati bora zaidi wa mwaka, kwa sababu siku ni ndefu na zenye joto. "
+              "Kituo kiko wapi? Asante kwa msaada wako, siku njema. Ungependa kula nini usiku "
+              "huu? Hatukuwa nyumbani pamoja nao na watoto.",
+        'tl': "Napakaganda ng panahon ngayon at gusto naming maglakad sa parke. Sa tingin ko "
+              "ito ang pinakamagandang panahon ng taon, dahil mahaba at mainit ang mga araw. "
+              "Nasaan ang istasyon? Salamat sa tulong mo, magandang araw. Ano ang gusto mong "
+              "kainin mamayang gabi? Wala kami sa bahay kasama nila at ng mga bata.",
+        'bs': "Vrijeme je danas vrlo lijepo i želimo prošetati u parku. Mislim da je ovo "
+              "najbolje doba godine, jer su dani dugi i topli. Gdje je željeznička stanica? "
+              "Hvala vam na pomoći, ugodan dan. Šta želiš jesti večeras? Nismo bili kod kuće "
+              "s njima i s djecom.",
+        'ceb': "Nindot kaayo ang panahon karon ug gusto namong manglakaw sa parke. Sa akong "
+               "hunahuna kini ang labing maayong panahon sa tuig, kay taas ug init ang mga "
+               "adlaw. Asa man ang estasyon? Salamat sa imong tabang, maayong adlaw. Unsa may "
+               "gusto nimong kaonon karong gabii? Wala mi sa balay uban nila ug sa mga bata.",
+        'ny': "Nyengo ndi yabwino kwambiri lero ndipo tikufuna kuyenda m'paki. Ndikuganiza "
+              "kuti ino ndi nthawi yabwino kwambiri pachaka, chifukwa masiku ndi aatali komanso "
+              "otentha. Kodi siteshoni ili kuti? Zikomo chifukwa cha thandizo lanu, tsiku "
+              "labwino. Kodi ukufuna kudya chiyani usikuuno? Sitinali kunyumba ndi ana.",
+        'co': "U tempu hè bellissimu oghje è vulemu fà una spassighjata in u parcu. Pensu "
+              "chì questu hè u megliu periodu di l'annu, perchè i ghjorni sò longhi è caldi. "
+              "Induve hè a stazione? Grazie per u vostru aiutu, bona ghjurnata. Chì voli "
+              "manghjà sta sera? Ùn eramu micca in casa cù elli è cù i zitelli.",
+        'eo': "La vetero estas tre bela hodiaŭ kaj ni volas promeni en la parko. Mi pensas, "
+              "ke ĉi tio estas la plej bona tempo de la jaro, ĉar la tagoj estas longaj kaj "
+              "varmaj. Kie estas la stacidomo? Dankon pro via helpo, bonan tagon. Kion vi "
+              "volas manĝi ĉi-vespere? Ni ne estis hejme kun ili kaj kun la infanoj.",
+        'fy': "It waar is hjoed tige moai en wy wolle in kuier meitsje yn it park. Ik tink "
+              "dat dit de bêste tiid fan it jier is, om't de dagen lang en waarm binne. Wêr "
+              "is it stasjon? Tank foar jo help, noch in moaie dei. Wat wolsto fannacht ite? "
+              "Wy wiene net thús mei harren en de bern.",
+        'ht': "Tan an bèl anpil jodi a epi nou vle al fè yon ti mache nan pak la. Mwen panse "
+              "se pi bon moman nan ane a, paske jou yo long epi yo cho. Ki kote estasyon an "
+              "ye? Mèsi pou èd ou, bon jounen. Kisa ou vle manje aswè a? Nou pa t lakay ak yo "
+              "ak timoun yo.",
+        'ha': "Yanayi yana da kyau sosai yau kuma muna son mu yi yawo a wurin shakatawa. Ina "
+              "ganin wannan shi ne lokaci mafi kyau na shekara, domin kwanaki suna da tsawo "
+              "da zafi. Ina tashar jirgin kasa take? Na gode da taimakonka, a yi rana mai "
+              "kyau. Me kake so ka ci yau da dare? Ba mu kasance a gida tare da su ba.",
+        'haw': "Maikaʻi loa ka lā i kēia lā a makemake mākou e hele wāwae i ka paka. Manaʻo "
+               "wau ʻo kēia ka manawa maikaʻi loa o ka makahiki, no ka mea, lōʻihi a mehana "
+               "nā lā. Aia i hea ke kahua kaʻaahi? Mahalo no kāu kōkua. He aha kāu e "
+               "makemake ai e ʻai i kēia pō? ʻAʻole mākou i ka hale me lākou a me nā keiki.",
+        'hmn': "Huab cua zoo heev hnub no thiab peb xav mus taug kev hauv lub tiaj ua si. Kuv "
+               "xav tias lub sijhawm no yog lub sijhawm zoo tshaj plaws ntawm lub xyoo, vim "
+               "hais tias hnub ntev thiab sov. Lub chaw nres tsheb nyob qhov twg? Ua tsaug "
+               "rau koj txoj kev pab. Hmo no koj xav noj dab tsi? Peb tsis nyob tsev nrog lawv.",
+        'ig': "Ihu igwe dị mma nke ukwuu taa ma anyị chọrọ ịga ije n'ogige. Echere m na nke "
+              "a bụ oge kacha mma n'afọ, n'ihi na ụbọchị dị ogologo ma dị ọkụ. Ebee ka ọdụ "
+              "ụgbọ oloko dị? Daalụ maka enyemaka gị, ụbọchị ọma. Gịnị ka ị chọrọ iri "
+              "n'abalị a? Anyị anọghị n'ụlọ ha na ụmụaka.",
+        'jw': "Hawane apik banget dina iki lan aku pengin mlaku-mlaku ing taman. Aku mikir "
+              "iki wektu sing paling apik ing taun iki, amarga dinane dawa lan anget. "
+              "Stasiune ana ngendi? Matur nuwun kanggo pitulunganmu, sugeng dina. Kowe arep "
+              "mangan apa bengi iki? Awake dhewe ora ana ing omah karo dheweke lan bocah-bocah.",
+        'ku': "Îro hewa pir xweş e û em dixwazin li parkê bigerin. Ez difikirim ku ev "
+              "demsala herî baş a salê ye, ji ber ku roj dirêj û germ in. Îstasyon li ku ye? "
+              "Spas ji bo alîkariya te, rojek xweş. Tu dixwazî îşev çi bixwî? Em bi wan û "
+              "zarokan re li malê nebûn.",
+        'la': "Caelum hodie pulcherrimum est et in horto ambulare volumus. Puto hoc esse "
+              "optimum anni tempus, quia dies longi et calidi sunt. Ubi est statio? Gratias "
+              "tibi pro auxilio, bonum diem. Quid hac nocte edere vis? Domi cum eis et cum "
+              "liberis non eramus.",
+        'lb': "Haut ass d'Wieder ganz schéin a mir wëllen am Park spadséiere goen. Ech mengen, "
+              "datt dëst déi bescht Zäit vum Joer ass, well d'Deeg laang a waarm sinn. Wou ass "
+              "d'Gare? Merci fir Är Hëllef, e schéinen Dag nach. Wat wëlls du haut den Owend "
+              "iessen? Mir waren net mat hinnen an de Kanner doheem.",
+        'mg': "Tsara be ny andro androany ary te-hitsangatsangana any amin'ny zaridaina "
+              "izahay. Heveriko fa ity no fotoana tsara indrindra amin'ny taona, satria lava "
+              "sy mafana ny andro. Aiza ny gara? Misaotra amin'ny fanampianao. Inona no "
+              "tianao hohanina anio alina? Tsy tao an-trano niaraka tamin'izy ireo izahay.",
+        'ms': "Cuaca sangat baik hari ini dan kami mahu berjalan-jalan di taman. Saya rasa "
+              "inilah masa yang terbaik dalam tahun ini, kerana hari-harinya panjang dan "
+              "panas. Di manakah stesen kereta api? Terima kasih atas bantuan anda. Apa yang "
+              "awak mahu makan malam ini? Kami tidak berada di rumah bersama kanak-kanak.",
+        'mt': "It-temp huwa sabiħ ħafna llum u rridu nagħmlu mixja fil-park. Naħseb li dan "
+              "huwa l-aħjar żmien tas-sena, għax il-jiem huma twal u sħan. Fejn hi "
+              "l-istazzjon? Grazzi tal-għajnuna tiegħek, il-jum it-tajjeb. X'tixtieq tiekol "
+              "illejla? Ma konniex id-dar magħhom u mat-tfal.",
+        'mi': "He tino pai te rangi i tēnei rā, ā, e hiahia ana mātou ki te hīkoi i te papa "
+              "rēhia. Ki taku whakaaro koinei te wā pai rawa o te tau, nā te mea he roa, he "
+              "mahana ngā rā. Kei hea te teihana? Kia ora mō tō āwhina. He aha tāu e hiahia "
+              "ana ki te kai i tēnei pō? Kāore mātou i te kāinga me ngā tamariki.",
+        'sm': "E matuā lelei le tau i le aso ma matou te fia savavali i le paka. Ou te manatu "
+              "o le taimi sili lea ona lelei o le tausaga, aua e uumi ma mafanafana aso. O fea "
+              "le nofoaga o nofoaafi? Faafetai mo lau fesoasoani, ia manuia le aso. O le a se "
+              "mea e te fia ai i lenei po? Sa matou le i ai i le fale ma tamaiti.",
+        'gd': "Tha an aimsir glè bhrèagha an-diugh agus tha sinn airson cuairt a ghabhail sa "
+              "phàirc. Tha mi a' smaoineachadh gur e seo an t-àm as fheàrr den bhliadhna, oir "
+              "tha na làithean fada agus blàth. Càite a bheil an stèisean? Tapadh leibh. Dè "
+              "tha thu airson ithe a-nochd? Cha robh sinn aig an taigh còmhla riutha.",
+        'st': "Boemo ba leholimo bo botle haholo kajeno mme re batla ho tsamaya serapeng. Ke "
+              "nahana hore ena ke nako e ntle ka ho fetisisa selemong, hobane matsatsi a "
+              "malelele ebile a futhumetse. Seteishene se kae? Ke a leboha ka thuso ya hao. O "
+              "batla ho ja eng bosiung bona? Re ne re le siyo hae le bona le bana.",
+        'sn': "Mamiriro ekunze akanaka chaizvo nhasi uye tinoda kufamba-famba mupaki. "
+              "Ndinofunga kuti iyi ndiyo nguva yakanakisa yegore, nekuti mazuva akareba uye "
+              "anodziya. Chiteshi chiri kupi? Ndatenda nerubatsiro rwenyu, muve nezuva "
+              "rakanaka. Unoda kudya chii manheru ano? Takanga tisiri kumba navo nevana.",
+        'so': "Cimiladu aad bay u fiican tahay maanta waxaanan rabnaa inaan ku socod tagno "
+              "beerta. Waxaan u malaynayaa inay tani tahay waqtiga ugu fiican sanadka, maxaa "
+              "yeelay maalmuhu way dheer yihiin. Xagee saldhiggu ku yaal? Waad ku mahadsan "
+              "tahay caawimaaddaada. Maxaad doonaysaa inaad cunto caawa? Guriga nagama joogin.",
+        'su': "Cuaca dinten ieu saé pisan sareng urang hoyong jalan-jalan di taman. Abdi "
+              "nyangka ieu téh waktos anu pangsaéna dina sataun, sabab poéna panjang tur "
+              "haneut. Stasiun di mana? Hatur nuhun kana bantosanana, wilujeng siang. Anjeun "
+              "hoyong tuang naon wengi ieu? Kami henteu aya di bumi sareng barudak.",
+        'uz': "Bugun havo juda yaxshi va biz bog'da sayr qilmoqchimiz. Menimcha, bu yilning "
+              "eng yaxshi vaqti, chunki kunlar uzun va issiq. Vokzal qayerda? Yordamingiz "
+              "uchun rahmat, kuningiz xayrli o'tsin. Bugun kechqurun nima yemoqchisan? Biz "
+              "ular va bolalar bilan uyda emas edik.",
+        'xh': "Imozulu mihle kakhulu namhlanje kwaye sifuna ukuhamba epakini. Ndicinga ukuba "
+              "eli lelona xesha lihle lonyaka, kuba iintsuku zinde kwaye zishushu. Isikhululo "
+              "siphi? Enkosi ngoncedo lwakho, ube nemini emnandi. Ufuna ukutya ntoni "
+              "ngokuhlwanje? Besingekho ekhaya nabo nabantwana.",
+        'yo': "Ojú ọjọ́ dára gan-an lónìí, a sì fẹ́ rìn kiri nínú ọgbà ìtura. Mo rò pé èyí ni "
+              "àkókò tó dára jù lọ nínú ọdún, nítorí pé àwọn ọjọ́ gùn, wọ́n sì gbóná. Níbo ni "
+              "ibùdókọ̀ ojú irin wà? Ẹ ṣeun fún ìrànlọ́wọ́ yín. Kí ni o fẹ́ jẹ lálẹ́ yìí? A kò sí "
+              "nílé pẹ̀lú wọn àti àwọn ọmọdé.",
+        'zu': "Isimo sezulu sihle kakhulu namuhla futhi sifuna ukuhamba epaki. Ngicabanga "
+              "ukuthi lesi yisikhathi esihle kakhulu sonyaka, ngoba izinsuku zinde futhi "
+              "zifudumele. Siphi isiteshi? Ngiyabonga ngosizo lwakho, ube nosuku oluhle. "
+              "Ufuna ukudlani kusihlwa? Besingekho ekhaya nabo nezingane.",
+    },
+    'CYRILLIC': {
+        'mk': "Времето денес е многу убаво и сакаме да прошетаме во паркот. Мислам дека ова "
+              "е најдоброто време од годината, бидејќи деновите се долги и топли. Каде е "
+              "станицата? Ви благодарам за помошта, убав ден. Што сакаш да јадеш вечерва? Не "
+              "бевме дома со нив и со децата.",
+        'be': "Сёння вельмі добрае надвор'е, і мы хочам пагуляць у парку. Я думаю, што гэта "
+              "лепшая пара года, таму што дні доўгія і цёплыя. Дзе знаходзіцца вакзал? Дзякуй "
+              "за вашу дапамогу, добрага дня. Што ты хочаш з'есці сёння ўвечары? Мы не былі "
+              "дома з імі і з дзецьмі.",
+        'kk': "Бүгін ауа райы өте жақсы, біз саябақта серуендегіміз келеді. Менің ойымша, "
+              "бұл жылдың ең жақсы уақыты, өйткені күндер ұзақ және жылы. Вокзал қайда? "
+              "Көмегіңізге рақмет, күніңіз сәтті болсын. Бүгін кешке не жегің келеді? Біз "
+              "олармен және балалармен үйде болған жоқпыз.",
+        'mn': "Өнөөдөр цаг агаар их сайхан байна, бид цэцэрлэгт хүрээлэнд зугаалмаар байна. "
+              "Энэ бол жилийн хамгийн сайхан үе гэж би бодож байна, учир нь өдрүүд урт, "
+              "дулаахан байдаг. Галт тэрэгний буудал хаана байна вэ? Тусалсанд баярлалаа. "
+              "Өнөө орой юу идмээр байна? Бид тэдэнтэй болон хүүхдүүдтэй гэртээ байгаагүй.",
+        'ky': "Бүгүн аба ырайы абдан жакшы, биз паркта сейилдегибиз келет. Менимче, бул "
+              "жылдын эң жакшы мезгили, анткени күндөр узун жана жылуу. Вокзал кайда? "
+              "Жардамыңыз үчүн рахмат, күнүңүз жакшы өтсүн. Бүгүн кечинде эмне жегиң келет? "
+              "Биз алар жана балдар менен үйдө болгон жокпуз.",
+        'tg': "Имрӯз ҳаво хеле хуб аст ва мо мехоҳем дар боғ сайр кунем. Ба фикри ман, ин "
+              "беҳтарин фасли сол аст, зеро рӯзҳо дароз ва гарм мебошанд. Вокзал дар куҷост? "
+              "Ташаккур барои ёрии шумо, рӯзи хуш. Имшаб чӣ хӯрдан мехоҳӣ? Мо бо онҳо ва "
+              "кӯдакон дар хона набудем.",
+    },
+    'ARABIC': {
+        'ps': "نن ورځ هوا ډېره ښه ده او موږ غواړو چې په پارک کې وګرځو. زه فکر کوم چې دا د "
+              "کال تر ټولو ښه وخت دی، ځکه چې ورځې اوږدې او ګرمې دي. سټیشن چېرته دی؟ ستاسو "
+              "د مرستې مننه، ښه ورځ. نن شپه څه خوړل غواړې؟ موږ له هغوی سره په کور کې نه وو.",
+        'sd': "اڄ موسم ڏاڍو سٺو آهي ۽ اسين پارڪ ۾ گهمڻ چاهيون ٿا. منهنجي خيال ۾ هي سال جو "
+              "بهترين وقت آهي، ڇاڪاڻ ته ڏينهن ڊگها ۽ گرم آهن. اسٽيشن ڪٿي آهي؟ توهان جي مدد "
+              "جي مهرباني، سٺو ڏينهن. اڄ رات ڇا کائڻ چاهيندين؟ اسين انهن سان گڏ گهر ۾ نه هئاسين.",
+    },
+}
+
+_WORD = re.compile(r"[^\W\d_]+")
+
+
+def ngrams(text):
+    """Character 1-3-grams of the words in text, with word boundaries marked"""
+    grams = []
+    for word in _WORD.findall(text.lower()):
+        padded = f" {word} "
+        for n in (1, 2, 3):
+            grams.extend(padded[i:i + n] for i in range(len(padded) - n + 1))
+    return [gram for gram in grams if gram != " "]
+
+
+class ScriptModel:
+    """Naive Bayes over n-grams for the languages of one script"""
+
+    def __init__(self, samples):
+        counts = {code: Counter(ngrams(sample)) for code, sample in samples.items()}
+        vocabulary = set().union(*counts.values())
+        self.log_probs = {}
+        self.unseen = {}
+        for code, grams in counts.items():
+            denominator = sum(grams.values()) + SMOOTHING * len(vocabulary)
+            self.log_probs[code] = {
+                gram: math.log((count + SMOOTHING) / denominator) for gram, count in grams.items()
+            }
+            self.unseen[code] = math.log(SMOOTHING / denominator)
+
+    def rank(self, grams):
+        """[(code, average log-probability), ...] best first"""
+        scores = []
+        for code, log_probs in self.log_probs.items():
+            unseen = self.unseen[code]
+            total = sum(log_probs.get(gram, unseen) for gram in grams)
+            scores.append((code, total / len(grams)))
+        return sorted(scores, key=lambda item: -item[1])
+
+
+MODELS = {
+    script: ScriptModel({**samples, **OUT_OF_MODEL_SAMPLES.get(script, {})})
+    for script, samples in SAMPLES.items()
+}
+
+
+def _script(char):
+    """First word of the Unicode character name, e.g. 'LATIN' or 'CJK'"""
+    name = unicodedata.name(char, "")
+    return name.split(" ", 1)[0] if name else None
+
+
+def dominant_script(text):
+    counts = Counter(_script(char) for char in text if char.isalpha())
+    if not counts:
+        return None, 0
+    script, count = counts.most_common(1)[0]
+    # Japanese mixes kanji (CJK) with kana
+    if script == 'CJK' and (counts['HIRAGANA'] or counts['KATAKANA']):
+        script = 'HIRAGANA'
+    return script, sum(counts.values())
+
+
+def rank_languages(text):
+    """[(code, score), ...] best first, for languages of the text's script"""
+    script, _ = dominant_script(text)
+    grams = ngrams(text)
+    if script not in MODELS or not grams:
+        return []
+    return MODELS[script].rank(grams)
+
+
+@lru_cache(maxsize=4096)
+def _detect(sample):
+    script, letters = dominant_script(sample)
+    if script is None or letters < MIN_LETTERS:
+        return None
+    if script in SCRIPT_LANGUAGES:
+        return SCRIPT_LANGUAGES[script]
+
+    ranked = rank_languages(sample)
+    if not ranked or ranked[0][0] not in SAMPLES[script]:
+        return None
+    if len(ranked) > 1 and ranked[0][1] - ranked[1][1] < MIN_MARGIN:
+        return None
+    return ranked[0][0]
+
+
+def detect(text):
+    """Language code of text, or None when unsure"""
+    return _detect(text[:MAX_SAMPLE_CHARS])
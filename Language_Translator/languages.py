@@ -0,0 +1,56 @@
+"""
+Language registry
+All supported languages, indexed both ways once at import so lookups in
+the UI are dictionary hits instead of rebuilding and scanning the list.
+"""
+
+AUTO = 'auto'
+
+LANGUAGES = {
+    'auto': 'Auto Detect',
+    'af': 'Afrikaans', 'sq': 'Albanian', 'am': 'Amharic', 'ar': 'Arabic',
+    'hy': 'Armenian', 'az': 'Azerbaijani', 'eu': 'Basque', 'be': 'Belarusian',
+    'bn': 'Bengali', 'bs': 'Bosnian', 'bg': 'Bulgarian', 'ca': 'Catalan',
+    'ceb': 'Cebuano', 'ny': 'Chichewa', 'zh': 'Chinese',
+    'zh-CN': 'Chinese (Simplified)', 'zh-TW': 'Chinese (Traditional)',
+    'co': 'Corsican', 'hr': 'Croatian', 'cs': 'Czech', 'da': 'Danish',
+    'nl': 'Dutch', 'en': 'English', 'eo': 'Esperanto', 'et': 'Estonian',
+    'tl': 'Filipino', 'fi': 'Finnish', 'fr': 'French', 'fy': 'Frisian',
+    'gl': 'Galician', 'ka': 'Georgian', 'de': 'German', 'el': 'Greek',
+    'gu': 'Gujarati', 'ht': 'Haitian Creole', 'ha': 'Hausa', 'haw': 'Hawaiian',
+    'he': 'Hebrew', 'hi': 'Hindi', 'hmn': 'Hmong', 'hu': 'Hungarian',
+    'is': 'Icelandic', 'ig': 'Igbo', 'id': 'Indonesian', 'ga': 'Irish',
+    'it': 'Italian', 'ja': 'Japanese', 'jw': 'Javanese', 'kn': 'Kannada',
+    'kk': 'Kazakh', 'km': 'Khmer', 'ko': 'Korean', 'ku': 'Kurdish',
+    'ky': 'Kyrgyz', 'lo': 'Lao', 'la': 'Latin', 'lv': 'Latvian',
+    'lt': 'Lithuanian', 'lb': 'Luxembourgish', 'mk': 'Macedonian',
+    'mg': 'Malagasy', 'ms': 'Malay', 'ml': 'Malayalam', 'mt': 'Maltese',
+    'mi': 'Maori', 'mr': 'Marathi', 'mn': 'Mongolian', 'my': 'Myanmar',
+    'ne': 'Nepali', 'no': 'Norwegian', 'ps': 'Pashto', 'fa': 'Persian',
+    'pl': 'Polish', 'pt': 'Portuguese', 'pa': 'Punjabi', 'ro': 'Romanian',
+    'ru': 'Russian', 'sm': 'Samoan', 'gd': 'Scots Gaelic', 'sr': 'Serbian',
+    'st': 'Sesotho', 'sn': 'Shona', 'sd': 'Sindhi', 'si': 'Sinhala',
+    'sk': 'Slovak', 'sl': 'Slovenian', 'so': 'Somali', 'es': 'Spanish',
+    'su': 'Sundanese', 'sw': 'Swahili', 'sv': 'Swedish', 'tg': 'Tajik',
+    'ta': 'Tamil', 'te': 'Telugu', 'th': 'Thai', 'tr': 'Turkish',
+    'uk': 'Ukrainian', 'ur': 'Urdu', 'uz': 'Uzbek', 'vi': 'Vietnamese',
+    'cy': 'Welsh', 'xh': 'Xhosa', 'yi': 'Yiddish', 'yo': 'Yoruba',
+    'zu': 'Zulu'
+}
+
+CODES = {name: code for code, name in LANGUAGES.items()}
+
+SOURCE_NAMES = list(LANGUAGES.values())
+TARGET_NAMES = [name for code, name in LANGUAGES.items() if code != AUTO]
+
+# Selectbox positions by code
+SOURCE_INDEX = {code: i for i, code in enumerate(LANGUAGES)}
+TARGET_INDEX = {CODES[name]: i for i, name in enumerate(TARGET_NAMES)}
+
+
+def language_name(code):
+    return LANGUAGES.get(code, code)
+
+
+def language_code(name, default='en'):
+    return CODES.get(name, default)
@@ -0,0 +1,221 @@
+"""
+Translation providers
+Every engine exposes the same small interface, so translate_text can
+target the remote translatepy services or a local CPU model:
+
+    provider.translate_batch(texts, src_lang, dest_lang) -> [translation, ...]
+
+- "translatepy": the remote services (needs network, one text per call)
+- "marian": local Helsinki-NLP opus-mt (MarianMT) models, one per language
+  pair, run on CPU with batched inference. A CTranslate2 int8 conversion
+  of the model is used when present, otherwise the transformers model
+  with int8 dynamic quantization.
+"""
+
+import importlib.util
+import os
+import threading
+import time
+
+DEFAULT_PROVIDER = "translatepy"
+
+# Converted CTranslate2 models are looked up as <dir>/opus-mt-<src>-<dest>
+CT2_MODEL_DIR = os.environ.get(
+    "MARIAN_CT2_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "models")
+)
+
+
+class UnsupportedLanguagePair(ValueError):
+    """The provider cannot translate between these two languages"""
+
+
+class ProviderStats:
+    """Latency of finished translate_batch calls"""
+
+    def __init__(self):
+        self.calls = 0
+        self.texts = 0
+        self.seconds = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, texts, seconds):
+        with self._lock:
+            self.calls += 1
+            self.texts += texts
+            self.seconds += seconds
+
+    def summary(self):
+        with self._lock:
+            return {
+                'calls': self.calls,
+                'texts': self.texts,
+                'avg_call_ms': 1000 * self.seconds / self.calls if self.calls else 0.0,
+            }
+
+
+class Provider:
+    """Base class: subclasses implement _translate_batch"""
+
+    name = None
+    label = None
+    # Texts per translate_batch call; 1 means callers parallelize with threads
+    max_batch = 1
+
+    def __init__(self):
+        self.stats = ProviderStats()
+
+    def warmup(self, pairs=()):
+        """Load whatever is needed for these (src, dest) pairs ahead of time"""
+
+    def translate_batch(self, texts, src_lang, dest_lang):
+        start = time.perf_counter()
+        translations = self._translate_batch(list(texts), src_lang, dest_lang)
+        self.stats.record(len(texts), time.perf_counter() - start)
+        return translations
+
+    def translate(self, text, src_lang, dest_lang):
+        return self.translate_batch([text], src_lang, dest_lang)[0]
+
+    def _translate_batch(self, texts, src_lang, dest_lang):
+        raise NotImplementedError
+
+
+class TranslatepyProvider(Provider):
+    """Remote translation through translatepy (Google, Bing, Yandex, ...)"""
+
+    name = "translatepy"
+    label = "Translatepy (online)"
+
+    def __init__(self, pool_size=32):
+        super().__init__()
+        from requests.adapters import HTTPAdapter
+        from translatepy import Translator
+        from translatepy.utils.request import Request
+
+        # One keep-alive connection pool shared by every thread using this provider
+        request = Request()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        request.session.mount("https://", adapter)
+        request.session.mount("http://", adapter)
+        self.translator = Translator(request=request)
+
+    def _translate_batch(self, texts, src_lang, dest_lang):
+        translations = []
+        for text in texts:
+            if src_lang == 'auto':
+                # translatepy can auto-detect
+                result = self.translator.translate(text, destination_language=dest_lang)
+            else:
+                result = self.translator.translate(
+                    text, source_language=src_lang, destination_language=dest_lang
+                )
+            translations.append(result.result)
+        return translations
+
+
+# opus-mt model names use the plain language code
+MARIAN_CODES = {'zh-CN': 'zh', 'zh-TW': 'zh', 'iw': 'he', 'jw': 'jv'}
+
+
+class MarianProvider(Provider):
+    """Local opus-mt models on CPU, loaded lazily per language pair"""
+
+    name = "marian"
+    label = "MarianMT (offline)"
+    max_batch = 16
+
+    def __init__(self, model_dir=CT2_MODEL_DIR, quantize=True, threads=None):
+        super().__init__()
+        self.model_dir = model_dir
+        self.quantize = quantize
+        self.threads = threads or os.cpu_count() or 1
+        self._models = {}
+        self._lock = threading.Lock()
+
+    def _model_name(self, src_lang, dest_lang):
+        if src_lang == 'auto':
+            raise UnsupportedLanguagePair("Offline models need an explicit source language")
+        src = MARIAN_CODES.get(src_lang, src_lang)
+        dest = MARIAN_CODES.get(dest_lang, dest_lang)
+        return f"opus-mt-{src}-{dest}"
+
+    def _load(self, src_lang, dest_lang):
+        """(engine, tokenizer, model) for a pair, loading it on first use"""
+        name = self._model_name(src_lang, dest_lang)
+        with self._lock:
+            if name not in self._models:
+                self._models[name] = self._load_model(name)
+            return self._models[name]
+
+    def _load_model(self, name):
+        from transformers import MarianTokenizer
+
+        try:
+            tokenizer = MarianTokenizer.from_pretrained(f"Helsinki-NLP/{name}")
+        except OSError as e:
+            raise UnsupportedLanguagePair(f"No offline model for {name}") from e
+
+        ct2_path = os.path.join(self.model_dir, name)
+        if importlib.util.find_spec("ctranslate2") and os.path.isdir(ct2_path):
+            import ctranslate2
+            model = ctranslate2.Translator(
+                ct2_path, device="cpu", compute_type="int8", intra_threads=self.threads
+            )
+            return "ctranslate2", tokenizer, model
+
+        import torch
+        from transformers import MarianMTModel
+
+        torch.set_num_threads(self.threads)
+        model = MarianMTModel.from_pretrained(f"Helsinki-NLP/{name}").eval()
+        if self.quantize:
+            model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        return "transformers", tokenizer, model
+
+    def warmup(self, pairs=()):
+        # The first inference call is much slower than the rest
+        for src_lang, dest_lang in pairs:
+            self.translate_batch(["Hello."], src_lang, dest_lang)
+
+    def _translate_batch(self, texts, src_lang, dest_lang):
+        engine, tokenizer, model = self._load(src_lang, dest_lang)
+
+        if engine == "ctranslate2":
+            sources = [tokenizer.convert_ids_to_tokens(tokenizer.encode(text)) for text in texts]
+            results = model.translate_batch(sources, max_batch_size=self.max_batch)
+            return [
+                tokenizer.decode(tokenizer.convert_tokens_to_ids(result.hypotheses[0]),
+                                 skip_special_tokens=True)
+                for result in results
+            ]
+
+        import torch
+
+        batch = tokenizer(texts, return_tensors="pt", padding=True, truncation=True)
+        with torch.inference_mode():
+            generated = model.generate(**batch)
+        return tokenizer.batch_decode(generated, skip_special_tokens=True)
+
+
+PROVIDERS = {provider.name: provider for provider in (TranslatepyProvider, MarianProvider)}
+
+
+def _installed(*packages):
+    return all(importlib.util.find_spec(package) for package in packages)
+
+
+def available_providers():
+    """Names of the providers whose packages are installed"""
+    names = []
+    if _installed("translatepy"):
+        names.append("translatepy")
+    if _installed("transformers", "sentencepiece") and (_installed("torch") or _installed("ctranslate2")):
+        names.append("marian")
+    return names
+
+
+def make_provider(name=DEFAULT_PROVIDER, **options):
+    if name not in PROVIDERS:
+        raise ValueError(f"Unknown translation provider: {name}")
+    return PROVIDERS[name](**options)
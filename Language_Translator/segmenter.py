@@ -0,0 +1,64 @@
+"""
+Text segmenter
+Splits input into paragraph / sentence chunks that can be translated
+independently and joined back together without changing the layout.
+"""
+
+import re
+
+# Chunks stay well below the ~5000 character limit of the remote services
+DEFAULT_MAX_CHARS = 1000
+
+# A blank line (only spaces/tabs between two newlines) ends a paragraph;
+# single line breaks, e.g. in hard-wrapped prose, stay inside the chunk.
+# The lookbehind only lets a match start at the beginning of a run of
+# spaces, so long runs are scanned once, not once per position.
+PARAGRAPH_BREAK = re.compile(r'((?<![^\S\n])[^\S\n]*\n[^\S\n]*\n\s*)')
+SENTENCE_END = re.compile(r'(?<=[.!?。！？।])(\s+)')
+
+
+def _split_keep_separators(regex, text):
+    """[(piece, separator_after_it), ...] for a regex with one capture group"""
+    parts = regex.split(text)
+    return list(zip(parts[0::2], parts[1::2] + ['']))
+
+
+def split_segments(text, max_chars=DEFAULT_MAX_CHARS):
+    """
+    Split text into (chunk, separator) pairs.
+    Each paragraph is one chunk; paragraphs longer than max_chars
+    are packed sentence by sentence into chunks of at most max_chars
+    (a single longer sentence stays whole). Joining chunk + separator for
+    every pair gives back the original text exactly.
+    """
+    # Whitespace around the text is layout, not part of any chunk
+    body = text.strip()
+    if not body:
+        return [('', text)]
+    leading = text[:len(text) - len(text.lstrip())]
+    trailing = text[len(leading) + len(body):]
+
+    segments = [('', leading)] if leading else []
+    for paragraph, paragraph_sep in _split_keep_separators(PARAGRAPH_BREAK, body):
+        if len(paragraph) <= max_chars:
+            segments.append((paragraph, paragraph_sep))
+            continue
+
+        chunk, chunk_sep = '', ''
+        for sentence, sentence_sep in _split_keep_separators(SENTENCE_END, paragraph):
+            if chunk and len(chunk) + len(chunk_sep) + len(sentence) > max_chars:
+                segments.append((chunk, chunk_sep))
+                chunk = ''
+            elif chunk:
+                chunk += chunk_sep
+            chunk += sentence
+            chunk_sep = sentence_sep
+        segments.append((chunk, chunk_sep + paragraph_sep))
+
+    chunk, separator = segments[-1]
+    segments[-1] = (chunk, separator + trailing)
+    return segments
+
+
+def join_segments(segments):
+    return ''.join(chunk + separator for chunk, separator in segments)
@@ -0,0 +1,190 @@
+"""
+Text-to-speech with an on-disk audio cache
+Clips are stored as MP3 files named by a hash of (lang, text), so a clip
+is generated once and then served by file reference instead of being
+re-synthesized and inlined as base64 on every click.
+
+Long texts are synthesized segment by segment (sentence groups from
+segmenter.py) on a thread pool. Only segments are cached: MP3 frames can
+be concatenated, so a longer clip is assembled from its segments when it
+is read, and stream() yields them in order as soon as each one is ready,
+so playback can start before the whole clip exists.
+"""
+
+import hashlib
+import io
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from gtts import gTTS
+from gtts.lang import tts_langs
+
+from segmenter import split_segments
+
+DEFAULT_AUDIO_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "audio_cache")
+DEFAULT_MAX_BYTES = 200 * 1024 * 1024
+SEGMENT_CHARS = 300
+MAX_WORKERS = 4
+
+# gTTS language codes that differ from the translator's
+GTTS_CODES = {'zh-CN': 'zh', 'zh-TW': 'zh-tw', 'he': 'iw'}
+
+
+def supports(lang):
+    """Whether gTTS can speak lang, given as a translator language code"""
+    langs = tts_langs()
+    return lang in langs or GTTS_CODES.get(lang) in langs
+
+
+def audio_key(text, lang):
+    return hashlib.sha256(f"{lang}\0{text}".encode("utf-8")).hexdigest()
+
+
+class AudioCache:
+    """Directory of MP3 clips, evicting the least recently used past max_bytes"""
+
+    def __init__(self, directory=DEFAULT_AUDIO_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, text, lang):
+        return os.path.join(self.directory, audio_key(text, lang) + ".mp3")
+
+    def get(self, text, lang):
+        """Path of the cached clip, or None"""
+        path = self.path(text, lang)
+        try:
+            # The modification time doubles as the last-used time
+            os.utime(path)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return path
+
+    def put(self, text, lang, audio):
+        """
+        Store the MP3 bytes for (text, lang); returns its path.
+        Written to a temp file first, so readers never see a partial clip.
+        """
+        path = self.path(text, lang)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(audio)
+            os.replace(tmp, path)
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+        self.evict()
+        return path
+
+    def _clips(self):
+        with os.scandir(self.directory) as entries:
+            return [
+                (entry.stat().st_mtime, entry.stat().st_size, entry.path)
+                for entry in entries if entry.name.endswith(".mp3")
+            ]
+
+    def evict(self):
+        with self._lock:
+            clips = sorted(self._clips())
+            total = sum(size for _, size, _ in clips)
+            for _, size, path in clips:
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                total -= size
+
+    def stats(self):
+        clips = self._clips()
+        return {
+            'clips': len(clips),
+            'bytes': sum(size for _, size, _ in clips),
+            'hits': self.hits,
+            'misses': self.misses,
+        }
+
+
+class SpeechSynthesizer:
+    """gTTS synthesis through an AudioCache, parallel per segment"""
+
+    def __init__(self, cache=None, max_workers=MAX_WORKERS, segment_chars=SEGMENT_CHARS):
+        self.cache = cache or AudioCache()
+        self.segment_chars = segment_chars
+        self._pool = ThreadPoolExecutor(max_workers=max_workers)
+        # Segments being synthesized, so concurrent identical requests share one call
+        self._in_flight = {}
+        # Reentrant: a future that is already done runs its callback right away
+        self._lock = threading.RLock()
+
+    def _segment_audio(self, text, lang):
+        """MP3 bytes of one segment, from the cache or freshly synthesized"""
+        path = self.cache.get(text, lang)
+        if path is not None:
+            with open(path, "rb") as file:
+                return file.read()
+        buffer = io.BytesIO()
+        gTTS(text=text, lang=lang, slow=False).write_to_fp(buffer)
+        self.cache.put(text, lang, buffer.getvalue())
+        return buffer.getvalue()
+
+    def _segments(self, text):
+        return [
+            chunk.strip() for chunk, _ in split_segments(text, self.segment_chars) if chunk.strip()
+        ]
+
+    def _synthesize_segments(self, segments, lang):
+        futures = [self._submit(segment, lang) for segment in segments]
+        for future in futures:
+            yield future.result()
+
+    def _submit(self, text, lang):
+        key = (text, lang)
+        with self._lock:
+            future = self._in_flight.get(key)
+            if future is None:
+                future = self._in_flight[key] = self._pool.submit(self._segment_audio, text, lang)
+                future.add_done_callback(lambda _: self._forget(key))
+            return future
+
+    def _forget(self, key):
+        with self._lock:
+            self._in_flight.pop(key, None)
+
+    def cached_path(self, text, lang):
+        """
+        Path of a cached file holding the whole clip, or None.
+        Only clips of a single segment exist as one file.
+        """
+        lang = GTTS_CODES.get(lang, lang)
+        segments = self._segments(text)
+        if len(segments) != 1:
+            return None
+        return self.cache.get(segments[0], lang)
+
+    def stream(self, text, lang):
+        """MP3 bytes of the clip, yielded in order as soon as each segment is ready"""
+        lang = GTTS_CODES.get(lang, lang)
+        yield from self._synthesize_segments(self._segments(text), lang)
+
+    def synthesize(self, text, lang):
+        """
+        The MP3 clip for text: the path of its cached file if it is a
+        single segment, otherwise the bytes of its segments back to back
+        """
+        lang = GTTS_CODES.get(lang, lang)
+        segments = self._segments(text)
+        if len(segments) == 1:
+            self._submit(segments[0], lang).result()
+            return self.cache.path(segments[0], lang)
+        return b"".join(self._synthesize_segments(segments, lang))
@@ -0,0 +1,22 @@
+"""
+SQLite setup shared by the translation cache, memory and history stores
+Each store keeps one connection in WAL mode, shared by all Streamlit
+sessions (threads) and serialized with a lock, so readers in other
+processes (e.g. the API next to the app) are not blocked by writes.
+"""
+
+import sqlite3
+import threading
+
+
+def open_shared(path, *statements):
+    """
+    (connection, lock) for the database at path, after running the given
+    CREATE statements. Hold the lock around every use of the connection.
+    """
+    conn = sqlite3.connect(path, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    for statement in statements:
+        conn.execute(statement)
+    conn.commit()
+    return conn, threading.Lock()
@@ -0,0 +1,74 @@
+"""
+Tests for request validation in api.py, with a stub provider
+Run from this directory: python -m pytest
+"""
+
+import asyncio
+import json
+
+import pytest
+from starlette.requests import Request
+
+import api
+from providers import DEFAULT_PROVIDER, Provider
+from translation_cache import TranslationCache
+from translation_memory import TranslationMemory
+from translation_service import TranslationService
+
+
+class StubProvider(Provider):
+    name = DEFAULT_PROVIDER
+
+    def _translate_batch(self, texts, src_lang, dest_lang):
+        return [text.upper() for text in texts]
+
+
+@pytest.fixture(autouse=True)
+def service(tmp_path, monkeypatch):
+    cache = TranslationCache(str(tmp_path / "cache.db"))
+    memory = TranslationMemory(str(tmp_path / "memory.db"), cache=cache)
+    service = TranslationService(cache=cache, synthesizer=object(), memory=memory)
+    service._providers = {DEFAULT_PROVIDER: StubProvider()}
+    monkeypatch.setattr(api, "service", service)
+    return service
+
+
+def post(handler, body):
+    """(status code, JSON body) of handler's response to a POST of body"""
+    payload = json.dumps(body).encode("utf-8")
+
+    async def receive():
+        return {"type": "http.request", "body": payload, "more_body": False}
+
+    response = asyncio.run(handler(Request({"type": "http", "method": "POST", "headers": []}, receive)))
+    return response.status_code, json.loads(response.body)
+
+
+def test_translate():
+    assert post(api.translate, {"text": "Hello.", "source": "en", "target": "fr"}) == (
+        200, {"translation": "HELLO."}
+    )
+
+
+@pytest.mark.parametrize("lang", ["xx-bogus", "auto", ["en"], None])
+def test_unsupported_speech_language_is_rejected(lang):
+    status, body = post(api.tts, {"text": "Hello.", "lang": lang})
+
+    assert status == 400
+    assert "error" in body
+
+
+@pytest.mark.parametrize("options", [
+    {"source": ["en"]},
+    {"target": {"code": "fr"}},
+    {"provider": 1},
+    {"source": "xx"},
+    {"target": "auto"},
+    {"provider": "no-such-engine"},
+])
+@pytest.mark.parametrize("handler", [api.translate, api.memory_search])
+def test_bad_options_are_rejected(handler, options):
+    status, body = post(handler, {"text": "Hello.", "source": "en", "target": "fr", **options})
+
+    assert status == 400
+    assert "error" in body
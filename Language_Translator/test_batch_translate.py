@@ -0,0 +1,104 @@
+"""
+Tests for checkpoints and failures in batch_translate.py, with stub providers
+Run from this directory: python -m pytest
+"""
+
+import io
+import os
+
+import pytest
+
+import batch_translate
+from batch_translate import checkpoint_path, translate_file
+from providers import Provider, UnsupportedLanguagePair
+from translation_cache import TranslationCache
+
+LINES = [f"Line number {i}." for i in range(6)]
+
+
+class StubProvider(Provider):
+    def __init__(self, name="stub", failing=()):
+        super().__init__()
+        self.name = name
+        self.failing = set(failing)
+        self.seen = []
+
+    def _translate_batch(self, texts, src_lang, dest_lang):
+        self.seen.extend(texts)
+        if self.failing.intersection(texts):
+            # Not retried by translate_many, so the test does not sleep
+            raise UnsupportedLanguagePair(f"{src_lang}-{dest_lang}")
+        return [text.upper() for text in texts]
+
+
+@pytest.fixture
+def paths(tmp_path):
+    input_path, output_path = str(tmp_path / "in.txt"), str(tmp_path / "out.txt")
+    with open(input_path, "w", encoding="utf-8") as file:
+        file.write("\n".join(LINES) + "\n")
+    return input_path, output_path
+
+
+def run(paths, provider, cache, **options):
+    return translate_file(*paths, "en", "fr", workers=1, block_size=2,
+                          provider=provider, cache=cache, log=io.StringIO(), **options)
+
+
+def read_lines(path):
+    with open(path, encoding="utf-8") as file:
+        return file.read().splitlines()
+
+
+def test_failed_strings_are_retried_on_rerun(paths, tmp_path):
+    cache = TranslationCache(str(tmp_path / "cache.db"))
+    flaky = StubProvider(failing={LINES[3]})
+
+    assert run(paths, flaky, cache) == (6, 1)
+    assert read_lines(paths[1])[3] == LINES[3]
+    assert os.path.exists(checkpoint_path(paths[1]))
+
+    fixed = StubProvider()
+    assert run(paths, fixed, cache) == (6, 0)
+    assert read_lines(paths[1]) == [line.upper() for line in LINES]
+    assert not os.path.exists(checkpoint_path(paths[1]))
+    # Only the failed string reaches the provider again; the rest is cached
+    assert fixed.seen == [LINES[3]]
+
+
+def test_crashed_job_resumes_after_last_block(paths, tmp_path, monkeypatch):
+    cache = TranslationCache(str(tmp_path / "cache.db"))
+    translate_block = batch_translate.translate_block
+    blocks = []
+
+    def crash_on_second_block(*args, **kwargs):
+        blocks.append(args[2])
+        if len(blocks) == 2:
+            raise RuntimeError("crash")
+        return translate_block(*args, **kwargs)
+
+    monkeypatch.setattr(batch_translate, "translate_block", crash_on_second_block)
+    with pytest.raises(RuntimeError):
+        run(paths, StubProvider(), cache)
+    monkeypatch.setattr(batch_translate, "translate_block", translate_block)
+
+    provider = StubProvider()
+    assert run(paths, provider, cache) == (6, 0)
+    assert read_lines(paths[1]) == [line.upper() for line in LINES]
+    assert provider.seen == LINES[2:]
+
+
+def test_resuming_with_another_provider_is_refused(paths, tmp_path):
+    cache = TranslationCache(str(tmp_path / "cache.db"))
+    run(paths, StubProvider("a", failing={LINES[0]}), cache)
+
+    with pytest.raises(ValueError, match="different job"):
+        run(paths, StubProvider("b"), cache)
+
+
+def test_main_exits_non_zero_on_failures(paths, monkeypatch):
+    monkeypatch.setattr(batch_translate, "translate_file", lambda *args, **kwargs: (6, 1))
+    monkeypatch.setattr("sys.argv", ["batch_translate.py", *paths, "--dest", "fr"])
+
+    with pytest.raises(SystemExit) as exit_info:
+        batch_translate.main()
+    assert exit_info.value.code != 0
@@ -0,0 +1,64 @@
+"""
+Tests for language_detector.py, on text that is not in its samples
+Run from this directory: python -m pytest
+"""
+
+import pytest
+
+from language_detector import detect
+from languages import AUTO
+from translation_service import TranslationService
+
+
+@pytest.mark.parametrize("code, text", [
+    ('en', "My brother bought a new car last week and he drives it to work every morning."),
+    ('de', "Die Kinder spielten im Garten, während ihre Eltern das Abendessen kochten."),
+    ('fr', "Les enfants jouaient dans le jardin pendant que leurs parents préparaient le dîner."),
+    ('nl', "Mijn broer heeft vorige week een nieuwe auto gekocht en rijdt er elke ochtend mee "
+           "naar zijn werk."),
+    ('pl', "Czy mógłby pan przesłać mi dokumenty przed spotkaniem w piątek po południu?"),
+    ('fi', "Lapset leikkivät puutarhassa, kun vanhemmat laittoivat päivällistä."),
+    ('uk', "Мій брат минулого тижня купив нову машину і щоранку їздить нею на роботу."),
+    ('ko', "오늘 날씨가 정말 좋아서 공원에 산책하러 가요."),
+])
+def test_modeled_languages_are_detected(code, text):
+    assert detect(text) == code
+
+
+@pytest.mark.parametrize("text", [
+    # Latin script
+    "Mano brolis praėjusią savaitę nusipirko naują automobilį ir kiekvieną rytą juo "
+    "važiuoja į darbą.",  # Lithuanian
+    "Mans brālis pagājušajā nedēļā nopirka jaunu mašīnu un katru rītu brauc ar to uz darbu.",
+    "Moj brat je prejšnji teden kupil nov avto in se z njim vsako jutro vozi v službo.",
+    "Lapsed mängisid aias, samal ajal kui vanemad õhtusööki valmistasid.",  # Estonian
+    "Vëllai im bleu një makinë të re javën e kaluar dhe e nget çdo mëngjes për në punë.",
+    "Bróðir minn keypti nýjan bíl í síðustu viku og keyrir hann í vinnuna á hverjum morgni.",
+    "Prynodd fy mrawd gar newydd yr wythnos diwethaf ac mae'n ei yrru i'r gwaith bob bore.",
+    "My broer het verlede week 'n nuwe motor gekoop en ry elke oggend daarmee werk toe.",
+    "Kaka yangu alinunua gari jipya wiki iliyopita na analiendesha kwenda kazini kila asubuhi.",
+    "Ɗan'uwana ya sayi sabuwar mota a makon da ya gabata kuma yana tuƙa ta zuwa aiki.",
+    "Akam o'tgan hafta yangi mashina sotib oldi va har kuni ertalab u bilan ishga boradi.",
+    "Frater meus hebdomade proxima novum currum emit et cotidie mane ad opus vehitur.",
+    # Cyrillic script
+    "Мојот брат минатата недела купи нов автомобил и секое утро вози со него на работа.",
+    "Мой брат на мінулым тыдні купіў новую машыну і кожную раніцу ездзіць на ёй на працу.",
+    "Менің ағам өткен аптада жаңа көлік сатып алды және күн сайын таңертең сонымен жұмысқа "
+    "барады.",
+    "Хүүхдүүд цэцэрлэгт тоглож байхад эцэг эх нь оройн хоол хийж байв.",  # Mongolian
+    "Бародари ман ҳафтаи гузашта мошини нав харид ва ҳар саҳар бо он ба кор меравад.",
+    # Scripts shared by several supported languages
+    "這是一個用於測試的中文句子，今天天氣很好。",  # Traditional Chinese
+    "איך האָב ליב צו לייענען ביכער אין דער היים.",  # Yiddish
+])
+def test_unmodeled_languages_are_not_guessed(text):
+    assert detect(text) is None
+
+
+def test_unmodeled_source_stays_auto():
+    service = TranslationService(cache=object(), synthesizer=object(), memory=object())
+    lithuanian = "Vaikai žaidė sode, kol tėvai ruošė vakarienę, o šuo miegojo prie durų."
+    english = "My brother bought a new car last week and he drives it to work every morning."
+
+    assert service._resolve_source(lithuanian, AUTO, 'en') == AUTO
+    assert service._resolve_source(english, AUTO, 'fr') == 'en'
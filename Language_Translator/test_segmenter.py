@@ -0,0 +1,51 @@
+"""
+Tests for segmenter.py
+Run from this directory: python -m pytest
+"""
+
+from segmenter import join_segments, split_segments
+
+WRAPPED = (
+    "The quick brown fox jumps over the lazy dog while the farmer\n"
+    "watches from the porch and wonders where his hat went.\n"
+    "\n"
+    "A second paragraph, also wrapped at a fixed\n"
+    "column width, follows the blank line.\n"
+)
+
+
+def test_wrapped_sentence_stays_in_one_chunk():
+    chunks = [chunk for chunk, _ in split_segments(WRAPPED)]
+    assert chunks == [
+        "The quick brown fox jumps over the lazy dog while the farmer\n"
+        "watches from the porch and wonders where his hat went.",
+        "A second paragraph, also wrapped at a fixed\n"
+        "column width, follows the blank line.",
+    ]
+
+
+def test_blank_lines_with_spaces_split_paragraphs():
+    chunks = [chunk for chunk, _ in split_segments("One.\n  \t\nTwo.\r\n\r\nThree.")]
+    assert chunks == ["One.", "Two.", "Three."]
+
+
+def test_long_wrapped_paragraph_splits_at_sentence_ends():
+    sentence = "This sentence is wrapped\nacross two lines."
+    text = " ".join([sentence] * 10)
+    segments = split_segments(text, max_chars=100)
+
+    assert len(segments) > 1
+    for chunk, _ in segments:
+        assert len(chunk) <= 100
+        assert chunk.endswith("lines.")
+
+
+def test_surrounding_whitespace_is_not_in_chunks():
+    assert split_segments("\n  Hello.\n") == [("", "\n  "), ("Hello.", "\n")]
+    assert split_segments(" \n ") == [("", " \n ")]
+
+
+def test_join_restores_layout():
+    text = "  Title\n\n\nFirst line\nsecond line.  Next one!\n \n\tIndented.\n"
+    assert join_segments(split_segments(text)) == text
+    assert join_segments(split_segments(text, max_chars=10)) == text
@@ -0,0 +1,81 @@
+"""
+Tests for the speech cache, with gTTS replaced by a fake
+Run from this directory: python -m pytest
+"""
+
+import asyncio
+import json
+
+import pytest
+from starlette.requests import Request
+from starlette.responses import FileResponse
+
+import api
+import speech
+from speech import AudioCache, SpeechSynthesizer
+from translation_service import TranslationService
+
+LONG_TEXT = " ".join(f"This is sentence number {i} of a long text." for i in range(30))
+
+
+class FakeTTS:
+    calls = []
+
+    def __init__(self, text, lang, slow=False):
+        self.text, self.lang = text, lang
+
+    def write_to_fp(self, file):
+        FakeTTS.calls.append((self.text, self.lang))
+        file.write(f"<{self.lang}:{self.text}>".encode("utf-8"))
+
+
+@pytest.fixture
+def synthesizer(tmp_path, monkeypatch):
+    monkeypatch.setattr(speech, "gTTS", FakeTTS)
+    FakeTTS.calls = []
+    return SpeechSynthesizer(AudioCache(str(tmp_path)))
+
+
+def test_long_clip_is_cached_once_as_segments(synthesizer):
+    audio = synthesizer.synthesize(LONG_TEXT, "en")
+    segments = synthesizer._segments(LONG_TEXT)
+
+    assert len(segments) > 1
+    assert audio == b"".join(f"<en:{s}>".encode("utf-8") for s in segments)
+    stats = synthesizer.cache.stats()
+    assert stats["clips"] == len(segments)
+    assert stats["bytes"] == len(audio)
+
+
+def test_cached_segments_are_reused(synthesizer):
+    first = b"".join(synthesizer.stream(LONG_TEXT, "en"))
+    calls = len(FakeTTS.calls)
+
+    assert b"".join(synthesizer.stream(LONG_TEXT, "en")) == first
+    assert synthesizer.synthesize(LONG_TEXT, "en") == first
+    assert len(FakeTTS.calls) == calls
+
+
+def test_short_clip_is_served_from_its_file(synthesizer):
+    path = synthesizer.synthesize("Hello there.", "zh-CN")
+
+    assert FakeTTS.calls == [("Hello there.", "zh")]
+    assert synthesizer.cached_path("Hello there.", "zh-CN") == path
+    assert synthesizer.cached_path(LONG_TEXT, "en") is None
+
+
+def test_api_serves_cached_clip_by_gtts_code(synthesizer, monkeypatch):
+    monkeypatch.setattr(api, "service", TranslationService(
+        cache=object(), synthesizer=synthesizer, memory=object()
+    ))
+    path = synthesizer.synthesize("Hello there.", "zh-CN")
+    body = json.dumps({"text": "Hello there.", "lang": "zh-CN"}).encode("utf-8")
+
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    request = Request({"type": "http", "method": "POST", "headers": []}, receive)
+    response = asyncio.run(api.tts(request))
+
+    assert isinstance(response, FileResponse)
+    assert response.path == path
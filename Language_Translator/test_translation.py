@@ -0,0 +1,70 @@
+"""
+Tests for cached translations and the translation memory, with stub providers
+Run from this directory: python -m pytest
+"""
+
+import pytest
+
+import translation_memory
+from providers import Provider
+from translation_cache import TranslationCache
+from translation_memory import TranslationMemory
+from translation_service import TranslationService
+
+
+class StubProvider(Provider):
+    def __init__(self, name):
+        super().__init__()
+        self.name = name
+
+    def _translate_batch(self, texts, src_lang, dest_lang):
+        return [f"{self.name}:{text}" for text in texts]
+
+
+@pytest.fixture
+def service(tmp_path):
+    cache = TranslationCache(str(tmp_path / "cache.db"))
+    memory = TranslationMemory(str(tmp_path / "memory.db"), cache=cache)
+    service = TranslationService(cache=cache, synthesizer=object(), memory=memory)
+    service._providers = {name: StubProvider(name) for name in ("a", "b")}
+    return service
+
+
+def test_providers_do_not_share_cached_translations(service):
+    assert service.translate("Good morning.", "en", "fr", "a") == ("a:Good morning.", None)
+    assert service.translate("Good morning.", "en", "fr", "b") == ("b:Good morning.", None)
+    assert service.translate("Good morning.", "en", "fr", "a") == ("a:Good morning.", None)
+
+    assert service.provider("a").stats.summary()["texts"] == 1
+    assert service.provider("b").stats.summary()["texts"] == 1
+
+
+def test_suggestions_come_from_the_same_provider(service):
+    service.translate("The weather is very nice today in the park.", "en", "fr", "a")
+
+    [match] = service.suggestions("The weather is very nice today in the city.", "en", "fr", "a")
+    assert match["translation"] == "a:The weather is very nice today in the park."
+    assert service.suggestions("The weather is very nice today in the city.", "en", "fr", "b") == []
+
+
+def test_expired_segments_are_not_reused(tmp_path):
+    memory = TranslationMemory(str(tmp_path / "memory.db"), ttl_seconds=60)
+    memory.put("The weather is very nice today.", "en", "fr", "a", "Il fait très beau.")
+    assert memory.get("The weather is very nice today.", "en", "fr", "a") == "Il fait très beau."
+    memory._conn.execute("UPDATE segments SET updated_at = updated_at - 120")
+
+    assert memory.get("The weather is very nice today.", "en", "fr", "a") is None
+    assert memory.search("The weather is very nice today!", "en", "fr", "a") == []
+
+
+def test_oldest_segments_are_evicted(tmp_path, monkeypatch):
+    monkeypatch.setattr(translation_memory, "EVICT_EVERY", 2)
+    memory = TranslationMemory(str(tmp_path / "memory.db"), max_segments=3)
+    for i in range(6):
+        memory.put(f"Sentence number {i}.", "en", "fr", "a", f"Phrase numéro {i}.")
+
+    assert memory.stats()["segments"] == 3
+    assert memory.get("Sentence number 2.", "en", "fr", "a") is None
+    assert memory.get("Sentence number 3.", "en", "fr", "a") == "Phrase numéro 3."
+    buckets = memory._conn.execute("SELECT COUNT(DISTINCT segment_id) FROM buckets").fetchone()[0]
+    assert buckets == 3
@@ -0,0 +1,107 @@
+"""
+Translation core, independent of the Streamlit UI
+Long inputs are split into chunks that are translated concurrently on a
+small thread pool, cached one by one and reassembled in order. Only the
+chunks that fail are retried, so editing one paragraph of a long text
+only retranslates that paragraph.
+
+Chunks go to a provider (see providers.py) in batches of its max_batch:
+single texts for the remote service, bigger batches for local models.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from translatepy.exceptions import TranslatepyException, UnknownLanguage
+
+from providers import UnsupportedLanguagePair
+from segmenter import DEFAULT_MAX_CHARS, split_segments
+
+MAX_WORKERS = 4
+MAX_RETRIES = 2
+RETRY_DELAY = 0.5  # seconds, doubled after every failed round
+
+
+def _error_message(error):
+    if isinstance(error, UnknownLanguage):
+        return f"Unknown language: {str(error)}"
+    if isinstance(error, UnsupportedLanguagePair):
+        return f"Unsupported language pair: {str(error)}"
+    if isinstance(error, TranslatepyException):
+        return f"Translation error: {str(error)}"
+    return f"Unexpected error: {str(error)}"
+
+
+def translate_many(provider, cache, texts, src_lang, dest_lang,
+                   max_chars=DEFAULT_MAX_CHARS, max_workers=MAX_WORKERS, retries=MAX_RETRIES):
+    """
+    Translate several texts, sharing chunks between them. Cached chunks
+    are looked up per provider, so engines never serve each other's text.
+    Returns [(translation, None) or (None, error message), ...] in order.
+    """
+    split = [split_segments(text, max_chars) for text in texts]
+
+    translations = {}
+    pending = []
+    for segments in split:
+        for chunk, _ in segments:
+            if not chunk.strip() or chunk in translations:
+                continue
+            translations[chunk] = cache.get(chunk, src_lang, dest_lang, provider.name)
+            if translations[chunk] is None:
+                pending.append(chunk)
+
+    errors = {}
+    for attempt in range(retries + 1):
+        if not pending:
+            break
+        if attempt:
+            time.sleep(RETRY_DELAY * 2 ** (attempt - 1))
+
+        size = provider.max_batch
+        batches = [pending[i:i + size] for i in range(0, len(pending), size)]
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(batches))) as pool:
+            futures = [
+                pool.submit(provider.translate_batch, batch, src_lang, dest_lang)
+                for batch in batches
+            ]
+
+        failed = []
+        for batch, future in zip(batches, futures):
+            error = future.exception()
+            if error is None:
+                for chunk, translation in zip(batch, future.result()):
+                    translations[chunk] = translation
+                    errors.pop(chunk, None)
+                    cache.put(chunk, src_lang, dest_lang, provider.name, translation)
+                continue
+            for chunk in batch:
+                errors[chunk] = error
+            # Retrying cannot fix a bad language code
+            if not isinstance(error, (UnknownLanguage, UnsupportedLanguagePair)):
+                failed.extend(batch)
+        pending = failed
+
+    results = []
+    for segments in split:
+        failed = [chunk for chunk, _ in segments if chunk in errors]
+        if failed:
+            chunks = sum(1 for chunk, _ in segments if chunk.strip())
+            message = _error_message(errors[failed[0]])
+            if chunks > 1:
+                message += f" ({len(failed)} of {chunks} chunks failed)"
+            results.append((None, message))
+        else:
+            results.append((''.join(
+                (translations[chunk] if chunk.strip() else chunk) + separator
+                for chunk, separator in segments
+            ), None))
+    return results
+
+
+def translate_long_text(provider, cache, text, src_lang, dest_lang, **options):
+    """
+    Translate text chunk by chunk.
+    Returns (translation, None) or (None, error message), like translate_text.
+    """
+    return translate_many(provider, cache, [text], src_lang, dest_lang, **options)[0]
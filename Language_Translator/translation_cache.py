@@ -0,0 +1,102 @@
+"""
+Persistent translation cache
+Stores finished translations in a local SQLite file so identical
+(text, source, target, provider) requests are served without a network call,
+across reruns, sessions and app restarts.
+"""
+
+import hashlib
+import os
+import time
+
+from sqlite_store import open_shared
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "translation_cache.db")
+
+
+def cache_key(text, src_lang, dest_lang, provider):
+    """Hash of the text, language pair and provider name, so long texts make short keys"""
+    raw = f"{provider}\0{src_lang}\0{dest_lang}\0{text}".encode("utf-8")
+    return hashlib.sha256(raw).hexdigest()
+
+
+class TranslationCache:
+    """SQLite-backed cache with LRU eviction and a time-to-live"""
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_entries=10000, ttl_seconds=30 * 24 * 3600):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._conn, self._lock = open_shared(
+            path,
+            """
+                CREATE TABLE IF NOT EXISTS translations (
+                    key TEXT PRIMARY KEY,
+                    src_lang TEXT NOT NULL,
+                    dest_lang TEXT NOT NULL,
+                    translation TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_used REAL NOT NULL
+                )
+            """,
+            "CREATE INDEX IF NOT EXISTS idx_translations_last_used ON translations (last_used)"
+        )
+
+    def get(self, text, src_lang, dest_lang, provider):
+        """Cached translation by this provider, or None if missing or expired"""
+        key = cache_key(text, src_lang, dest_lang, provider)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT translation, created_at FROM translations WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None or now - row[1] > self.ttl_seconds:
+                if row is not None:
+                    self._conn.execute("DELETE FROM translations WHERE key = ?", (key,))
+                    self._conn.commit()
+                self.misses += 1
+                return None
+
+            self._conn.execute("UPDATE translations SET last_used = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+            return row[0]
+
+    def put(self, text, src_lang, dest_lang, provider, translation):
+        """Store a translation and evict the least recently used overflow"""
+        key = cache_key(text, src_lang, dest_lang, provider)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?, ?, ?)",
+                (key, src_lang, dest_lang, translation, now, now)
+            )
+            self._conn.execute(
+                "DELETE FROM translations WHERE created_at < ?", (now - self.ttl_seconds,)
+            )
+            self._conn.execute("""
+                DELETE FROM translations WHERE key IN (
+                    SELECT key FROM translations ORDER BY last_used DESC LIMIT -1 OFFSET ?
+                )
+            """, (self.max_entries,))
+            self._conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM translations")
+            self._conn.commit()
+
+    def stats(self):
+        """Entry count and hit rate since the app started"""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            'entries': entries,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
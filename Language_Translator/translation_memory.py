@@ -0,0 +1,222 @@
+"""
+Translation memory
+Every translated segment (a chunk from segmenter.py) is kept per language
+pair and provider in a local SQLite file, so earlier work can be reused:
+
+- exact matches are answered from a hash index, before the remote call
+- near matches (small edits of an earlier segment) are found with
+  MinHash locality-sensitive hashing over character trigrams and
+  surfaced as suggestions
+
+The MinHash signature of a segment is cut into bands; each band is
+stored as one indexed bucket key. A lookup reads the segments sharing
+at least one bucket with the query and verifies them with the exact
+trigram Jaccard similarity, so its cost depends on the number of
+similar segments, not on the size of the memory.
+
+Segments expire like cache entries: older ones than ttl_seconds (the
+cache's TTL by default) are never answered, and every EVICT_EVERY new
+segments the expired ones and the oldest beyond max_segments are deleted.
+"""
+
+import hashlib
+import os
+import re
+import time
+import zlib
+
+import numpy as np
+
+from sqlite_store import open_shared
+
+DEFAULT_MEMORY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "translation_memory.db")
+
+BANDS = 16
+ROWS = 4  # signature values per band; BANDS * ROWS permutations in total
+MIN_SIMILARITY = 0.6
+MAX_CANDIDATES = 200
+DEFAULT_MAX_SEGMENTS = 50000
+DEFAULT_TTL = 30 * 24 * 3600
+EVICT_EVERY = 500  # new segments between two eviction passes
+
+_PRIME = 4294967311  # smallest prime above 2**32
+_rng = np.random.default_rng(1)
+_A = _rng.integers(1, 2**32, size=BANDS * ROWS, dtype=np.uint64)
+_B = _rng.integers(0, 2**32, size=BANDS * ROWS, dtype=np.uint64)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize(text):
+    return _WHITESPACE.sub(" ", text.strip().lower())
+
+
+def shingles(text):
+    """Character trigrams of the normalized text"""
+    text = f" {normalize(text)} "
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def jaccard(a, b):
+    return len(a & b) / len(a | b) if a or b else 1.0
+
+
+def minhash(grams):
+    """MinHash signature (BANDS * ROWS values) of a set of shingles"""
+    hashes = np.fromiter(
+        (zlib.crc32(gram.encode("utf-8")) for gram in grams), dtype=np.uint64, count=len(grams)
+    )
+    # a * x + b stays below 2**64 because a, b and x are all below 2**32
+    permuted = (np.outer(hashes, _A) + _B) % _PRIME
+    return permuted.min(axis=0)
+
+
+def _key(*parts):
+    """Signed 64-bit key (SQLite's INTEGER) from a hash of the parts"""
+    digest = hashlib.blake2b("\0".join(parts).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+def bucket_keys(src_lang, dest_lang, provider, signature):
+    rows = signature.reshape(BANDS, ROWS)
+    return [
+        _key(src_lang, dest_lang, provider, str(band), rows[band].tobytes().hex())
+        for band in range(BANDS)
+    ]
+
+
+class TranslationMemory:
+    """
+    Segment store with the get / put interface of TranslationCache, so it
+    can sit in front of it; cache (optional) is checked first and kept
+    up to date.
+    """
+
+    def __init__(self, path=DEFAULT_MEMORY_PATH, cache=None,
+                 max_segments=DEFAULT_MAX_SEGMENTS, ttl_seconds=None):
+        self.path = path
+        self.cache = cache
+        self.max_segments = max_segments
+        if ttl_seconds is None:
+            # Exact hits must not outlive what the cache would keep
+            ttl_seconds = cache.ttl_seconds if cache is not None else DEFAULT_TTL
+        self.ttl_seconds = ttl_seconds
+        self.exact_hits = 0
+        self._new_segments = 0
+        self._conn, self._lock = open_shared(
+            path,
+            """
+                CREATE TABLE IF NOT EXISTS segments (
+                    id INTEGER PRIMARY KEY,
+                    key INTEGER NOT NULL UNIQUE,
+                    src_lang TEXT NOT NULL,
+                    dest_lang TEXT NOT NULL,
+                    source TEXT NOT NULL,
+                    translation TEXT NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            """,
+            """
+                CREATE TABLE IF NOT EXISTS buckets (
+                    bucket INTEGER NOT NULL,
+                    segment_id INTEGER NOT NULL,
+                    PRIMARY KEY (bucket, segment_id)
+                ) WITHOUT ROWID
+            """,
+            "CREATE INDEX IF NOT EXISTS idx_segments_updated_at ON segments (updated_at)"
+        )
+
+    def get(self, text, src_lang, dest_lang, provider):
+        """This provider's translation of exactly this segment, or None"""
+        if self.cache is not None:
+            cached = self.cache.get(text, src_lang, dest_lang, provider)
+            if cached is not None:
+                return cached
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT translation FROM segments WHERE key = ? AND updated_at >= ?",
+                (_key(src_lang, dest_lang, provider, text), time.time() - self.ttl_seconds)
+            ).fetchone()
+        if row is None:
+            return None
+        # Not copied back into the cache, where it would start a new TTL
+        self.exact_hits += 1
+        return row[0]
+
+    def put(self, text, src_lang, dest_lang, provider, translation):
+        if self.cache is not None:
+            self.cache.put(text, src_lang, dest_lang, provider, translation)
+        self.add_many([(text, translation)], src_lang, dest_lang, provider)
+
+    def add_many(self, pairs, src_lang, dest_lang, provider):
+        """Store (source, translation) segments, e.g. to import an existing memory"""
+        now = time.time()
+        rows = [
+            (_key(src_lang, dest_lang, provider, source), source, translation,
+             bucket_keys(src_lang, dest_lang, provider, minhash(shingles(source))))
+            for source, translation in pairs
+        ]
+        with self._lock:
+            for key, source, translation, buckets in rows:
+                existing = self._conn.execute(
+                    "SELECT id FROM segments WHERE key = ?", (key,)
+                ).fetchone()
+                if existing:
+                    self._conn.execute(
+                        "UPDATE segments SET translation = ?, updated_at = ? WHERE id = ?",
+                        (translation, now, existing[0])
+                    )
+                    continue
+                segment_id = self._conn.execute(
+                    "INSERT INTO segments (key, src_lang, dest_lang, source, translation, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, src_lang, dest_lang, source, translation, now)
+                ).lastrowid
+                self._conn.executemany(
+                    "INSERT INTO buckets VALUES (?, ?)",
+                    [(bucket, segment_id) for bucket in buckets]
+                )
+                self._new_segments += 1
+            if self._new_segments >= EVICT_EVERY:
+                self._evict(now)
+            self._conn.commit()
+
+    def _evict(self, now):
+        """Deletes expired segments and the oldest beyond max_segments (lock held)"""
+        self._conn.execute("DELETE FROM segments WHERE updated_at < ?", (now - self.ttl_seconds,))
+        self._conn.execute("""
+            DELETE FROM segments WHERE id IN (
+                SELECT id FROM segments ORDER BY updated_at DESC LIMIT -1 OFFSET ?
+            )
+        """, (self.max_segments,))
+        # Scans every bucket, which is why eviction runs in batches
+        self._conn.execute("DELETE FROM buckets WHERE segment_id NOT IN (SELECT id FROM segments)")
+        self._new_segments = 0
+
+    def search(self, text, src_lang, dest_lang, provider, k=3, min_similarity=MIN_SIMILARITY):
+        """
+        Earlier segments similar to text translated by provider, as
+        [{'source', 'translation', 'similarity'}, ...] best first.
+        """
+        grams = shingles(text)
+        buckets = bucket_keys(src_lang, dest_lang, provider, minhash(grams))
+        placeholders = ",".join("?" * len(buckets))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT source, translation FROM segments WHERE updated_at >= ? AND id IN ("
+                f"SELECT DISTINCT segment_id FROM buckets WHERE bucket IN ({placeholders}) LIMIT ?)",
+                [time.time() - self.ttl_seconds] + buckets + [MAX_CANDIDATES]
+            ).fetchall()
+
+        matches = []
+        for source, translation in rows:
+            similarity = jaccard(grams, shingles(source))
+            if similarity >= min_similarity:
+                matches.append({'source': source, 'translation': translation, 'similarity': similarity})
+        matches.sort(key=lambda match: -match['similarity'])
+        return matches[:k]
+
+    def stats(self):
+        with self._lock:
+            segments = self._conn.execute("SELECT COUNT(*) FROM segments").fetchone()[0]
+        return {'segments': segments, 'exact_hits': self.exact_hits}
@@ -0,0 +1,110 @@
+"""
+Translation service
+Everything the UI needs (translate, detect, speak, stats) behind one
+object, independent of Streamlit. The app uses it in-process, and
+api.py serves the same object over HTTP; api_client.py mirrors its
+interface for apps that talk to the HTTP API instead.
+"""
+
+import os
+import threading
+
+from language_detector import detect
+from languages import AUTO
+from providers import DEFAULT_PROVIDER, PROVIDERS, available_providers, make_provider
+from segmenter import split_segments
+from speech import SpeechSynthesizer
+from translation import translate_long_text
+from translation_cache import TranslationCache
+from translation_memory import TranslationMemory
+
+
+class TranslationService:
+    """Providers, caches and speech synthesis shared by all callers"""
+
+    def __init__(self, cache=None, synthesizer=None, memory=None):
+        self.cache = cache or TranslationCache()
+        # The memory answers exact repeats through the cache and keeps every
+        # segment for fuzzy suggestions, so translations go through it
+        self.memory = memory or TranslationMemory(cache=self.cache)
+        self.synthesizer = synthesizer or SpeechSynthesizer()
+        self._providers = {}
+        self._lock = threading.Lock()
+
+    def providers(self):
+        """[(name, label), ...] of the installed providers"""
+        return [(name, PROVIDERS[name].label) for name in available_providers()]
+
+    def provider(self, name=DEFAULT_PROVIDER):
+        """The provider called name, created and warmed up on first use"""
+        with self._lock:
+            if name not in self._providers:
+                provider = make_provider(name)
+                # e.g. MARIAN_WARMUP_PAIRS=en-fr,en-de loads those models at startup
+                pairs = os.environ.get(f"{name.upper()}_WARMUP_PAIRS", "")
+                provider.warmup([tuple(pair.split("-", 1)) for pair in pairs.split(",") if pair])
+                self._providers[name] = provider
+            return self._providers[name]
+
+    def detect(self, text):
+        """Language code of text, or None if the local detector is unsure"""
+        return detect(text)
+
+    def _resolve_source(self, text, src_lang, dest_lang):
+        if src_lang == AUTO:
+            # Detect locally when sure, saving the remote detection round trip
+            detected = self.detect(text)
+            if detected and detected != dest_lang:
+                return detected
+        return src_lang
+
+    def translate(self, text, src_lang, dest_lang, provider_name=DEFAULT_PROVIDER):
+        """(translation, None) or (None, error message)"""
+        try:
+            provider = self.provider(provider_name)
+        except Exception as e:
+            return None, f"Translator initialization failed: {str(e)}"
+
+        src_lang = self._resolve_source(text, src_lang, dest_lang)
+        return translate_long_text(provider, self.memory, text, src_lang, dest_lang)
+
+    def suggestions(self, text, src_lang, dest_lang, provider_name=DEFAULT_PROVIDER, per_segment=3):
+        """
+        Earlier translations (by the same provider) of segments similar,
+        but not identical, to those of text, as
+        [{'source', 'translation', 'similarity'}, ...]
+        """
+        src_lang = self._resolve_source(text, src_lang, dest_lang)
+        found = {}
+        for chunk, _ in split_segments(text):
+            if not chunk.strip():
+                continue
+            for match in self.memory.search(chunk, src_lang, dest_lang, provider_name,
+                                            k=per_segment):
+                if match['source'] != chunk:
+                    found.setdefault(match['source'], match)
+        return sorted(found.values(), key=lambda match: -match['similarity'])
+
+    def speech(self, text, lang_code):
+        """(cached MP3 path or MP3 bytes, None) or (None, error message)"""
+        try:
+            return self.synthesizer.synthesize(text, lang_code), None
+        except Exception as e:
+            return None, str(e)
+
+    def speech_stream(self, text, lang_code):
+        """MP3 bytes, yielded as soon as each sentence group is synthesized"""
+        return self.synthesizer.stream(text, lang_code)
+
+    def stats(self):
+        with self._lock:
+            providers = {
+                name: dict(provider.stats.summary(), label=provider.label)
+                for name, provider in self._providers.items()
+            }
+        return {
+            'cache': self.cache.stats(),
+            'memory': self.memory.stats(),
+            'audio': self.synthesizer.cache.stats(),
+            'providers': providers,
+        }
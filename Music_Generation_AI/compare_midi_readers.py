@@ -0,0 +1,95 @@
+"""
+MIDI reader parity and speed check
+Extracts the tokens of every MIDI file twice, with midi_reader.read_notes
+and with music21 (converter.parse + extract_song_notes), and checks that
+both give exactly the same token list:
+
+    python compare_midi_readers.py
+    python compare_midi_readers.py --data-dir data/midi_files --rounds 3
+
+For each file it reports the token count, the best time of each reader
+over the rounds and the speedup. Files midi_reader does not support are
+listed as such (preprocess.py falls back to music21 for them). Exits with
+status 1 if any supported file gives different tokens.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+from music21 import converter
+
+from midi_reader import UnsupportedMidi, read_notes
+from preprocess import extract_song_notes
+
+
+def best_time(func, filepath, rounds):
+    best, result = None, None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        result = func(filepath)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
+
+
+def music21_notes(filepath):
+    return extract_song_notes(converter.parse(filepath))
+
+
+def first_difference(a, b):
+    for i, (x, y) in enumerate(zip(a, b)):
+        if x != y:
+            return i
+    return min(len(a), len(b))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare midi_reader with music21")
+    parser.add_argument("--data-dir", default="data/midi_files")
+    parser.add_argument("--rounds", type=int, default=1, help="timed runs per file and reader")
+    args = parser.parse_args()
+
+    midi_files = sorted(f for f in os.listdir(args.data_dir)
+                        if f.endswith('.mid') or f.endswith('.midi'))
+    if not midi_files:
+        print(f"No MIDI files found in {args.data_dir}")
+        return 1
+
+    # Warm-up: music21's first parse loads its modules and settings
+    converter.parse(os.path.join(args.data_dir, midi_files[0]))
+
+    mismatches, unsupported = 0, 0
+    fast_total, slow_total = 0.0, 0.0
+    print(f"{'file':<32} {'tokens':>7} {'reader':>9} {'music21':>9} {'speedup':>8}")
+    for file in midi_files:
+        filepath = os.path.join(args.data_dir, file)
+        expected, slow = best_time(music21_notes, filepath, args.rounds)
+        try:
+            notes, fast = best_time(read_notes, filepath, args.rounds)
+        except UnsupportedMidi as e:
+            unsupported += 1
+            print(f"{file:<32} {len(expected):>7} {'unsupported':>9}  ({e})")
+            continue
+
+        fast_total += fast
+        slow_total += slow
+        status = ""
+        if notes != expected:
+            mismatches += 1
+            i = first_difference(notes, expected)
+            status = (f"  MISMATCH at token {i}: {notes[i:i + 3]} != {expected[i:i + 3]}"
+                      f" ({len(notes)} vs {len(expected)} tokens)")
+        print(f"{file:<32} {len(expected):>7} {fast:>8.3f}s {slow:>8.3f}s {slow / fast:>7.1f}x{status}")
+
+    if fast_total:
+        print(f"{'total':<32} {'':>7} {fast_total:>8.3f}s {slow_total:>8.3f}s "
+              f"{slow_total / fast_total:>7.1f}x")
+    print(f"\n{len(midi_files)} files: {len(midi_files) - unsupported - mismatches} identical, "
+          f"{mismatches} different, {unsupported} unsupported")
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,562 @@
+"""
+midi_reader.py
+Fast note/chord extraction that reads MIDI events directly.
+
+converter.parse builds a full music21 score (notes, measures, voices,
+rests, ties...) and extract_song_notes then walks it just to collect
+pitch names and chord normal orders. This module goes from the raw
+note-on/note-off events to the same tokens without building that score.
+
+The tokens have to be identical to the music21 path (the model's
+vocabulary and the cached corpora depend on it), so the steps of
+music21's MIDI import that change which tokens come out, or their order,
+are replayed on plain Python values:
+
+1. note-on/note-off pairing (midi.translate.getNotesFromEvents)
+2. grouping of near-simultaneous onsets into chords (midiTrackToStream)
+3. quantization to 16ths and eighth-note triplets (Stream.quantize)
+4. splitting into measures from the time signatures (makeMeasures)
+5. moving overlapping notes into voices (Measure.makeVoices)
+6. splitting notes that cross a barline into tied notes (makeTies)
+
+Files this does not reproduce exactly (percussion on channel 10, SMPTE
+timing, conflicting time signatures...) raise UnsupportedMidi, so the
+caller can fall back to music21. compare_midi_readers.py checks parity
+and speed against the music21 path.
+"""
+
+from bisect import bisect_right
+from functools import lru_cache
+from itertools import count
+
+from music21 import chord
+from music21.common.numberTools import nearestMultiple, opFrac
+from music21.pitch import Pitch
+
+QUARTER_LENGTH_DIVISORS = (4, 3)  # music21's default quantization grid
+DEFAULT_BAR = 4.0  # 4/4, used when a file has no time signature at 0
+
+PITCH_NAMES = ('C', 'C#', 'D', 'E-', 'E', 'F', 'F#', 'G', 'G#', 'A', 'B-', 'B')
+
+NOTE_OFF, NOTE_ON, PROGRAM_CHANGE = 0x80, 0x90, 0xC0
+META_TRACK_NAME, META_INSTRUMENT_NAME = 0x03, 0x04
+META_TEMPO, META_TIME_SIGNATURE, META_KEY_SIGNATURE = 0x51, 0x58, 0x59
+
+# Meta events music21 turns into score objects (instruments, tempo,
+# key and time signatures); only their positions matter here
+OBJECT_META_EVENTS = (META_TRACK_NAME, META_INSTRUMENT_NAME, META_TEMPO,
+                      META_TIME_SIGNATURE, META_KEY_SIGNATURE)
+CONDUCTOR_META_EVENTS = (META_TEMPO, META_TIME_SIGNATURE, META_KEY_SIGNATURE)
+
+# Sort order of score objects within a measure (music21's classSortOrder)
+VOICE_SORT, NOTE_SORT = 5, 20
+
+
+class UnsupportedMidi(Exception):
+    """The file uses features this reader does not reproduce exactly."""
+
+
+# ---------------------------------------------------------------------------
+# Reading events
+
+def read_variable_length(data, pos):
+    """(value, position after it) of a MIDI variable-length number."""
+    value = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value = (value << 7) | (byte & 0x7F)
+        if not byte & 0x80:
+            return value, pos
+
+
+def read_track_events(data):
+    """
+    [(tick, status, channel, data1, data2 or meta bytes), ...] for the
+    note, program change and meta events of one track chunk.
+    Mirrors music21's reader, including its handling of running status
+    and of events it cannot parse (skipped without advancing the time).
+    """
+    events = []
+    tick = 0
+    last_status = None
+    pos, end = 0, len(data)
+
+    while pos < end:
+        delta, start = read_variable_length(data, pos)
+        if end - start < 2:
+            break  # trailing padding
+
+        status = data[start]
+        if status < 0x80:
+            # Running status: the data bytes follow the delta directly
+            running = True
+            status = last_status if last_status is not None else NOTE_ON
+        else:
+            running = False
+            event_status = status
+        body = start if running else start + 1  # first data byte
+
+        message = status & 0xF0
+        if 0x80 <= message <= 0xE0:
+            data1 = data[body]
+            data2 = data[body + 1] if body + 1 < end else 0
+            if message in (PROGRAM_CHANGE, 0xD0):
+                if data1 > 127:
+                    pos = start  # unparseable event: skipped
+                    continue
+                next_pos = body + 1
+            else:
+                next_pos = body + 2
+            if message in (NOTE_ON, NOTE_OFF, PROGRAM_CHANGE):
+                events.append((tick + delta, message, (status & 0x0F) + 1, data1, data2))
+        elif status in (0xF0, 0xF7):
+            length, body = read_variable_length(data, body)
+            next_pos = body + length
+        elif status == 0xFF:
+            meta_type = data[body]
+            length, body = read_variable_length(data, body + 1)
+            next_pos = body + length
+            if meta_type in OBJECT_META_EVENTS:
+                events.append((tick + delta, status, None, meta_type, data[body:next_pos]))
+        else:
+            pos = start  # unknown system message: skipped
+            continue
+
+        if not running and event_status != 0xFF:
+            last_status = event_status
+        tick += delta
+        pos = next_pos
+    return events
+
+
+def read_midi_file(filepath):
+    """(ticks per quarter note, [events of each track])"""
+    with open(filepath, 'rb') as f:
+        data = f.read()
+
+    if data[:4] != b'MThd' or int.from_bytes(data[4:8], 'big') != 6:
+        raise ValueError(f"badly formatted midi bytes, got: {data[:20]!r}")
+    midi_format = int.from_bytes(data[8:10], 'big')
+    num_tracks = int.from_bytes(data[10:12], 'big')
+    division = int.from_bytes(data[12:14], 'big')
+    if midi_format not in (0, 1):
+        raise ValueError(f"cannot handle midi file format: {midi_format}")
+    if division & 0x8000:
+        raise UnsupportedMidi("SMPTE time division")
+
+    tracks = []
+    pos = 14
+    for _ in range(num_tracks):
+        if data[pos:pos + 4] != b'MTrk':
+            raise ValueError("badly formed midi string: missing leading MTrk")
+        length = int.from_bytes(data[pos + 4:pos + 8], 'big')
+        tracks.append(read_track_events(data[pos + 8:pos + 8 + length]))
+        pos += 8 + length
+    return division & 0x7FFF, tracks
+
+
+# ---------------------------------------------------------------------------
+# Tokens
+
+def pitch_name(midi_number):
+    """Pitch name as str(music21 Pitch) spells it, e.g. 'C#4' or 'B-3'."""
+    return f"{PITCH_NAMES[midi_number % 12]}{midi_number // 12 - 1}"
+
+
+@lru_cache(maxsize=None)
+def chord_token(pitch_classes):
+    """Normal order of a pitch-class set, joined with dots (e.g. '0.4.7')."""
+    # Pitch objects rather than ints: a Chord of ints respells its notes
+    # first (simplifyEnharmonics), which is slow and can't change the
+    # pitch classes the normal order comes from
+    normal_order = chord.Chord([Pitch(60 + pc) for pc in sorted(pitch_classes)]).normalOrder
+    return '.'.join(str(pc) for pc in normal_order)
+
+
+class Element:
+    """A note or chord as it moves through measures and voices."""
+
+    __slots__ = ('offset', 'duration', 'grace', 'token', 'insert_index')
+
+    def __init__(self, offset, duration, grace, token):
+        self.offset = offset
+        self.duration = duration
+        self.grace = grace
+        self.token = token
+        self.insert_index = 0
+
+    def split_at(self, quarter_length):
+        """Shorten to quarter_length and return the tied remainder."""
+        remainder = Element(0, opFrac(self.duration - quarter_length), self.grace, self.token)
+        self.duration = opFrac(quarter_length)
+        return remainder
+
+
+class Container:
+    """A measure or voice: elements kept in music21's sort order."""
+
+    def __init__(self, counter):
+        self.counter = counter
+        self.elements = []  # notes/chords (and voices, in a measure)
+        self.voices = []
+
+    def insert(self, offset, element):
+        element.offset = offset
+        element.insert_index = next(self.counter)
+        self.elements.append(element)
+
+    def insert_voice(self, voice):
+        voice.offset = 0
+        voice.insert_index = next(self.counter)
+        self.voices.append(voice)
+
+    def notes(self):
+        return sorted(self.elements, key=lambda e: (e.offset, not e.grace, e.insert_index))
+
+    def highest_time(self):
+        return max((opFrac(e.offset + e.duration) for e in self.elements), default=0)
+
+
+# ---------------------------------------------------------------------------
+# Quantization (Stream.quantize)
+
+def best_match(target, zero_allowed=True, gap_to_fill=0.0):
+    """The grid point music21 snaps target to, as its full match tuple."""
+    found = []
+    for divisor in QUARTER_LENGTH_DIVISORS:
+        tick = 1 / divisor
+        match, error, signed_error = nearestMultiple(target, tick)
+        if not zero_allowed and match == 0.0:
+            match = tick
+            signed_error = round(target - match, 7)
+            error = abs(signed_error)
+        if gap_to_fill % tick == 0:
+            remaining_gap = 0.0
+        else:
+            remaining_gap = max(gap_to_fill - match, 0.0)
+        found.append((remaining_gap, error, tick, match, signed_error, divisor))
+    return min(found)
+
+
+def quantize(items):
+    """
+    Snap offsets and durations of items (sorted [offset, duration, grace,
+    is_note] lists) in place. A note's duration is chosen to avoid a gap
+    before the next item that starts later, as music21 does.
+    """
+    matches = {}
+
+    def offset_match(offset):
+        if offset not in matches:
+            matches[offset] = best_match(float(offset))
+        return matches[offset]
+
+    for i, item in enumerate(items):
+        offset = offset_match(item[0])[3]
+        item[0] = opFrac(offset)
+        if not item[3]:
+            continue
+
+        zero_allowed = item[2]
+        ahead = None
+        for following in range(i + 1, len(items)):
+            candidate = offset_match(items[following][0])
+            if candidate[3] > offset:
+                ahead = candidate
+                break
+        if ahead is not None:
+            gap = opFrac(ahead[3] - item[0])
+            duration = best_match(float(max(item[1], 0)), zero_allowed, gap)
+        else:
+            duration = best_match(float(max(item[1], 0)), zero_allowed)
+        item[1] = opFrac(duration[3])
+
+
+# ---------------------------------------------------------------------------
+# Measures, voices and ties
+
+def time_signature_bar(meta_bytes):
+    """
+    Bar length in quarter notes of a time signature meta event. The
+    denominator is a power of two, so the float is exact.
+    """
+    numerator, denominator = meta_bytes[0], 2 ** meta_bytes[1]
+    if numerator == 0:
+        raise UnsupportedMidi("time signature with zero beats")
+    return numerator * 4 / denominator
+
+
+def meter_lookup(signatures):
+    """Function giving the bar length active at an offset (getElementAtOrBefore)."""
+    by_offset = {}
+    for offset, bar in signatures:
+        if by_offset.setdefault(offset, bar) != bar:
+            raise UnsupportedMidi("conflicting time signatures at the same offset")
+    if 0 not in by_offset:
+        by_offset[0] = DEFAULT_BAR
+    offsets = sorted(by_offset)
+    bars = [by_offset[offset] for offset in offsets]
+    return lambda offset: bars[bisect_right(offsets, offset) - 1]
+
+
+def make_voices(measure):
+    """Move overlapping notes into voices, first fit (Stream.makeVoices)."""
+    notes = measure.notes()
+    spans = [(e.offset, opFrac(e.offset + e.duration)) for e in notes]
+
+    # Stream._findLayering
+    layering = [[] for _ in notes]
+    for i in range(len(notes)):
+        for j in range(i + 1, len(notes)):
+            first, second = sorted((spans[i], spans[j]))
+            if second[0] < first[1]:
+                layering[i].append(j)
+                layering[j].append(i)
+            else:
+                break
+    for indices in layering:
+        indices.sort()
+
+    # Stream._consolidateLayering: group sizes give the number of voices
+    groups = {}
+    group_of = {}
+    for i, indices in enumerate(layering):
+        if not indices:
+            continue
+        dst_offset = None
+        for j in indices:
+            store = j not in group_of
+            if not store:
+                dst_offset = group_of[j]
+            if dst_offset is None:
+                dst_offset = notes[i].offset
+            if store:
+                groups.setdefault(dst_offset, []).append(j)
+                group_of[j] = dst_offset
+        if i not in group_of:
+            if dst_offset is None:
+                dst_offset = notes[i].offset
+            groups.setdefault(dst_offset, []).append(i)
+            group_of[i] = dst_offset
+
+    voice_count = max([len(group) for group in groups.values()] + [1])
+    if voice_count == 1:
+        return
+
+    voices = [Container(measure.counter) for _ in range(voice_count)]
+    for element in notes:
+        for voice in voices:
+            if voice.highest_time() <= element.offset:
+                voice.insert(element.offset, element)
+                break
+        # (a note that fits no voice is dropped, as in music21)
+    measure.elements = []
+    for voice in voices:
+        if voice.elements:
+            measure.insert_voice(voice)
+
+
+def move_notes_to_voice(measure):
+    """makeNotation.moveNotesToVoices"""
+    voice = Container(measure.counter)
+    for element in measure.notes():
+        voice.insert(element.offset, element)
+    measure.elements = []
+    measure.insert_voice(voice)
+
+
+def make_ties(measures, bar_at):
+    """Split notes crossing a barline, putting the rest in the next measure."""
+    for index, (start, measure) in enumerate(measures):
+        next_measure = measures[index + 1][1] if index + 1 < len(measures) else None
+        next_has_voices = next_measure is not None and bool(next_measure.voices)
+        has_voices = bool(measure.voices)
+        measure_end = bar_at(start)
+
+        for container in (measure.voices if has_voices else [measure]):
+            for element in container.notes():
+                overshoot = opFrac(element.offset + element.duration) - measure_end
+                if overshoot <= 0 or element.offset >= measure_end:
+                    continue
+                if next_measure is None:
+                    raise UnsupportedMidi("note tied past the last measure")
+                remainder = element.split_at(measure_end - element.offset)
+                if next_has_voices:
+                    # music21 looks the voice up by id, which never matches
+                    # across measures, so the remainder lands in the measure
+                    dst = next_measure if has_voices else next_measure.voices[0]
+                elif has_voices:
+                    move_notes_to_voice(next_measure)
+                    dst = next_measure.voices[0]
+                else:
+                    dst = next_measure
+                dst.insert(0, remainder)
+
+
+def flatten_unnecessary_voices(measure):
+    measure.voices = [voice for voice in measure.voices if voice.elements]
+    if len(measure.voices) == 1:
+        for element in measure.voices[0].notes():
+            measure.insert(element.offset, element)
+        measure.voices = []
+
+
+def measure_tokens(measure):
+    """Tokens in measure.recurse() order: voices (at offset 0) expand in place."""
+    items = [((0, VOICE_SORT, True, v.insert_index), v) for v in measure.voices]
+    items += [((e.offset, NOTE_SORT, not e.grace, e.insert_index), e) for e in measure.elements]
+    tokens = []
+    for _, item in sorted(items, key=lambda pair: pair[0]):
+        if isinstance(item, Container):
+            tokens.extend(e.token for e in item.notes())
+        else:
+            tokens.append(item.token)
+    return tokens
+
+
+# ---------------------------------------------------------------------------
+# Tracks
+
+def pair_notes(events):
+    """[(on tick, off tick, channel, pitch), ...] in note-on order (getNotesFromEvents)."""
+    notes = []
+    awaiting_on = {}
+    for tick, status, channel, data1, data2 in reversed(events):
+        if status == NOTE_OFF or (status == NOTE_ON and data2 == 0):
+            awaiting_on[data1, channel] = tick
+        elif status == NOTE_ON and (data1, channel) in awaiting_on:
+            notes.append((tick, awaiting_on[data1, channel], channel, data1))
+    notes.reverse()
+    return notes
+
+
+def group_chords(notes, ticks_per_quarter):
+    """
+    ([(tick, duration ticks, token), ...], voices_required): onsets closer
+    than a 16th become one chord, unless their ends differ by more than that.
+    """
+    tolerance = ticks_per_quarter / max(QUARTER_LENGTH_DIVISORS)
+    gathered = [False] * len(notes)
+    voices_required = False
+    elements = []
+
+    for i, (on, off, channel, pitch) in enumerate(notes):
+        if gathered[i]:
+            continue
+        group = [notes[i]]
+        for j in range(i + 1, len(notes)):
+            if abs(notes[j][0] - on) >= tolerance:
+                break
+            if abs(notes[j][1] - off) > tolerance:
+                voices_required = True
+                continue
+            group.append(notes[j])
+            gathered[j] = True
+
+        if any(note_channel == 10 for _, _, note_channel, _ in group):
+            raise UnsupportedMidi("percussion on channel 10")
+        if len(group) > 1:
+            # music21 times a chord by its last note
+            last_on, last_off = group[-1][0], group[-1][1]
+            token = chord_token(frozenset(p % 12 for _, _, _, p in group))
+            elements.append((on, last_off - last_on, token))
+        else:
+            elements.append((on, off - on, pitch_name(pitch)))
+    return elements, voices_required
+
+
+def track_tokens(events, ticks_per_quarter, conductor):
+    """
+    Tokens of one track with notes. conductor holds (offset, meta type,
+    bar) of the tempo/key/time signature events of the note-less tracks
+    read so far.
+    """
+    notes = pair_notes(events)
+    if not notes:
+        return []
+    chords, voices_required = group_chords(notes, ticks_per_quarter)
+
+    # The track's own score objects (instruments, tempo, key and time
+    # signatures) come first, then the notes; each as
+    # [offset, duration, grace, is_note]
+    metas = [(tick, status, data1, data2) for tick, status, _, data1, data2 in events
+             if status == 0xFF or status == PROGRAM_CHANGE]
+    meta_items = [[opFrac(tick / ticks_per_quarter), 0, False, False] for tick, _, _, _ in metas]
+    note_items = [[opFrac(tick / ticks_per_quarter), opFrac(length / ticks_per_quarter), length == 0, True]
+                  for tick, length, _ in chords]
+    items = meta_items + note_items
+    # Score order: offset, then score objects before notes, grace notes
+    # before others, then insertion order
+    order = sorted(range(len(items)),
+                   key=lambda i: (items[i][0], items[i][3], not items[i][2], i))
+    quantize([items[i] for i in order])
+
+    own_signatures = [(item[0], time_signature_bar(data2))
+                      for item, (_, status, data1, data2) in zip(meta_items, metas)
+                      if status == 0xFF and data1 == META_TIME_SIGNATURE]
+    conductor_signatures = [(offset, bar) for offset, kind, bar in conductor
+                            if kind == META_TIME_SIGNATURE]
+    if own_signatures and conductor_signatures:
+        raise UnsupportedMidi("time signatures in both the conductor and a note track")
+    bar_at = meter_lookup(conductor_signatures or own_signatures)
+
+    # makeMeasures: enough measures to reach the last end time
+    end_times = [opFrac(item[0] + item[1]) for item in items] + [offset for offset, _, _ in conductor]
+    last_end = max(end_times)
+    counter = count()
+    measures = []
+    offset = 0.0
+    while True:
+        measures.append((offset, Container(counter)))
+        offset += bar_at(offset)
+        if offset >= last_end:
+            break
+    starts = [start for start, _ in measures]
+
+    # Notes go to the measure they start in, in score order
+    note_order = sorted(
+        range(len(note_items)),
+        key=lambda i: (note_items[i][0], not note_items[i][2], i)
+    )
+    for i in note_order:
+        start, duration, grace, _ = note_items[i]
+        index = bisect_right(starts, start) - 1
+        measure_start, measure = measures[index]
+        if start >= measure_start + bar_at(measure_start):
+            raise UnsupportedMidi("note placed after the last measure")
+        measure.insert(opFrac(start - measure_start), Element(0, duration, grace, chords[i][2]))
+
+    if voices_required:
+        for _, measure in measures:
+            make_voices(measure)
+    make_ties(measures, bar_at)
+
+    tokens = []
+    for _, measure in measures:
+        flatten_unnecessary_voices(measure)
+        tokens.extend(measure_tokens(measure))
+    return tokens
+
+
+def read_notes(filepath):
+    """
+    Notes and chords of a MIDI file as string tokens, identical to
+    extract_song_notes(converter.parse(filepath)).
+    Raises UnsupportedMidi for files that need the music21 path.
+    """
+    ticks_per_quarter, tracks = read_midi_file(filepath)
+
+    conductor = []
+    tokens = []
+    for events in tracks:
+        if any(status == NOTE_ON and data2 > 0 for _, status, _, _, data2 in events):
+            tokens.extend(track_tokens(events, ticks_per_quarter, conductor))
+            continue
+        # A track without notes feeds the conductor part
+        for tick, status, _, data1, data2 in events:
+            if status == 0xFF and data1 in CONDUCTOR_META_EVENTS:
+                offset = opFrac(best_match(float(opFrac(tick / ticks_per_quarter)))[3])
+                bar = time_signature_bar(data2) if data1 == META_TIME_SIGNATURE else None
+                conductor.append((offset, data1, bar))
+    return tokens
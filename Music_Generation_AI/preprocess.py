@@ -4,55 +4,192 @@ This script handles loading MIDI files and extracting musical notes/chords.
 I'm using music21 library which makes working with MIDI pretty straightforward.
 """
 
+import hashlib
 import os
 import pickle
+import tempfile
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from music21 import converter, note, chord
 import numpy as np
 
+from midi_reader import UnsupportedMidi, read_notes
 
-def load_midi_files(data_dir='data/midi_files'):
-    """
-    Load all MIDI files from the data directory.
-    Returns a list of parsed music21 streams.
-    """
-    songs = []
-    print(f"Loading MIDI files from {data_dir}...")
+# Tokens extracted from each MIDI file are cached here, keyed by a hash of
+# the file's bytes, so unchanged files are never parsed twice.
+# Bump CACHE_VERSION whenever the token format changes.
+CACHE_DIR = 'data/token_cache'
+CACHE_VERSION = 1
 
-    midi_files = [f for f in os.listdir(data_dir)
-                  if f.endswith('.mid') or f.endswith('.midi')]
 
-    if not midi_files:
-        print("Warning: No MIDI files found!")
-        return []
+def extract_song_notes(song):
+    """Notes and chords of one parsed song, as string tokens."""
+    notes = []
+    for element in song.recurse():
+        if isinstance(element, note.Note):
+            notes.append(str(element.pitch))
+        elif isinstance(element, chord.Chord):
+            notes.append('.'.join(str(n) for n in element.normalOrder))
+    return notes
 
-    for file in midi_files:
+
+def file_digest(filepath):
+    """Hash of the file contents (and the cache version) used as cache key."""
+    digest = hashlib.sha256(f"v{CACHE_VERSION}".encode())
+    with open(filepath, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def load_cached_notes(digest, cache_dir=CACHE_DIR):
+    """Cached tokens for a file digest, or None if not cached yet."""
+    path = os.path.join(cache_dir, digest + '.npz')
+    try:
+        with np.load(path, allow_pickle=False) as data:
+            return data['vocab'][data['codes']].tolist()
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def save_cached_notes(digest, notes, cache_dir=CACHE_DIR):
+    """
+    Store tokens compactly: the distinct tokens once, plus one small
+    integer per note pointing into them.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    vocab, codes = np.unique(np.array(notes, dtype=str), return_inverse=True)
+    codes = codes.astype(np.uint16 if len(vocab) <= np.iinfo(np.uint16).max else np.uint32)
+
+    # Write to a temporary file first so an interrupted run never leaves
+    # a truncated cache entry behind. The name is unique, so two processes
+    # writing the same entry never share (or delete) each other's file.
+    path = os.path.join(cache_dir, digest + '.npz')
+    with tempfile.NamedTemporaryFile(dir=cache_dir, prefix=digest, suffix='.tmp',
+                                     delete=False) as f:
+        tmp_path = f.name
         try:
-            filepath = os.path.join(data_dir, file)
-            print(f"  Loading: {file}")
-            song = converter.parse(filepath)
-            songs.append(song)
-        except Exception as e:
-            print(f"  Error loading {file}: {e}")
+            np.savez_compressed(f, vocab=vocab, codes=codes)
+        except BaseException:
+            f.close()
+            os.remove(tmp_path)
+            raise
+    os.replace(tmp_path, path)
 
-    print(f"Successfully loaded {len(songs)} MIDI files.\n")
-    return songs
 
+def parse_file_notes(filepath, digest, cache_dir=CACHE_DIR):
+    """
+    Parse one MIDI file and cache its tokens. Runs in a worker process,
+    so only the token list (not the music21 score) is sent back.
+    Files midi_reader cannot handle exactly go through music21.
+    Returns (notes, None) or (None, error message).
+    """
+    try:
+        try:
+            notes = read_notes(filepath)
+        except UnsupportedMidi:
+            notes = extract_song_notes(converter.parse(filepath))
+    except Exception as e:
+        return None, str(e)
+    try:
+        save_cached_notes(digest, notes, cache_dir)
+    except Exception as e:
+        # The cache only saves time: keep the notes, the file is parsed again next run
+        print(f"  Could not cache {filepath}: {e}")
+    return notes, None
+
+
+def iter_file_notes(data_dir='data/midi_files', cache_dir=CACHE_DIR, workers=None):
+    """
+    Yield (file, notes, error) for every MIDI file in data_dir, in sorted
+    file order. Cached files are read directly; the others are parsed on
+    a pool of worker processes (one file per task), and each result is
+    yielded as soon as every file before it is done. Identical files
+    share a digest and are parsed once.
+    """
+    midi_files = sorted(f for f in os.listdir(data_dir)
+                        if f.endswith('.mid') or f.endswith('.midi'))
 
-def extract_notes(songs):
+    entries = []
+    for file in midi_files:
+        filepath = os.path.join(data_dir, file)
+        try:
+            digest = file_digest(filepath)
+        except OSError as e:
+            entries.append((file, filepath, None, str(e)))
+            continue
+        cached = os.path.exists(os.path.join(cache_dir, digest + '.npz'))
+        entries.append((file, filepath, digest, cached))
+
+    # One parse per digest, by its first file; copies reuse that result
+    uses = Counter(digest for file, filepath, digest, cached in entries
+                   if digest is not None and not cached)
+    misses = {}
+    for file, filepath, digest, cached in entries:
+        if digest in uses:
+            misses.setdefault(digest, filepath)
+    workers = min(workers or os.cpu_count() or 1, len(misses))
+
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        if pool is not None:
+            # map() yields results in submission order, i.e. file order
+            parsed = pool.map(parse_file_notes, misses.values(), misses.keys(),
+                              repeat(cache_dir), chunksize=1)
+        else:
+            parsed = (parse_file_notes(filepath, digest, cache_dir)
+                      for digest, filepath in misses.items())
+
+        results = {}
+        for file, filepath, digest, cached in entries:
+            if digest is None:
+                yield file, None, cached  # unreadable file; cached holds the error
+            elif not cached:
+                if digest not in results:
+                    results[digest] = next(parsed)
+                result = results[digest]
+                # Only hold on to a result while a later copy still needs it
+                uses[digest] -= 1
+                if not uses[digest]:
+                    del results[digest]
+                yield (file, *result)
+            else:
+                notes = load_cached_notes(digest, cache_dir)
+                if notes is None:
+                    # Unreadable cache entry: parse again in this process
+                    yield (file, *parse_file_notes(filepath, digest, cache_dir))
+                else:
+                    yield file, notes, None
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+
+def load_notes(data_dir='data/midi_files', cache_dir=CACHE_DIR, workers=None):
     """
-    Extract notes and chords from the parsed MIDI files.
-    Uses a flattened stream to support most MIDI formats.
+    Notes and chords of all MIDI files in data_dir, in file order.
+    Only files that are new or changed since the last run are parsed
+    (in parallel, see iter_file_notes); the others come from the token cache.
     """
     notes = []
-    print("Extracting notes and chords from songs...")
-
-    for song in songs:
-        for element in song.recurse():
-            if isinstance(element, note.Note):
-                notes.append(str(element.pitch))
-            elif isinstance(element, chord.Chord):
-                notes.append('.'.join(str(n) for n in element.normalOrder))
+    print(f"Loading notes from {data_dir}...")
+
+    loaded = failed = 0
+    for file, song_notes, error in iter_file_notes(data_dir, cache_dir, workers):
+        if error:
+            print(f"  Error loading {file}: {error}")
+            failed += 1
+            continue
+        print(f"  Loaded: {file} ({len(song_notes)} notes/chords)")
+        notes.extend(song_notes)
+        loaded += 1
+
+    if not loaded and not failed:
+        print("Warning: No MIDI files found!")
+        return []
 
+    print(f"Loaded {loaded} MIDI files.")
     print(f"Extracted {len(notes)} notes/chords.")
     print(f"Unique notes/chords: {len(set(notes))}\n")
     return notes
@@ -65,23 +202,21 @@ def prepare_sequences(notes, sequence_length=50):
     pitchnames = sorted(set(notes))
     note_to_int = {note: number for number, note in enumerate(pitchnames)}
 
-    network_input = []
-    network_output = []
-
-    for i in range(len(notes) - sequence_length):
-        seq_in = notes[i:i + sequence_length]
-        seq_out = notes[i + sequence_length]
-
-        network_input.append([note_to_int[n] for n in seq_in])
-        network_output.append(note_to_int[seq_out])
-
-    n_patterns = len(network_input)
+    # Encode every note once
+    codes = np.fromiter(map(note_to_int.__getitem__, notes), dtype=np.int32, count=len(notes))
     n_vocab = len(pitchnames)
-
-    # Convert to NumPy arrays (CRITICAL FIX)
-    network_input = np.reshape(network_input, (n_patterns, sequence_length, 1))
-    network_input = network_input / float(n_vocab)
-    network_output = np.array(network_output)
+    n_patterns = max(len(notes) - sequence_length, 0)
+
+    # Normalize per note (not per window element), in the float32 the
+    # model computes in. Input windows are a read-only strided view of
+    # this one array: window i is normalized[i:i + sequence_length].
+    normalized = (codes / float(n_vocab)).astype(np.float32)
+    if n_patterns:
+        windows = np.lib.stride_tricks.sliding_window_view(normalized[:-1], sequence_length)
+    else:
+        windows = np.empty((0, sequence_length), dtype=np.float32)
+    network_input = windows[:, :, np.newaxis]
+    network_output = codes[sequence_length:]
 
     print(f"Created {n_patterns} training sequences.")
     print(f"Vocabulary size: {n_vocab}\n")
@@ -107,12 +242,10 @@ if __name__ == "__main__":
     print("MIDI Preprocessing Pipeline")
     print("=" * 50 + "\n")
 
-    songs = load_midi_files()
-    if not songs:
+    notes = load_notes()
+    if not notes:
         exit()
 
-    notes = extract_notes(songs)
-
     network_input, network_output, pitchnames = prepare_sequences(notes)
 
     save_data(notes, pitchnames)
@@ -0,0 +1,21 @@
+"""
+Tests that midi_reader gives the same tokens as music21 on the bundled MIDI files
+Run from this directory: python -m pytest
+"""
+
+import os
+
+import pytest
+from music21 import converter
+
+from midi_reader import read_notes
+from preprocess import extract_song_notes
+
+MIDI_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'midi_files')
+MIDI_FILES = sorted(f for f in os.listdir(MIDI_DIR) if f.endswith('.mid') or f.endswith('.midi'))
+
+
+@pytest.mark.parametrize('file', MIDI_FILES)
+def test_tokens_match_music21(file):
+    filepath = os.path.join(MIDI_DIR, file)
+    assert read_notes(filepath) == extract_song_notes(converter.parse(filepath))
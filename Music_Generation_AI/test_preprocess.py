@@ -0,0 +1,62 @@
+"""
+Tests for the token cache in preprocess.py
+Run from this directory: python -m pytest
+"""
+
+import os
+import shutil
+
+import preprocess
+from preprocess import iter_file_notes
+
+MIDI_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'midi_files')
+SAMPLE = os.path.join(MIDI_DIR, 'pathetique_2_format0.mid')
+OTHER_SAMPLE = os.path.join(MIDI_DIR, 'beethoven_opus10_2.mid')
+
+
+def copy_sample(data_dir, *names, sample=SAMPLE):
+    os.makedirs(data_dir, exist_ok=True)
+    for name in names:
+        shutil.copy(sample, os.path.join(data_dir, name))
+
+
+def test_identical_files_are_parsed_once(tmp_path, monkeypatch):
+    data_dir, cache_dir = str(tmp_path / 'midi'), str(tmp_path / 'cache')
+    copy_sample(data_dir, 'a.mid', 'b.mid')
+    parsed = []
+    read_notes = preprocess.read_notes
+    monkeypatch.setattr(preprocess, 'read_notes',
+                        lambda path: parsed.append(path) or read_notes(path))
+
+    results = list(iter_file_notes(data_dir, cache_dir, workers=1))
+
+    assert len(parsed) == 1
+    assert [(file, error) for file, _, error in results] == [('a.mid', None), ('b.mid', None)]
+    assert results[0][1] and results[1][1] == results[0][1]
+
+
+def test_identical_files_on_workers_share_one_entry(tmp_path):
+    data_dir, cache_dir = str(tmp_path / 'midi'), str(tmp_path / 'cache')
+    copy_sample(data_dir, 'a1.mid', 'b1.mid', 'c1.mid')
+    copy_sample(data_dir, 'a2.mid', 'b2.mid', 'c2.mid', sample=OTHER_SAMPLE)
+
+    results = list(iter_file_notes(data_dir, cache_dir, workers=2))
+
+    assert [(file, error) for file, _, error in results] == [
+        (name, None) for name in ('a1.mid', 'a2.mid', 'b1.mid', 'b2.mid', 'c1.mid', 'c2.mid')
+    ]
+    first, second = results[0][1], results[1][1]
+    assert first and second and first != second
+    assert [notes for _, notes, _ in results] == [first, second] * 3
+    entries = sorted(os.listdir(cache_dir))
+    assert len(entries) == 2 and all(entry.endswith('.npz') for entry in entries)
+
+
+def test_cache_write_failure_keeps_notes(tmp_path):
+    data_dir, cache_dir = str(tmp_path / 'midi'), str(tmp_path / 'cache')
+    copy_sample(data_dir, 'a.mid')
+    open(cache_dir, 'w').close()  # a file where the cache directory should be
+
+    [(file, notes, error)] = iter_file_notes(data_dir, cache_dir, workers=2)
+
+    assert file == 'a.mid' and notes and error is None
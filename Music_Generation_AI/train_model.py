@@ -12,7 +12,7 @@ from tensorflow.keras.models import Sequential
 from tensorflow.keras.layers import LSTM, Dropout, Dense, Activation
 from tensorflow.keras.callbacks import ModelCheckpoint, EarlyStopping
 
-from preprocess import load_midi_files, extract_notes, prepare_sequences
+from preprocess import load_notes, prepare_sequences
 
 
 def create_model(network_input, n_vocab):
@@ -90,17 +90,14 @@ if __name__ == "__main__":
     print("Music Generation Model Training")
     print("=" * 50 + "\n")
 
-    print("Step 1: Loading data...")
-    songs = load_midi_files()
+    print("Step 1: Loading notes from MIDI files...")
+    notes = load_notes()
 
-    if not songs:
+    if not notes:
         print("No MIDI files found. Exiting.")
         exit()
 
-    print("\nStep 2: Extracting notes...")
-    notes = extract_notes(songs)
-
-    print("\nStep 3: Preparing sequences...")
+    print("\nStep 2: Preparing sequences...")
     network_input, network_output, pitchnames = prepare_sequences(notes)
 
     with open('models/notes_vocab.pkl', 'wb') as f:
@@ -108,10 +105,10 @@ if __name__ == "__main__":
 
     n_vocab = len(pitchnames)
 
-    print("\nStep 4: Building model...")
+    print("\nStep 3: Building model...")
     model = create_model(network_input, n_vocab)
 
-    print("\nStep 5: Training model...")
+    print("\nStep 4: Training model...")
     train(model, network_input, network_output, epochs=20, batch_size=64)
 
     print("\n" + "=" * 50)